@@ -0,0 +1,251 @@
+from urllib.parse import urlsplit
+import bisect
+import json
+import time
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.HistoryFetch import HistoryOHLCV
+from ManageSimulator.ExchangeSimulatorClass import ExchangeSimulator
+
+### FIXTURE_DIRECTORY (str): Directory of the recorded market history fixtures.
+FIXTURE_DIRECTORY = os.path.join(folder_path, "fixtures")
+### FIXTURE_SYMBOLS (dict): Symbol of the fixture of every exchange.
+FIXTURE_SYMBOLS = {
+    "Wallex": "SHIBTMN",
+    "Nobitex": "BTCIRT",
+    "Binance": "BTCUSDT",
+    "BingX": "BTC-USDT",
+    "Coinbase": "BTC-USD",
+}
+### FIXTURE_INTERVAL (dict): Minute interval in the format of every exchange.
+FIXTURE_INTERVAL = {
+    "Wallex": "1",
+    "Nobitex": "1",
+    "Binance": "1m",
+    "BingX": "1m",
+    "Coinbase": "60",
+}
+### FIXTURE_CANDLES (int): Minute candles of a fixture (the largest benchmark size).
+FIXTURE_CANDLES = 50000
+### FIXTURE_MARGIN (int): Extra minute candles after the replayed "now" (room for the clock to run).
+FIXTURE_MARGIN = 1440
+### FIXTURE_END (int): End of the fixtures recorded from the simulator (fixed, so they are reproducible).
+FIXTURE_END = 1_700_000_000 // 60 * 60
+MINUTE = 60
+
+
+def fixture_path(exchange: str, directory: str = FIXTURE_DIRECTORY) -> str:
+    return os.path.join(directory, f"{exchange}-{FIXTURE_SYMBOLS[exchange]}.json")
+
+
+class _SimulatorHistoryClient(HistoryOHLCV):
+    """
+    HistoryOHLCV answered by ExchangeSimulator.handle, without HTTP and without rate limits.
+    """
+
+    def __init__(self, simulator: ExchangeSimulator):
+        super().__init__(base_urls=simulator.base_urls())
+        self.simulator = simulator
+
+    def make_request(
+        self, url: str, params: dict = None, exchange: str = None, loads=None
+    ) -> dict:
+        query = {key: str(value) for key, value in (params or {}).items()}
+        status, payload, _ = self.simulator.handle("GET", urlsplit(url).path, query)
+        if status != 200:
+            raise ValueError(f"Simulator error {status}: {payload}")
+        return payload if loads is None else loads(json.dumps(payload).encode())
+
+
+def record_fixtures(
+    exchanges: tuple = tuple(FIXTURE_SYMBOLS),
+    num_candles: int = FIXTURE_CANDLES,
+    directory: str = FIXTURE_DIRECTORY,
+    base_urls: dict = None,
+    end_time: int = None,
+) -> list:
+    """
+    Records the market history of every exchange in a JSON fixture, through the chunking and
+    merging of HistoryOHLCV.
+
+    Parameters:
+        exchanges (tuple): Exchanges to record.
+        num_candles (int): Minute candles of the fixture (FIXTURE_MARGIN candles are added).
+        directory (str): Directory of the fixtures.
+        base_urls (dict): None records the deterministic ExchangeSimulator (the same fixtures on
+            every machine), {} records the real exchanges (network), other base URLs a stand-in server.
+        end_time (int): End of the recorded range (default: FIXTURE_END, or now for a server).
+
+    Returns:
+        list: Paths of the written fixtures.
+    """
+    if base_urls is None:
+        history_client = _SimulatorHistoryClient(ExchangeSimulator())
+        end_time = FIXTURE_END if end_time is None else end_time
+    else:
+        history_client = HistoryOHLCV(base_urls=base_urls)
+        if end_time is None:
+            time_now = int(time.time())
+            end_time = time_now - time_now % MINUTE - MINUTE
+    start_time = end_time - (num_candles + FIXTURE_MARGIN) * MINUTE
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for exchange in exchanges:
+        payload = history_client.get_ohlcv_history(
+            exchange=exchange,
+            symbol=FIXTURE_SYMBOLS[exchange],
+            interval=FIXTURE_INTERVAL[exchange],
+            startTime=start_time,
+            endTime=end_time,
+        )
+        fixture = {
+            "exchange": exchange,
+            "symbol": FIXTURE_SYMBOLS[exchange],
+            "interval": FIXTURE_INTERVAL[exchange],
+            "start": start_time,
+            "end": end_time,
+            "payload": payload,
+        }
+        path = fixture_path(exchange=exchange, directory=directory)
+        with open(path, "w") as file:
+            json.dump(fixture, file, separators=(",", ":"))
+        paths.append(path)
+    return paths
+
+
+class FixtureHistoryClient(HistoryOHLCV):
+    """
+    HistoryOHLCV replaying the recorded fixtures, no network.
+
+    The replayed "now" is mapped on the end of a fixture minus FIXTURE_MARGIN, every request is
+    answered with the candles of its time range, shifted to the requested times. The requests
+    still go through the chunking and merging of HistoryOHLCV, and every chunk response is
+    decoded from its JSON body like a real response (the body of a time range is cached).
+
+    Methods:
+        - make_request(url: str, params: dict, exchange: str, loads=None) -> dict: Answers a chunk request from the fixture.
+        - load(exchange: str) -> dict: Loads the fixture of an exchange (recorded first if missing).
+        - window(exchange: str, startTime: int, endTime: int) -> dict | list: Payload of a time range.
+
+    Example:
+        history_client = FixtureHistoryClient()
+        ohlcv_object = GenerateOHLCV(..., shared_instances={"history_client": history_client})
+    """
+
+    def __init__(self, directory: str = FIXTURE_DIRECTORY, record_missing: bool = True):
+        super().__init__()
+        self.directory = directory
+        self.record_missing = record_missing
+        self.fixtures = {}
+        self.cache = {}
+
+    def load(self, exchange: str) -> dict:
+        if exchange in self.fixtures:
+            return self.fixtures[exchange]
+
+        path = fixture_path(exchange=exchange, directory=self.directory)
+        if not os.path.exists(path):
+            if not self.record_missing:
+                raise FileNotFoundError(f"Fixture not found: {path}")
+            record_fixtures(exchanges=(exchange,), directory=self.directory)
+        with open(path) as file:
+            fixture = json.load(file)
+
+        ### Items in ascending time, with their time in seconds
+        payload = fixture["payload"]
+        match exchange:
+            case "Wallex" | "Nobitex":
+                items = list(range(len(payload["t"])))
+                times = list(payload["t"])
+            case "Binance":
+                items = sorted(payload, key=lambda row: row[0])
+                times = [row[0] // 1000 for row in items]
+            case "BingX":
+                items = sorted(payload["data"], key=lambda row: row["time"])
+                times = [row["time"] // 1000 for row in items]
+            case "Coinbase":
+                items = sorted(payload, key=lambda row: row[0])
+                times = [row[0] for row in items]
+        fixture["items"] = items
+        fixture["times"] = times
+
+        time_now = int(time.time())
+        replay_now = time_now - time_now % MINUTE
+        fixture["offset"] = fixture["end"] - FIXTURE_MARGIN * MINUTE - replay_now
+        self.fixtures[exchange] = fixture
+        return fixture
+
+    def window(self, exchange: str, startTime: int, endTime: int):
+        fixture = self.load(exchange)
+        offset = fixture["offset"]
+        first = bisect.bisect_left(fixture["times"], startTime + offset)
+        last = bisect.bisect_right(fixture["times"], endTime + offset)
+        items = fixture["items"][first:last]
+        payload = fixture["payload"]
+
+        match exchange:
+            case "Wallex" | "Nobitex":
+                if not items:
+                    return {"s": "no_data"}
+                window = {"s": "ok", "t": [payload["t"][i] - offset for i in items]}
+                for key in "ohlcv":
+                    window[key] = payload[key][first:last]
+                return window
+            case "Binance":
+                shift = offset * 1000
+                return [[row[0] - shift, *row[1:6], row[6] - shift, *row[7:]] for row in items]
+            case "BingX":
+                shift = offset * 1000
+                data = [{**row, "time": row["time"] - shift} for row in items]
+                return {**{k: v for k, v in payload.items() if k != "data"}, "data": data}
+            case "Coinbase":
+                return [[row[0] - offset, *row[1:]] for row in reversed(items)]
+
+    def _request_range(self, exchange: str, params: dict) -> tuple:
+        match exchange:
+            case "Wallex" | "Nobitex":
+                return int(params["from"]), int(params["to"])
+            case "Binance" | "BingX":
+                return int(params["startTime"]) // 1000, int(params["endTime"]) // 1000
+            case "Coinbase":
+                return int(params["start"]), int(params["end"])
+
+    def make_request(
+        self, url: str, params: dict = None, exchange: str = None, loads=None
+    ) -> dict:
+        start_time, end_time = self._request_range(exchange=exchange, params=params)
+        key = (exchange, start_time, end_time)
+        content = self.cache.get(key)
+        if content is None:
+            content = json.dumps(self.window(exchange, start_time, end_time)).encode()
+            self.cache[key] = content
+        return json.loads(content) if loads is None else loads(content)
+
+
+if __name__ == "__main__":
+    # Record the simulator fixtures and replay the last 400 candles of every exchange
+    start = time.perf_counter()
+    print(record_fixtures())
+    print(f"record: {time.perf_counter() - start:.1f} s")
+
+    history_client = FixtureHistoryClient()
+    time_now = int(time.time())
+    end_time = time_now - time_now % MINUTE
+    for exchange, symbol in FIXTURE_SYMBOLS.items():
+        payload = history_client.get_ohlcv_history(
+            exchange=exchange,
+            symbol=symbol,
+            interval=FIXTURE_INTERVAL[exchange],
+            startTime=end_time - 399 * MINUTE,
+            endTime=end_time,
+        )
+        if isinstance(payload, dict):
+            payload = payload.get("t") or payload.get("data")
+        print(exchange, len(payload))
@@ -0,0 +1,531 @@
+from datetime import datetime, timezone
+import pandas as pd
+import numpy as np
+import subprocess
+import argparse
+import importlib.util
+import logging
+import platform
+import tempfile
+import shutil
+import json
+import time
+import sys
+import gc
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.GenerateTimeFrame import GenerateOHLCV
+from TF_Generator.OrganizerDataFrame import DataFrameOrg
+from TF_Generator.DecoderOHLCV import OHLCVDecoder, JSON_LOADS
+from TF_Generator.OrganizerTimeFrame import TimeFrameOrg
+from TF_Generator.ManagerFile import FileManager
+from TF_Generator.ManagerLogger import LoggerManager, DEFAULT_LOG_LEVEL
+from ManageBenchmark.FixtureHistoryClass import (
+    FixtureHistoryClient,
+    FIXTURE_SYMBOLS,
+    FIXTURE_INTERVAL,
+    MINUTE,
+)
+
+### BENCHMARK_SIZES (tuple): Numbers of minute candles of the benchmarks.
+BENCHMARK_SIZES = (400, 10000, 50000)
+### RESULTS_DIRECTORY (str): Directory of the stored results (one JSON file per commit).
+RESULTS_DIRECTORY = os.path.join(folder_path, "results")
+### CONVERT_TIMEFRAMES (tuple): Timeframes of the convert_timeframe benchmarks.
+CONVERT_TIMEFRAMES = ("5min", "1H")
+### FILE_FORMATS (tuple): Storage formats of the FileManager benchmarks ("feather" needs pyarrow).
+FILE_FORMATS = ("npy", "feather", "csv")
+### CYCLE_TIMEFRAME (str): Timeframe of the release cycle benchmarks (num_candles = size / 5).
+CYCLE_TIMEFRAME = "5min"
+### NEW_CANDLES (int): Candles missing in the update cycle benchmark.
+NEW_CANDLES = 5
+### GAP_HOLES (tuple): (candles before the end, candles) of the holes of the gap fill benchmark, the first one is an idle day.
+GAP_HOLES = ((0, 1440), (5000, 60), (20000, 5), (35000, 120))
+### LOG_LEVELS (tuple): Log levels of the logging overhead benchmarks.
+LOG_LEVELS = ("DEBUG", "INFO")
+### REGRESSION_THRESHOLD (float): Ratio head / base reported as a regression by compare.
+REGRESSION_THRESHOLD = 1.10
+
+
+def _measure(function, setup=None, repeat: int = 5, warmup: int = 1) -> dict:
+    """
+    Times `function(setup())` like timeit (garbage collector off), setup is not timed.
+
+    Returns:
+        dict: {"median", "min", "max"} in milliseconds and "repeat".
+    """
+    timings = []
+    for run in range(warmup + repeat):
+        argument = setup() if setup is not None else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function(argument)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if run >= warmup:
+            timings.append(elapsed * 1e3)
+    return {
+        "median": float(np.median(timings)),
+        "min": float(np.min(timings)),
+        "max": float(np.max(timings)),
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=app_directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=app_directory,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class PipelineBenchmark:
+    """
+    Benchmark of the TF_Generator pipeline on recorded market history fixtures (no network).
+
+    For every size (minute candles) it times:
+        - decode.{exchange}: OHLCVDecoder.decode of the JSON body of the fixture of every exchange,
+          with its throughput ("candles_per_second").
+        - decode.dataframe.{exchange}: the same body through JSON parsing, pd.DataFrame,
+          _regularize_dataframe and _index_dataframe (the path replaced by OHLCVDecoder).
+        - regularize.{exchange}: DataFrameOrg._regularize_dataframe of the fixture of every exchange.
+        - index: DataFrameOrg._index_dataframe.
+        - concatenate.load / concatenate.append: DataFrameOrg._concatenate_dataframe with a new
+          candle store / with the store of the previous call.
+        - convert_timeframe.{timeframe}: TimeFrameOrg.convert_timeframe.
+        - file.save.{format} / file.load.{format}: FileManager._save_df_ohlcv / _read_df_ohlcv.
+        - cycle.create.{exchange}: a new GenerateOHLCV (empty directory) and timeframe_release, with
+          the snapshot files written on exit.
+        - cycle.update.{exchange}: dataframe_release with NEW_CANDLES missing candles and timeframe_release.
+        - cycle.gapfill.{exchange}: dataframe_release of a history with the GAP_HOLES that fit in the
+          size (holes and an idle tail), with its number of requests ("requests").
+        - logging.create.{level} / logging.update.{level}: the cycles of the first exchange with the
+          logger at every level of LOG_LEVELS.
+    The market history is replayed by FixtureHistoryClient (chunking, merging and JSON decoding
+    included), the fixtures are recorded from the ExchangeSimulator when missing.
+
+    Methods:
+        - run() -> dict: Runs the benchmarks, {"meta": {...}, "results": {size: {name: timing}}}.
+        - save(report: dict, path: str = None) -> str: Stores a report in RESULTS_DIRECTORY/{commit}.json.
+        - compare(base: str | dict, head: str | dict, threshold: float) -> list: Ratios of two reports (static).
+
+    Example:
+        benchmark = PipelineBenchmark(sizes=(400, 10000))
+        path = benchmark.save(benchmark.run())
+        PipelineBenchmark.compare(base="ManageBenchmark/results/abc1234.json", head=path)
+    """
+
+    def __init__(
+        self,
+        sizes: tuple = BENCHMARK_SIZES,
+        exchanges: tuple = tuple(FIXTURE_SYMBOLS),
+        repeat: int = 5,
+        history_client: FixtureHistoryClient = None,
+        log_level: int = DEFAULT_LOG_LEVEL,
+    ):
+        """
+        Initializes a new instance of the PipelineBenchmark class.
+
+        Args:
+            sizes (tuple, optional): Numbers of minute candles.
+            exchanges (tuple, optional): Exchanges of the regularize and cycle benchmarks.
+            repeat (int, optional): Timed runs of every benchmark (after one warmup run).
+            history_client (FixtureHistoryClient, optional): Replay client (default: the recorded fixtures).
+            log_level (int, optional): Level of the logger of the benchmarks (default: LoggerManager default).
+        """
+        self.sizes = tuple(sizes)
+        self.exchanges = tuple(exchanges)
+        self.repeat = repeat
+        self.history_client = history_client or FixtureHistoryClient()
+        self.log_level = log_level
+        self.work_directory = None
+        self.logger = None
+
+    # ------- Functions: Inputs -------
+    def _raw_dataframe(self, exchange: str, start: int, end: int) -> pd.DataFrame:
+        """
+        Market history of a time range as built by GenerateOHLCV._fetch_market_history.
+        """
+        payload = self.history_client.get_ohlcv_history(
+            exchange=exchange,
+            symbol=FIXTURE_SYMBOLS[exchange],
+            interval=FIXTURE_INTERVAL[exchange],
+            startTime=start,
+            endTime=end,
+        )
+        return pd.DataFrame(data=payload)
+
+    def _window(self, size: int) -> tuple:
+        time_now = int(time.time())
+        end_time = time_now - time_now % MINUTE - MINUTE
+        return end_time - (size - 1) * MINUTE, end_time
+
+    def _new_directory(self) -> str:
+        return tempfile.mkdtemp(dir=self.work_directory)
+
+    # ------- Functions: Benchmarks -------
+    def _bench_decode(self, size: int) -> dict:
+        results = {}
+        decoder = OHLCVDecoder()
+        organizer = DataFrameOrg(logger=self.logger)
+        start_time, end_time = self._window(size)
+
+        def decode_dataframe(exchange: str, content: bytes) -> pd.DataFrame:
+            dataframe = organizer._regularize_dataframe(
+                exchange=exchange, ohlcv_dataframe=pd.DataFrame(JSON_LOADS(content))
+            )
+            return organizer._index_dataframe(ohlcv_dataframe=dataframe)
+
+        for exchange in self.exchanges:
+            payload = self.history_client.get_ohlcv_history(
+                exchange=exchange,
+                symbol=FIXTURE_SYMBOLS[exchange],
+                interval=FIXTURE_INTERVAL[exchange],
+                startTime=start_time,
+                endTime=end_time,
+            )
+            content = json.dumps(payload).encode()
+            num_candles = decoder.num_candles(decoder.decode(exchange, content))
+
+            for name, function in (
+                (f"decode.{exchange}", decoder.decode),
+                (f"decode.dataframe.{exchange}", decode_dataframe),
+            ):
+                timing = _measure(
+                    lambda _: function(exchange, content), repeat=self.repeat
+                )
+                timing["candles_per_second"] = num_candles / timing["median"] * 1e3
+                results[name] = timing
+        return results
+
+    def _bench_organizer(self, size: int) -> dict:
+        results = {}
+        organizer = DataFrameOrg(logger=self.logger)
+        start_time, end_time = self._window(size)
+
+        for exchange in self.exchanges:
+            raw_dataframe = self._raw_dataframe(exchange, start_time, end_time)
+            results[f"regularize.{exchange}"] = _measure(
+                lambda dataframe: organizer._regularize_dataframe(
+                    exchange=exchange, ohlcv_dataframe=dataframe
+                ),
+                setup=lambda: raw_dataframe,
+                repeat=self.repeat,
+            )
+
+        exchange = self.exchanges[0]
+        regularized = organizer._regularize_dataframe(
+            exchange=exchange,
+            ohlcv_dataframe=self._raw_dataframe(exchange, start_time, end_time),
+        )
+        results["index"] = _measure(
+            lambda dataframe: organizer._index_dataframe(ohlcv_dataframe=dataframe),
+            setup=regularized.copy,
+            repeat=self.repeat,
+        )
+        indexed = organizer._index_dataframe(ohlcv_dataframe=regularized.copy())
+
+        ### New candles after the window, one per run of concatenate.append
+        num_new = self.repeat + 2
+        new_candles = organizer._index_dataframe(
+            ohlcv_dataframe=organizer._regularize_dataframe(
+                exchange=exchange,
+                ohlcv_dataframe=self._raw_dataframe(
+                    exchange, end_time + MINUTE, end_time + num_new * MINUTE
+                ),
+            )
+        )
+        results["concatenate.load"] = _measure(
+            lambda new_organizer: new_organizer._concatenate_dataframe(
+                existing_ohlcv_df=indexed,
+                new_ohlcv_data=new_candles.iloc[:1],
+                actual_candles=size,
+            ),
+            setup=lambda: DataFrameOrg(logger=self.logger),
+            repeat=self.repeat,
+        )
+
+        state = {"dataframe": indexed, "position": 0}
+
+        def append_candle(_):
+            position = state["position"]
+            state["dataframe"] = organizer._concatenate_dataframe(
+                existing_ohlcv_df=state["dataframe"],
+                new_ohlcv_data=new_candles.iloc[position : position + 1],
+                actual_candles=size,
+            )
+            state["position"] = position + 1
+
+        results["concatenate.append"] = _measure(append_candle, repeat=self.repeat)
+
+        timeframe_organizer = TimeFrameOrg(exchange=exchange, logger=self.logger)
+        for new_timeframe in CONVERT_TIMEFRAMES:
+            results[f"convert_timeframe.{new_timeframe}"] = _measure(
+                lambda _: timeframe_organizer.convert_timeframe(
+                    ohlcv_dataframe=indexed, new_timeframe=new_timeframe
+                ),
+                repeat=self.repeat,
+            )
+
+        for file_format in FILE_FORMATS:
+            if file_format == "feather" and importlib.util.find_spec("pyarrow") is None:
+                continue
+            file_manager = FileManager(
+                data_directory=self._new_directory(),
+                logger=self.logger,
+                file_format=file_format,
+            )
+            results[f"file.save.{file_format}"] = _measure(
+                lambda _: file_manager._save_df_ohlcv(
+                    file_name="benchmark", ohlcv_dataframe=indexed
+                ),
+                repeat=self.repeat,
+            )
+            results[f"file.load.{file_format}"] = _measure(
+                lambda _: file_manager._read_df_ohlcv(file_name="benchmark"),
+                repeat=self.repeat,
+            )
+        return results
+
+    def _new_ohlcv(self, exchange: str, size: int) -> GenerateOHLCV:
+        return GenerateOHLCV(
+            symbol=FIXTURE_SYMBOLS[exchange],
+            timeframe=CYCLE_TIMEFRAME,
+            exchange=exchange,
+            num_candles=size // int(CYCLE_TIMEFRAME.rstrip("min")),
+            data_directory=self._new_directory(),
+            shared_instances={
+                "logger": self.logger,
+                "history_client": self.history_client,
+            },
+        )
+
+    def _bench_cycle(self, size: int) -> dict:
+        results = {}
+        for exchange in self.exchanges:
+            results[f"cycle.create.{exchange}"], results[f"cycle.update.{exchange}"] = (
+                self._measure_cycles(exchange=exchange, size=size)
+            )
+            gapfill_timing = self._measure_gapfill(exchange=exchange, size=size)
+            if gapfill_timing is not None:
+                results[f"cycle.gapfill.{exchange}"] = gapfill_timing
+        return results
+
+    def _measure_gapfill(self, exchange: str, size: int) -> dict:
+        """
+        Returns:
+            dict: Timing of the gap fill, None if no hole of GAP_HOLES fits in the size.
+        """
+        holes = [(end, candles) for end, candles in GAP_HOLES if end + candles < size]
+        if not holes:
+            return None
+
+        with self._new_ohlcv(exchange=exchange, size=size) as ohlcv_object:
+            complete = ohlcv_object.dataframe_release().copy()
+            keep = np.ones(len(complete), dtype=bool)
+            for end, candles in holes:
+                keep[len(complete) - end - candles : len(complete) - end] = False
+            self._check_gapfill(ohlcv_object=ohlcv_object, holed=complete[keep].copy())
+
+            def gapfill_cycle(existing_ohlcv_df):
+                ohlcv_object.dataframe_release(existing_ohlcv_df=existing_ohlcv_df)
+
+            timing = _measure(
+                gapfill_cycle, setup=lambda: complete[keep].copy(), repeat=self.repeat
+            )
+        timing["requests"] = ohlcv_object.gap_report["requests"]
+        return timing
+
+    def _check_gapfill(self, ohlcv_object, holed: pd.DataFrame):
+        """
+        Checks that the bars released after a gap fill equal a full conversion of the filled
+        history (the holes were converted before the fill).
+        """
+        timeframes = ("1min", *CONVERT_TIMEFRAMES)
+        for timeframe in timeframes:
+            ohlcv_object.timeframe_release(ohlcv_dataframe=holed, new_timeframe=timeframe)
+        filled = ohlcv_object.dataframe_release(existing_ohlcv_df=holed)
+        for timeframe in timeframes:
+            pd.testing.assert_frame_equal(
+                ohlcv_object.timeframe_release(
+                    ohlcv_dataframe=filled, new_timeframe=timeframe
+                ),
+                ohlcv_object.tf_organizer_instance.convert_timeframe(
+                    ohlcv_dataframe=filled, new_timeframe=timeframe
+                ),
+                check_exact=True,
+            )
+
+    def _measure_cycles(self, exchange: str, size: int) -> tuple:
+        """
+        Returns:
+            tuple: (create timing, update timing)
+        """
+
+        def create_cycle(_):
+            with self._new_ohlcv(exchange=exchange, size=size) as ohlcv_object:
+                ohlcv_object.timeframe_release()
+
+        create_timing = _measure(create_cycle, repeat=self.repeat)
+
+        with self._new_ohlcv(exchange=exchange, size=size) as ohlcv_object:
+            ohlcv_object.timeframe_release()
+            complete = ohlcv_object.ohlcv_df.copy()
+
+            def update_cycle(existing_ohlcv_df):
+                ohlcv_object.dataframe_release(existing_ohlcv_df=existing_ohlcv_df)
+                ohlcv_object.timeframe_release(ohlcv_dataframe=ohlcv_object.ohlcv_df)
+
+            update_timing = _measure(
+                update_cycle,
+                setup=lambda: complete.iloc[:-NEW_CANDLES].copy(),
+                repeat=self.repeat,
+            )
+        return create_timing, update_timing
+
+    def _bench_logging(self, size: int) -> dict:
+        results = {}
+        for level in LOG_LEVELS:
+            self.logger.logger.setLevel(level)
+            results[f"logging.create.{level}"], results[f"logging.update.{level}"] = (
+                self._measure_cycles(exchange=self.exchanges[0], size=size)
+            )
+        self.logger.logger.setLevel(self.log_level)
+        return results
+
+    # -------------------------------
+    def run(self) -> dict:
+        self.work_directory = tempfile.mkdtemp(prefix="benchmark-")
+        self.logger = LoggerManager(
+            log_directory=self.work_directory,
+            log_file_name="Benchmark.log",
+            log_level=self.log_level,
+        )
+        results = {}
+        try:
+            for size in self.sizes:
+                results[str(size)] = {
+                    **self._bench_decode(size=size),
+                    **self._bench_organizer(size=size),
+                    **self._bench_cycle(size=size),
+                    **self._bench_logging(size=size),
+                }
+        finally:
+            self.logger.close()
+            shutil.rmtree(self.work_directory, ignore_errors=True)
+
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "repeat": self.repeat,
+                "log_level": logging.getLevelName(self.log_level),
+            },
+            "results": results,
+        }
+
+    def save(self, report: dict, path: str = None) -> str:
+        if path is None:
+            os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+            path = os.path.join(RESULTS_DIRECTORY, f"{report['meta']['commit']}.json")
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+        return path
+
+    @staticmethod
+    def compare(base, head, threshold: float = REGRESSION_THRESHOLD) -> list:
+        """
+        Compares the medians of two reports (dicts or paths of stored reports) and prints them.
+
+        Returns:
+            list: (size, name, base ms, head ms, ratio) of the benchmarks of both reports.
+        """
+        reports = []
+        for report in (base, head):
+            if isinstance(report, str):
+                with open(report) as file:
+                    report = json.load(file)
+            reports.append(report)
+        base_report, head_report = reports
+
+        print(f"base: {base_report['meta']['commit']}  head: {head_report['meta']['commit']}")
+        rows = []
+        for size, base_results in base_report["results"].items():
+            head_results = head_report["results"].get(size, {})
+            for name, base_timing in base_results.items():
+                if name not in head_results:
+                    continue
+                base_ms = base_timing["median"]
+                head_ms = head_results[name]["median"]
+                ratio = head_ms / base_ms if base_ms > 0 else float("inf")
+                rows.append((size, name, base_ms, head_ms, ratio))
+
+                flag = ""
+                if ratio > threshold:
+                    flag = "REGRESSION"
+                elif ratio < 1 / threshold:
+                    flag = "faster"
+                print(
+                    f"{size:>6} {name:28} {base_ms:10.3f} ms {head_ms:10.3f} ms"
+                    f"  x{ratio:5.2f}  {flag}"
+                )
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the TF_Generator pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCHMARK_SIZES))
+    parser.add_argument("--exchanges", nargs="+", default=list(FIXTURE_SYMBOLS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--log-level", default=logging.getLevelName(DEFAULT_LOG_LEVEL))
+    parser.add_argument("--output", help="Path of the report (default: results/{commit}.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare two reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        PipelineBenchmark.compare(base=args.compare[0], head=args.compare[1])
+    else:
+        benchmark = PipelineBenchmark(
+            sizes=args.sizes,
+            exchanges=args.exchanges,
+            repeat=args.repeat,
+            log_level=logging.getLevelName(args.log_level.upper()),
+        )
+        report = benchmark.run()
+        for size, results in report["results"].items():
+            for name, timing in results.items():
+                throughput = timing.get("candles_per_second")
+                requests = timing.get("requests")
+                print(
+                    f"{size:>6} {name:28} median {timing['median']:10.3f} ms"
+                    f"  min {timing['min']:10.3f} ms"
+                    + (f"  {throughput / 1e6:6.2f} M candles/s" if throughput else "")
+                    + (f"  {requests} requests" if requests else "")
+                )
+        print("saved:", benchmark.save(report, path=args.output))
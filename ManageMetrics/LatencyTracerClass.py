@@ -0,0 +1,304 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import deque
+import numpy as np
+import functools
+import bisect
+import threading
+import inspect
+import json
+import time
+import os
+
+### LATENCY_BUCKETS (tuple): Upper bounds (seconds) of the histogram buckets, like a Prometheus histogram.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+### STATS_WINDOW (int): Number of recent samples per stage used for the exact percentiles.
+STATS_WINDOW = 2000
+### METRIC_NAME (str): Name of the Prometheus histogram of the stage latencies.
+METRIC_NAME = "robot_stage_latency_seconds"
+### ENABLE_ENV (str): Environment variable that enables the shared tracer at import ("1", "true").
+ENABLE_ENV = "ROBOT_LATENCY_TRACING"
+
+
+class _NullSpan:
+    """
+    Span of a disabled tracer: does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class _Span:
+    def __init__(self, tracer, stage: str):
+        self.tracer = tracer
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyTracer:
+    """
+    Per-stage latency histograms of the robot (fetch, regularize, index, signals, prices, orders).
+
+    A stage is timed with the `traced(stage)` decorator or a `span(stage)` block. When the tracer
+    is disabled a traced call costs one attribute check, and a span is a shared no-op object.
+    Every stage keeps a cumulative histogram (LATENCY_BUCKETS, count, sum, max) for the
+    Prometheus text format and its last STATS_WINDOW samples for exact p50/p99.
+
+    Methods:
+        - enable() / disable(): Starts / stops recording.
+        - span(stage: str): Context manager timing a block.
+        - record(stage: str, seconds: float): Adds a sample.
+        - get_stats() -> dict: {stage: {"count", "mean", "p50", "p99", "max"}} in milliseconds.
+        - to_prometheus() -> str: The histograms in the Prometheus text format.
+        - dump(path: str): Writes the histograms to a file (".json" for get_stats, Prometheus text otherwise).
+        - start_dump(path: str, interval: float = 60): Dumps periodically in a background thread.
+        - serve(port: int = 9108, host: str = "127.0.0.1"): Serves the Prometheus text on /metrics.
+        - stop(): Stops the dump thread and the server.
+
+    Example:
+        tracer = get_tracer()
+        tracer.enable()
+        with tracer.span("fetch.history"):
+            ...
+        tracer.start_dump(path="log_files/latency.prom", interval=60)
+    """
+
+    def __init__(self, enabled: bool = False, window: int = STATS_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.lock = threading.Lock()
+        self.bounds = list(LATENCY_BUCKETS)
+        self.stages = {}
+        self.dump_thread = None
+        self.dump_stop = threading.Event()
+        self.server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+
+    # ------- Functions: Record -------
+    def span(self, stage: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def record(self, stage: str, seconds: float):
+        with self.lock:
+            state = self.stages.get(stage)
+            if state is None:
+                state = self.stages[stage] = {
+                    "buckets": [0] * (len(self.bounds) + 1),
+                    "count": 0,
+                    "sum": 0.0,
+                    "max": 0.0,
+                    "samples": deque(maxlen=self.window),
+                }
+            state["buckets"][bisect.bisect_left(self.bounds, seconds)] += 1
+            state["count"] += 1
+            state["sum"] += seconds
+            if seconds > state["max"]:
+                state["max"] = seconds
+            state["samples"].append(seconds)
+
+    # ------- Functions: Output -------
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = {}
+            for stage, state in self.stages.items():
+                samples = np.asarray(state["samples"]) * 1e3
+                stats[stage] = {
+                    "count": state["count"],
+                    "mean": state["sum"] / state["count"] * 1e3,
+                    "p50": float(np.percentile(samples, 50)),
+                    "p99": float(np.percentile(samples, 99)),
+                    "max": state["max"] * 1e3,
+                }
+            return stats
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {METRIC_NAME} Latency of the robot stages.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self.lock:
+            for stage, state in sorted(self.stages.items()):
+                cumulative = np.cumsum(state["buckets"])
+                for bound, count in zip(self.bounds, cumulative):
+                    lines.append(
+                        f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound:g}"}} {count}'
+                    )
+                lines.append(
+                    f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {state["count"]}'
+                )
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {state["sum"]:.9f}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {state["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """
+        Writes the histograms to a file, replaced atomically.
+        """
+        if path.endswith(".json"):
+            content = json.dumps(self.get_stats(), indent=2)
+        else:
+            content = self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+
+    def start_dump(self, path: str, interval: float = 60.0):
+        if self.dump_thread is not None:
+            return
+        self.dump_stop.clear()
+
+        def dump_loop():
+            while not self.dump_stop.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        self.dump_thread = threading.Thread(target=dump_loop, daemon=True)
+        self.dump_thread.start()
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1"):
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                content = tracer.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_port
+
+    def stop(self):
+        if self.dump_thread is not None:
+            self.dump_stop.set()
+            self.dump_thread.join()
+            self.dump_thread = None
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+### The tracer shared by all instrumented modules
+_shared_tracer = LatencyTracer(
+    enabled=os.environ.get(ENABLE_ENV, "").lower() in ("1", "true", "yes")
+)
+
+
+def get_tracer() -> LatencyTracer:
+    """
+    Returns the LatencyTracer shared by all instrumented modules.
+    """
+    return _shared_tracer
+
+
+def set_tracer(tracer: LatencyTracer) -> None:
+    """
+    Replaces the shared LatencyTracer (e.g. a tracer with another window).
+    """
+    global _shared_tracer
+    _shared_tracer = tracer
+
+
+def traced(stage: str):
+    """
+    Decorator timing every call of a function or coroutine as `stage` in the shared tracer.
+    """
+
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _shared_tracer
+                if not tracer.enabled:
+                    return await function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    tracer.record(stage, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _shared_tracer
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    # Cost of a traced call, disabled and enabled
+    @traced("example.noop")
+    def noop():
+        return None
+
+    def plain():
+        return None
+
+    num_calls = 200000
+    for label, function in (("plain", plain), ("traced (disabled)", noop)):
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            function()
+        elapsed = time.perf_counter() - start
+        print(f"{label:18}: {elapsed / num_calls * 1e9:6.0f} ns / call")
+
+    get_tracer().enable()
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        noop()
+    elapsed = time.perf_counter() - start
+    print(f"{'traced (enabled)':18}: {elapsed / num_calls * 1e9:6.0f} ns / call")
+    print(get_tracer().get_stats())
+    print(get_tracer().to_prometheus()[:400])
@@ -0,0 +1,119 @@
+import time
+import re
+
+### ACTIVE_STATUS (set): Order statuses of resting orders (used when a response has no "active" field).
+ACTIVE_STATUS = {"NEW", "PARTIALLY_FILLED"}
+### CLIENT_ID_PATTERN (re.Pattern): Client id built by SpotOrderManager: {specific_order_id}-{type}-{side}-Time-{time}.
+CLIENT_ID_PATTERN = re.compile(r"^(?P<prefix>.+)-(?:LIMIT|MARKET)-(?:BUY|SELL)-Time-")
+
+
+class OrderStateBook:
+    """
+    Local state of the orders of an account, keyed by client order id.
+
+    The book is kept in sync from the responses of the order calls (set, get, delete) and from a
+    periodic reconciliation with the open orders of the exchange. The active orders are indexed
+    by strategy prefix (the `specific_order_id` of SpotOrderManager), so the orders of a strategy
+    are found in O(1) instead of scanning the open orders.
+
+    Methods:
+        - update(order: dict) -> dict: Stores the order of a response ("result" of set_order/get_order/del_order).
+        - reconcile(open_orders: list, symbol: str = None): Syncs the book with the open orders of the exchange.
+        - active_ids(prefix: str) -> set: Client ids of the active orders of a strategy.
+        - has_active(prefix: str) -> bool: True if the strategy has an active order.
+        - is_stale(max_age: float) -> bool: True if the book was never reconciled, or too long ago, or marked stale.
+        - mark_stale(): Forces a reconciliation before the next decision (e.g. after a failed call).
+    """
+
+    def __init__(self):
+        self.orders = {}
+        self.active_by_prefix = {}
+        self.last_reconcile = None
+        self.stale = True
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self.orders
+
+    def get(self, client_id: str) -> dict:
+        return self.orders.get(client_id)
+
+    def _prefix(self, client_id: str) -> str:
+        match = CLIENT_ID_PATTERN.match(client_id)
+        return match.group("prefix") if match else client_id
+
+    def _is_active(self, order: dict) -> bool:
+        if "active" in order:
+            return bool(order["active"])
+        return order.get("status") in ACTIVE_STATUS
+
+    def _index(self, client_id: str, active: bool):
+        prefix = self._prefix(client_id)
+        active_ids = self.active_by_prefix.setdefault(prefix, set())
+        if active:
+            active_ids.add(client_id)
+        else:
+            active_ids.discard(client_id)
+
+    # -------------------------------
+    def update(self, order: dict) -> dict:
+        """
+        Stores an order of a response, a response without "clientOrderId" is ignored.
+
+        Returns:
+            dict: The stored order (None if ignored).
+        """
+        if not isinstance(order, dict) or not order.get("clientOrderId"):
+            return None
+        client_id = order["clientOrderId"]
+        stored = self.orders.setdefault(client_id, {})
+        stored.update(order)
+        self._index(client_id, self._is_active(stored))
+        return stored
+
+    def set_status(self, client_id: str, status: str, active: bool = False):
+        if client_id in self.orders:
+            self.orders[client_id].update({"status": status, "active": active})
+            self._index(client_id, active)
+
+    def reconcile(self, open_orders: list, symbol: str = None):
+        """
+        Syncs the book with the open orders of the exchange: the open orders are stored, the
+        active orders of the book (of `symbol`, or of all symbols) missing on the exchange are closed.
+
+        Parameters:
+            open_orders (list): The "orders" of an open orders response.
+            symbol (str): Symbol of the open orders query (None for all symbols).
+        """
+        open_ids = set()
+        for order in open_orders:
+            stored = self.update(order)
+            if stored is not None:
+                open_ids.add(stored["clientOrderId"])
+
+        for client_id, order in self.orders.items():
+            if client_id in open_ids or not self._is_active(order):
+                continue
+            if symbol is None or order.get("symbol") == symbol:
+                ### Filled or cancelled since the last response, the exact status is unknown
+                order.update({"status": "CLOSED", "active": False})
+                self._index(client_id, False)
+
+        self.last_reconcile = time.monotonic()
+        self.stale = False
+
+    def active_ids(self, prefix: str) -> set:
+        return set(self.active_by_prefix.get(prefix, ()))
+
+    def has_active(self, prefix: str) -> bool:
+        return bool(self.active_by_prefix.get(prefix))
+
+    def is_stale(self, max_age: float) -> bool:
+        if self.stale or self.last_reconcile is None:
+            return True
+        return time.monotonic() - self.last_reconcile > max_age
+
+    def mark_stale(self):
+        self.stale = True
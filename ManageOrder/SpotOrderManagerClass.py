@@ -1,8 +1,12 @@
 import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
+
 file_path = os.path.abspath(__file__)
 folder_path = os.path.dirname(file_path)
 app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
@@ -11,15 +15,43 @@ app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
 
 sys.path.append(app_directory)
 from WallexApiClass.WallexOrdersManage import OrdersManage
+from ManageOrder.OrderBookClass import OrderStateBook
+from ManageMetrics.LatencyTracerClass import traced
+
+### RECONCILE_INTERVAL (float): Seconds after which the order book is synced with the open orders again
+### (ten 1min candles: the responses of the orders and cancels keep the book up to date meanwhile).
+RECONCILE_INTERVAL = 600.0
+### CANCEL_WORKERS (int): Maximum number of cancel requests in flight (the rate limiter keeps the budget).
+CANCEL_WORKERS = 8
+### CANCEL_FINAL_STATUS (set): Statuses of a cancel response that need no confirmation.
+CANCEL_FINAL_STATUS = {"CANCELED", "FILLED", "EXPIRED", "REJECTED"}
+### CONFIRM_TIMEOUT (float): Seconds of confirmation polling of a bulk cancel.
+CONFIRM_TIMEOUT = 2.0
+### CONFIRM_POLL (tuple): (first, maximum) delay in seconds between two confirmation polls.
+CONFIRM_POLL = (0.05, 0.5)
+### LATENCY_WINDOW (int): Number of recent cancel / cancel-and-replace latencies kept.
+LATENCY_WINDOW = 1000
 
 
 class SpotOrderManager:
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url=None, reconcile_interval=RECONCILE_INTERVAL):
         self.api_key = api_key
+        self.base_url = base_url
+        self.reconcile_interval = reconcile_interval
         self.setupOrderManager()
 
     def setupOrderManager(self):
-        self.orders_api_instance = OrdersManage(api_key=self.api_key)
+        if self.base_url is None:
+            self.orders_api_instance = OrdersManage(api_key=self.api_key)
+        else:
+            self.orders_api_instance = OrdersManage(
+                api_key=self.api_key, base_url=self.base_url
+            )
+        self.order_book = OrderStateBook()
+        self.latencies = {
+            "cancel": deque(maxlen=LATENCY_WINDOW),
+            "cancel_and_replace": deque(maxlen=LATENCY_WINDOW),
+        }
         self.init_variables()
 
     def init_variables(self):
@@ -48,22 +80,55 @@ class SpotOrderManager:
         # print("open_orders_result:", self.open_orders_result)
         return self.open_orders_result
 
+    def fetch_open_orders(self, symbol=None):
+        """
+        Queries the open orders (network only, the order book is not changed).
+
+        Returns:
+            list: The "orders" of the response, None on error.
+        """
+        open_orders_result = self.orders_api_instance.get_open_orders(
+            symbol=symbol or self.symbol
+        )
+        return self._result(open_orders_result).get("orders")
+
     def get_open_orders_id(self):
         open_orders_result = self.get_open_orders_result()
-        self.len_open_orders = len(open_orders_result["result"]["orders"])
-
-        for i in range(self.len_open_orders):
-            self.open_orders_id.append(
-                open_orders_result["result"]["orders"][i]["clientOrderId"]
-            )
+        return self.apply_open_orders(
+            open_orders=self._result(open_orders_result).get("orders")
+        )
 
-        print("\n")
+    def apply_open_orders(self, open_orders):
+        """
+        Reconciles the order book with the open orders of a response (None: unknown, the book is
+        marked stale).
+
+        Returns:
+            list: Client ids of the open orders.
+        """
+        if open_orders is None:
+            self.order_book.mark_stale()
+            return self.open_orders_id
+
+        ### The open orders are also the reconciliation of the order book
+        self.order_book.reconcile(open_orders=open_orders, symbol=self.symbol)
+        self.len_open_orders = len(open_orders)
+        self.open_orders_id = [order["clientOrderId"] for order in open_orders]
         # print(f"open_orders_id:", self.open_orders_id)
 
         return self.open_orders_id
 
+    def reconcile(self):
+        return self.get_open_orders_id()
+
+    def _result(self, response):
+        if isinstance(response, dict) and isinstance(response.get("result"), dict):
+            return response["result"]
+        return {}
+
     def get_order_result(self, order_id):
         self.order_result = self.orders_api_instance.get_order(clientOrderId=order_id)
+        self.order_book.update(self._result(self.order_result))
         # print("order_result:", self.order_result)
         return self.order_result
 
@@ -76,27 +141,124 @@ class SpotOrderManager:
             quantity=self.quantity,
             client_id=self.client_id,
         )
+        if self.order_book.update(self._result(order)) is None:
+            ### Unknown outcome (error or timeout): read the open orders before the next order
+            self.order_book.mark_stale()
         # print("\n")
         # print("Order :", order)
         return order
 
     def delete_order(self, order_id):
-        self.orders_api_instance.del_order(clientOrderId=order_id)
+        delete_result = self.orders_api_instance.del_order(clientOrderId=order_id)
+        if self.order_book.update(self._result(delete_result)) is None:
+            self.order_book.mark_stale()
+        return delete_result
+
+    def _send_cancels(self, order_ids):
+        """
+        Sends the cancel requests concurrently, returns {client_id: status of the response}.
+        """
+        max_workers = min(CANCEL_WORKERS, len(order_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            delete_results = list(
+                executor.map(
+                    lambda order_id: self.orders_api_instance.del_order(
+                        clientOrderId=order_id
+                    ),
+                    order_ids,
+                )
+            )
 
+        outcomes = {}
+        for order_id, delete_result in zip(order_ids, delete_results):
+            self.order_book.update(self._result(delete_result))
+            outcomes[order_id] = self._result(delete_result).get("status") or "FAILED"
+        return outcomes
+
+    def cancel_orders(self, order_ids, confirm=True, timeout=CONFIRM_TIMEOUT):
+        """
+        Cancels orders concurrently (at most CANCEL_WORKERS requests in flight, the account
+        rate limit of the session pool keeps the budget).
+
+        The orders whose cancel response is not final (error, timeout, pending) are confirmed
+        with the open orders: one query, repeated with a growing delay while some of them are
+        still open, until `timeout`. A still open order whose cancel request failed is cancelled again.
+
+        Returns:
+            dict: {client_id: outcome} ("CANCELED", "FILLED", ..., "CLOSED" when confirmed
+            missing from the open orders, "OPEN" when still open after the timeout,
+            "FAILED" when it could not be confirmed).
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return {}
+        start_time = time.perf_counter()
+
+        outcomes = self._send_cancels(order_ids)
+        pending = [i for i in order_ids if outcomes[i] not in CANCEL_FINAL_STATUS]
+        if confirm and pending:
+            poll_delay, max_poll_delay = CONFIRM_POLL
+            deadline = time.perf_counter() + timeout
+            while True:
+                open_ids = set(self.get_open_orders_id())
+                if self.order_book.stale:
+                    break
+                failed = [i for i in pending if i in open_ids and outcomes[i] == "FAILED"]
+                for order_id in pending:
+                    if order_id not in open_ids:
+                        outcomes[order_id] = "CLOSED"
+                    elif outcomes[order_id] != "FAILED":
+                        outcomes[order_id] = "OPEN"
+                pending = [i for i in pending if outcomes[i] in ("OPEN", "FAILED")]
+                if not pending or time.perf_counter() + poll_delay > deadline:
+                    break
+                if failed:
+                    outcomes.update(self._send_cancels(failed))
+                    pending = [i for i in pending if outcomes[i] not in CANCEL_FINAL_STATUS]
+                    if not pending:
+                        break
+                time.sleep(poll_delay)
+                poll_delay = min(poll_delay * 2, max_poll_delay)
+
+        if any(outcome in ("FAILED", "OPEN") for outcome in outcomes.values()):
+            self.order_book.mark_stale()
+        self.latencies["cancel"].append(time.perf_counter() - start_time)
+        return outcomes
+
+    def get_latency_stats(self):
+        """
+        Returns the p50/p99/max (milliseconds) of the bulk cancels and of the cancel-and-replace
+        (from the first cancel request to the response of the new order).
+        """
+        stats = {}
+        for name, samples in self.latencies.items():
+            values = np.asarray(samples) * 1e3
+            if len(values) == 0:
+                stats[name] = {"count": 0}
+                continue
+            stats[name] = {
+                "count": len(values),
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+            }
+        return stats
+
+    @traced("order.manage")
     def order_manage(self, order_params):
         self.set_order_params(order_params=order_params)
 
-        for order_id in self.open_orders_id:
-            if order_id.startswith(self.specific_order_id):
-                print("Delete Order :", self.delete_order(order_id=order_id))
-                time.sleep(1)
+        ### The order book replaces the open orders query, it is read again only when stale
+        if self.order_book.is_stale(max_age=self.reconcile_interval):
+            self.get_open_orders_id()
+
+        cancel_start_time = None
+        stale_order_ids = self.order_book.active_ids(self.specific_order_id)
+        if stale_order_ids:
+            cancel_start_time = time.perf_counter()
+            print("Delete Orders :", self.cancel_orders(order_ids=stale_order_ids))
 
-        self.open_orders_id.clear()
-        self.get_open_orders_id()
-        self.order_allowed = True
-        for order_id in self.open_orders_id:
-            if order_id.startswith(self.specific_order_id):
-                self.order_allowed = False
+        self.order_allowed = not self.order_book.has_active(self.specific_order_id)
 
         print("\n")
         print("order_allowed:", self.order_allowed)
@@ -110,8 +272,12 @@ class SpotOrderManager:
                 self.price = float("{:.4f}".format(self.price - self.price * 0.45))
                 print("order price 1 :", self.price)
                 order = self.set_order()
-                if order["result"]["status"] == "NEW":
+                if self._result(order).get("status") == "NEW":
                     self.status_order = True
+                if cancel_start_time is not None:
+                    self.latencies["cancel_and_replace"].append(
+                        time.perf_counter() - cancel_start_time
+                    )
                 # if order["result"]["status"] == "CANCELED":
                 #     self.status_order = False
 
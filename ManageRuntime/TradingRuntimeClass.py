@@ -0,0 +1,461 @@
+import asyncio
+import signal
+import time
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.ManagerFeeds import FeedManager
+from ManageTimeIdx.TimeIdxClass import TimeAndIdxManage
+from ManageTimeIdx.CandleSchedulerClass import (
+    CandleScheduler,
+    DEFAULT_SETTLE_DELAY,
+    timeframe_seconds,
+)
+from TechnicalAnalysis.TechnicalClass import TradingStrategy
+from TechnicalAnalysis.CalculatePricesClass import CalculatePrices
+from ManageOrder.SpotOrderManagerClass import SpotOrderManager
+from ManageMetrics.LatencyTracerClass import get_tracer
+
+### RECONCILE_INTERVAL (float): Seconds between two queries of the open orders of a strategy.
+RECONCILE_INTERVAL = 30.0
+### COMPACT_RECORDS (int): Journaled candles of a feed that trigger a snapshot by the persistence task.
+COMPACT_RECORDS = 720
+### DEFAULT_PRICES_PARAMS (dict): Arguments of CalculatePrices when a strategy gives none.
+DEFAULT_PRICES_PARAMS = {
+    "allow_pip_sl": 0.002,
+    "add_to_stop_loss": 0.001,
+    "min_reward_to_risk": 2,
+}
+
+
+class StrategyInstance:
+    """
+    One trading strategy on one feed: the per-candle logic of main.py, without the I/O.
+
+    The instance keeps its own TradingStrategy, CalculatePrices and candle index, so many
+    instances (symbols, timeframes or parameter sets) run side by side in one TradingRuntime.
+    The orders are sent by its SpotOrderManager (no orders are sent when api_key is None).
+
+    Methods:
+        - __init__(symbol: str, exchange: str, timeframe: str, quantity: str, api_key: str, ...): Initializes the strategy instance.
+        - evaluate(data: pd.DataFrame) -> dict: Signals of the last candles, returns the order params or None.
+        - submit_order(order_params: dict) -> bool: Sends the order (blocking I/O, run in a thread).
+        - reconcile_orders() -> list: Client ids of the open orders (blocking I/O, run in a thread).
+        - fetch_open_orders() -> list: Open orders of the exchange, None on error (blocking I/O, run in a thread).
+        - apply_open_orders(open_orders: list) -> list: Reconciles the order book with fetched open orders.
+        - on_order_result(status_order: bool): Resets the signal once the order is placed.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: str = "Wallex",
+        timeframe: str = "1min",
+        quantity: str = None,
+        api_key: str = None,
+        type_order: str = "LIMIT",
+        specific_order_id: str = None,
+        strategy_params: dict = None,
+        prices_params: dict = None,
+    ):
+        """
+        Initializes a new instance of the StrategyInstance class.
+
+        Args:
+            symbol (str): Market symbol.
+            exchange (str, optional): Exchange of the feed.
+            timeframe (str, optional): Timeframe of the feed.
+            quantity (str, optional): Quantity of the orders.
+            api_key (str, optional): API key of the orders (dry run if None).
+            type_order (str, optional): Type of the orders.
+            specific_order_id (str, optional): Prefix of the client order ids of this strategy.
+            strategy_params (dict, optional): Arguments of TradingStrategy.
+            prices_params (dict, optional): Arguments of CalculatePrices.
+        """
+        self.symbol = symbol
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.quantity = quantity
+        self.type_order = type_order
+        self.specific_order_id = specific_order_id or f"MohZeh-{symbol}"
+        self.key = (exchange, symbol, timeframe)
+
+        self.time_and_idx_instance = TimeAndIdxManage(
+            period_seconds=timeframe_seconds(timeframe)
+        )
+        self.trading_strategy_instance = TradingStrategy(**(strategy_params or {}))
+        self.calculate_prices_instance = CalculatePrices(
+            **(prices_params or DEFAULT_PRICES_PARAMS)
+        )
+        self.order_manage_instance = None
+        if api_key is not None:
+            self.order_manage_instance = SpotOrderManager(api_key=api_key)
+
+        self.idx = 0
+        self.side = None
+        self.last_date = None
+        self.open_orders_id = []
+        ### Orders submitted so far, an open-orders response started before the last one is outdated
+        self.order_generation = 0
+
+    def evaluate(self, data) -> dict:
+        """
+        Evaluates the signals of the new candles (all missed candles at the first call).
+
+        Returns:
+            dict: The order params of a live signal with a price, None otherwise.
+        """
+        idx = self.time_and_idx_instance.get_idx(idx=self.idx, last_date=self.last_date)
+        if idx != -1:
+            signals_dict = self.trading_strategy_instance.catch_up_signals(
+                start_idx=idx, data=data
+            )
+            idx = -1
+        else:
+            signals_dict = self.trading_strategy_instance.get_signals_dict(
+                idx=idx, data=data
+            )
+        self.idx = idx
+        self.last_date = int(data.index[idx])
+        if signals_dict is not None:
+            self.side = signals_dict["signal_side"]
+
+        prices_dict = self.calculate_prices_instance.get_prices_dict(
+            idx=idx, signals_dict=signals_dict
+        )
+        if prices_dict is None or prices_dict["order_price"] is None:
+            return None
+
+        return {
+            "symbol": self.symbol,
+            "type_order": self.type_order,
+            "side": self.side,
+            "price": prices_dict["order_price"],
+            "quantity": self.quantity,
+            "specific_order_id": self.specific_order_id,
+        }
+
+    def submit_order(self, order_params: dict) -> bool:
+        if self.order_manage_instance is None:
+            print("dry run order:", order_params)
+            return False
+        try:
+            return self.order_manage_instance.order_manage(order_params=order_params)
+        finally:
+            ### Counted once the order is in the book (a query started before may miss it)
+            self.order_generation += 1
+
+    def reconcile_orders(self) -> list:
+        return self.apply_open_orders(self.fetch_open_orders())
+
+    def fetch_open_orders(self) -> list:
+        if self.order_manage_instance is None:
+            return []
+        return self.order_manage_instance.fetch_open_orders(symbol=self.symbol)
+
+    def apply_open_orders(self, open_orders: list) -> list:
+        if self.order_manage_instance is None:
+            return []
+        self.order_manage_instance.symbol = self.symbol
+        self.open_orders_id = list(
+            self.order_manage_instance.apply_open_orders(open_orders=open_orders)
+        )
+        return self.open_orders_id
+
+    def on_order_result(self, status_order: bool):
+        if status_order == True:
+            self.trading_strategy_instance.reset_signal()
+
+
+class TradingRuntime:
+    """
+    Asyncio runtime of many StrategyInstance objects in one process.
+
+    The stages of main.py run as separate tasks connected by queues:
+        - market data: one task per timeframe, refreshes its feeds at every candle close (CandleScheduler).
+        - signals: evaluates the strategies on the released DataFrames (CPU only, never waits for I/O).
+        - orders: one task per strategy, sends its orders in a thread (only the newest order is kept).
+        - reconciliation: one task per strategy, queries the open orders in a thread every RECONCILE_INTERVAL.
+        - persistence: snapshots the journaled candles of the feeds between two refreshes.
+    A slow exchange request only holds the order or reconciliation task of its strategy, the
+    next candle is evaluated on time. SIGINT/SIGTERM (or stop()) shut the tasks down, the
+    pending orders are finished and the feeds are saved.
+
+    Methods:
+        - __init__(strategies: list, num_candles: int, settle_delay: float, ...): Initializes the runtime.
+        - add_strategy(strategy: StrategyInstance): Adds a strategy (before run).
+        - run(cycles: int = None): Runs the runtime (blocking), until stop() or `cycles` candle closes.
+        - run_async(cycles: int = None): run, in the running event loop.
+        - stop(): Asks the tasks to stop.
+        - get_stats() -> dict: Jitter and latency statistics of every timeframe ("stages": LatencyTracer stats when enabled).
+
+    Example:
+        runtime = TradingRuntime(num_candles=400)
+        for symbol in ["SHIBTMN", "DOGETMN"]:
+            runtime.add_strategy(StrategyInstance(symbol=symbol, quantity="1000000"))
+        runtime.run()
+    """
+
+    def __init__(
+        self,
+        strategies: list = None,
+        num_candles: int = 400,
+        settle_delay: float = DEFAULT_SETTLE_DELAY,
+        reconcile_interval: float = RECONCILE_INTERVAL,
+        compact_records: int = COMPACT_RECORDS,
+        feed_manager: FeedManager = None,
+    ):
+        """
+        Initializes a new instance of the TradingRuntime class.
+
+        Args:
+            strategies (list, optional): StrategyInstance objects.
+            num_candles (int, optional): Number of candles of the feeds.
+            settle_delay (float, optional): Seconds waited after a candle close (see CandleScheduler).
+            reconcile_interval (float, optional): Seconds between two open-orders queries of a strategy.
+            compact_records (int, optional): Journaled candles of a feed that trigger a snapshot.
+            feed_manager (FeedManager, optional): Feeds of the strategies. Defaults to a new FeedManager.
+        """
+        self.num_candles = num_candles
+        self.settle_delay = settle_delay
+        self.reconcile_interval = reconcile_interval
+        self.compact_records = compact_records
+        self.feed_manager = feed_manager or FeedManager(num_candles=num_candles)
+
+        self.strategies = []
+        self.schedulers = {}
+        self.stop_event = None
+        self.cycles_done = {}
+        for strategy in strategies or []:
+            self.add_strategy(strategy)
+
+    def add_strategy(self, strategy: StrategyInstance):
+        self.feed_manager.add_feed(
+            symbol=strategy.symbol,
+            exchange=strategy.exchange,
+            timeframe=strategy.timeframe,
+        )
+        if strategy.timeframe not in self.schedulers:
+            self.schedulers[strategy.timeframe] = CandleScheduler(
+                timeframe=strategy.timeframe, settle_delay=self.settle_delay
+            )
+        self.strategies.append(strategy)
+
+    def stop(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    # ------- Functions: Tasks -------
+    async def _market_data_task(self, timeframe: str, cycles: int):
+        """
+        Refreshes the feeds of a timeframe at every candle close.
+        """
+        candle_scheduler = self.schedulers[timeframe]
+        keys = list(
+            {
+                strategy.key
+                for strategy in self.strategies
+                if strategy.timeframe == timeframe
+            }
+        )
+        self.cycles_done[timeframe] = 0
+        while cycles is None or self.cycles_done[timeframe] < cycles:
+            if self.cycles_done[timeframe] > 0:
+                event = await candle_scheduler.wait_next_async()
+                if event["missed"]:
+                    print(timeframe, "missed candles:", len(event["missed"]))
+            async with self.feed_lock:
+                frames = await self.feed_manager.refresh_async(keys=keys)
+            candle_scheduler.mark("data_released")
+            await self.signal_queue.put((timeframe, frames))
+            await self.persist_queue.put(keys)
+            self.cycles_done[timeframe] += 1
+
+    async def _signal_task(self):
+        """
+        Evaluates the strategies on the released DataFrames and queues their orders.
+        """
+        while True:
+            item = await self.signal_queue.get()
+            if item is None:
+                break
+            timeframe, frames = item
+            for strategy in self.strategies:
+                if strategy.key not in frames:
+                    continue
+                try:
+                    order_params = strategy.evaluate(frames[strategy.key])
+                except Exception as e:
+                    print("signal error:", strategy.key, repr(e))
+                    continue
+                if order_params is not None:
+                    self._put_newest(self.order_queues[id(strategy)], order_params)
+            self.schedulers[timeframe].mark("signals_evaluated")
+
+    def _put_newest(self, queue: asyncio.Queue, item):
+        """
+        Puts an item in a queue of size 1, an item not taken yet is replaced (it is outdated).
+        """
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    async def _order_task(self, strategy: StrategyInstance):
+        """
+        Sends the orders of a strategy, the blocking requests run in a thread.
+        """
+        order_queue = self.order_queues[id(strategy)]
+        while True:
+            order_params = await order_queue.get()
+            if order_params is None:
+                break
+            async with self.order_locks[id(strategy)]:
+                try:
+                    status_order = await asyncio.to_thread(
+                        strategy.submit_order, order_params
+                    )
+                except Exception as e:
+                    print("order error:", strategy.key, repr(e))
+                    continue
+            self.schedulers[strategy.timeframe].mark("order_submitted")
+            strategy.on_order_result(status_order)
+
+    async def _reconcile_task(self, strategy: StrategyInstance):
+        """
+        Queries the open orders of a strategy every reconcile_interval seconds. The request runs
+        outside the order lock, so a slow query never holds an order back; the response is
+        applied under the lock, unless an order was submitted meanwhile (it is then outdated).
+        """
+        while not self.stop_event.is_set():
+            order_generation = strategy.order_generation
+            try:
+                open_orders = await asyncio.to_thread(strategy.fetch_open_orders)
+            except Exception as e:
+                print("reconcile error:", strategy.key, repr(e))
+            else:
+                async with self.order_locks[id(strategy)]:
+                    if strategy.order_generation == order_generation:
+                        strategy.apply_open_orders(open_orders)
+            try:
+                await asyncio.wait_for(
+                    self.stop_event.wait(), timeout=self.reconcile_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _persistence_task(self):
+        """
+        Snapshots the feeds with many journaled candles. Only the copy of the DataFrame and the
+        truncation of the journal run under the feed lock, the file is written in a thread
+        outside of it, so the next refresh is never delayed by the file. The candles journaled
+        while the file was written are kept in the journal.
+        """
+        while True:
+            keys = await self.persist_queue.get()
+            if keys is None:
+                break
+            for key in keys:
+                feed = self.feed_manager.feeds[key]
+                journal = feed.journal_manager_instance
+                if journal is None or journal.num_records < self.compact_records:
+                    continue
+                async with self.feed_lock:
+                    snapshot = feed.ohlcv_df.copy()
+                last_timestamp = int(snapshot["TimeStamp"].iloc[-1])
+                await asyncio.to_thread(
+                    feed.file_manager_instance._save_df_ohlcv,
+                    file_name=feed.file_name_df,
+                    ohlcv_dataframe=snapshot,
+                )
+                async with self.feed_lock:
+                    journal.truncate(last_timestamp=last_timestamp, up_to=last_timestamp)
+
+    # -------------------------------
+    def _add_signal_handlers(self, loop):
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    async def run_async(self, cycles: int = None):
+        """
+        Runs the tasks until stop() or `cycles` candle closes of every timeframe, then shuts down.
+
+        Args:
+            cycles (int, optional): Number of candle closes (forever if None).
+        """
+        self.stop_event = asyncio.Event()
+        self.feed_lock = asyncio.Lock()
+        self.signal_queue = asyncio.Queue()
+        self.persist_queue = asyncio.Queue()
+        self.order_queues = {
+            id(strategy): asyncio.Queue(maxsize=1) for strategy in self.strategies
+        }
+        self.order_locks = {id(strategy): asyncio.Lock() for strategy in self.strategies}
+        self._add_signal_handlers(asyncio.get_running_loop())
+
+        market_tasks = [
+            asyncio.create_task(self._market_data_task(timeframe, cycles))
+            for timeframe in self.schedulers
+        ]
+        signal_task = asyncio.create_task(self._signal_task())
+        persistence_task = asyncio.create_task(self._persistence_task())
+        order_tasks = [
+            asyncio.create_task(self._order_task(strategy))
+            for strategy in self.strategies
+        ]
+        reconcile_tasks = [
+            asyncio.create_task(self._reconcile_task(strategy))
+            for strategy in self.strategies
+        ]
+
+        stop_task = asyncio.create_task(self.stop_event.wait())
+        market_done = asyncio.gather(*market_tasks, return_exceptions=True)
+        await asyncio.wait([stop_task, market_done], return_when=asyncio.FIRST_COMPLETED)
+
+        ### Graceful shutdown: stop the sources, then drain the queues in the stage order
+        self.stop_event.set()
+        for task in market_tasks:
+            task.cancel()
+        await market_done
+        stop_task.cancel()
+        await self.signal_queue.put(None)
+        await signal_task
+        for strategy in self.strategies:
+            await self.order_queues[id(strategy)].put(None)
+        await asyncio.gather(*order_tasks, *reconcile_tasks, return_exceptions=True)
+        await self.persist_queue.put(None)
+        await persistence_task
+        await self.feed_manager.close_async()
+
+    def run(self, cycles: int = None):
+        asyncio.run(self.run_async(cycles=cycles))
+
+    def get_stats(self) -> dict:
+        stats = {
+            timeframe: candle_scheduler.get_stats()
+            for timeframe, candle_scheduler in self.schedulers.items()
+        }
+        if get_tracer().enabled:
+            stats["stages"] = get_tracer().get_stats()
+        return stats
+
+
+if __name__ == "__main__":
+    # Example usage: three dry-run strategies (no API key) on two timeframes, two candle closes
+    start = time.perf_counter()
+    runtime = TradingRuntime(num_candles=400)
+    feeds = [("SHIBTMN", "1min"), ("DOGETMN", "1min"), ("SHIBTMN", "5min")]
+    for symbol, timeframe in feeds:
+        runtime.add_strategy(
+            StrategyInstance(symbol=symbol, timeframe=timeframe, quantity="1000000")
+        )
+    runtime.run(cycles=2)
+    print(f"run: {time.perf_counter() - start:.1f} s")
+    print(runtime.get_stats())
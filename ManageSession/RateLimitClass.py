@@ -0,0 +1,281 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import threading
+import asyncio
+import random
+import time
+
+### ENDPOINT_CLASSES (dict): Priority of the endpoint classes (higher is served first).
+ENDPOINT_CLASSES: dict = {
+    "account": 1,  # Signed calls: orders, open orders, trades
+    "market": 0,  # Public market data: history, depth, trades
+}
+### RATE_LIMITS (dict): (tokens per second, burst) of every exchange, per endpoint class,
+### "exchange" is the budget shared by all classes of the exchange (IP limit).
+RATE_LIMITS: dict = {
+    "Wallex": {"exchange": (8, 16), "market": (6, 12), "account": (4, 8)},
+    "Nobitex": {"exchange": (5, 10), "market": (4, 8), "account": (2, 4)},
+    "BingX": {"exchange": (20, 40), "market": (15, 30), "account": (10, 20)},
+    "Binance": {"exchange": (40, 80), "market": (30, 60), "account": (10, 20)},
+    "Coinbase": {"exchange": (10, 15), "market": (8, 15), "account": (5, 10)},
+}
+### DEFAULT_RATE_LIMIT (tuple): (tokens per second, burst) of unknown exchanges or classes.
+DEFAULT_RATE_LIMIT: tuple = (10, 20)
+### PRIORITY_RESERVE (float): Share of the exchange budget that only high-priority calls may use.
+PRIORITY_RESERVE: float = 0.25
+### RETRY_STATUS (set): HTTP status codes answered with a backoff (and a retry, see retry_status).
+RETRY_STATUS: set = {418, 429, 503}
+### REJECTED_STATUS (set): Rate-limit status codes of a request the exchange did not process.
+REJECTED_STATUS: set = {418, 429}
+### IDEMPOTENT_METHODS (set): HTTP methods that are safe to send again whatever the response.
+IDEMPOTENT_METHODS: set = {"GET", "HEAD", "OPTIONS"}
+
+
+def retry_status(method: str) -> set:
+    """
+    Status codes a request is sent again on. A 503 may come from a gateway after the exchange
+    processed the request, so an order (POST / DELETE) is only sent again when it was rejected.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return RETRY_STATUS
+    return REJECTED_STATUS
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, at most `capacity` tokens stored.
+
+    The bucket is not thread-safe by itself, RateLimiter serializes all access.
+    """
+
+    def __init__(self, rate: float, capacity: float, reserve: float = 0):
+        self.rate = rate
+        self.capacity = capacity
+        self.reserve = reserve
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float, reserve: float = 0) -> float:
+        """Seconds until one token is available above `reserve` (0 if available now)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        missing = reserve + 1 - self.tokens
+        return max(missing / self.rate, 0.0)
+
+
+class RateLimiter:
+    """
+    Rate-limit scheduler shared by all exchange clients.
+
+    Every (exchange, endpoint class) has a token bucket, and every exchange has a shared bucket
+    for its overall budget. Market data calls can not use the last PRIORITY_RESERVE of the shared
+    bucket and wait while an account call is waiting, so a backfill never delays an order.
+    Responses with a RETRY_STATUS block the exchange for `Retry-After` seconds or a jittered
+    exponential backoff that grows with the consecutive failures of the class bucket: the limits
+    of the exchanges are per IP, so the other endpoint classes wait too.
+
+    Methods:
+        acquire(self, exchange: str, endpoint_class: str): Waits for a token (blocking).
+        acquire_async(self, exchange: str, endpoint_class: str): Waits for a token (asyncio).
+        backoff(self, exchange: str, endpoint_class: str, retry_after: str = None) -> float: Blocks the exchange after a rate-limit response.
+        success(self, exchange: str, endpoint_class: str): Resets the backoff of the bucket.
+
+    Example:
+        rate_limiter = get_rate_limiter()
+        rate_limiter.acquire("Binance", "market")
+    """
+
+    def __init__(
+        self,
+        rate_limits: dict = None,
+        priority_reserve: float = PRIORITY_RESERVE,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        max_retries: int = 3,
+    ):
+        """
+        Initializes a new instance of the RateLimiter class.
+
+        Args:
+            rate_limits (dict, optional): (tokens per second, burst) per exchange and endpoint class. Defaults to RATE_LIMITS.
+            priority_reserve (float, optional): Share of the exchange budget kept for high-priority calls.
+            backoff_base (float, optional): First backoff delay in seconds.
+            backoff_max (float, optional): Maximum backoff delay in seconds.
+            max_retries (int, optional): Number of retries after a rate-limit response.
+        """
+        self.rate_limits = RATE_LIMITS if rate_limits is None else rate_limits
+        self.priority_reserve = priority_reserve
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.priority_waiters = {}
+
+    def _get_bucket(self, exchange: str, endpoint_class: str) -> TokenBucket:
+        key = (exchange, endpoint_class)
+        if key not in self.buckets:
+            rate, capacity = self.rate_limits.get(exchange, {}).get(
+                endpoint_class, DEFAULT_RATE_LIMIT
+            )
+            reserve = capacity * self.priority_reserve if endpoint_class == "exchange" else 0
+            self.buckets[key] = TokenBucket(rate=rate, capacity=capacity, reserve=reserve)
+        return self.buckets[key]
+
+    def _try_acquire(self, exchange: str, endpoint_class: str, waiting: bool) -> float:
+        """
+        Takes a token from the class and exchange buckets if both have one.
+
+        Returns:
+            float: 0 if the token was taken, otherwise the seconds to wait before trying again.
+        """
+        priority = ENDPOINT_CLASSES.get(endpoint_class, 0)
+        with self.lock:
+            now = time.monotonic()
+            class_bucket = self._get_bucket(exchange, endpoint_class)
+            exchange_bucket = self._get_bucket(exchange, "exchange")
+            class_bucket.refill(now)
+            exchange_bucket.refill(now)
+
+            reserve = 0 if priority > 0 else exchange_bucket.reserve
+            delay = max(
+                class_bucket.wait_time(now),
+                exchange_bucket.wait_time(now, reserve=reserve),
+            )
+            if priority == 0 and self.priority_waiters.get(exchange, 0) > 0:
+                delay = max(delay, 1 / exchange_bucket.rate)
+
+            if delay > 0:
+                if priority > 0 and not waiting:
+                    self.priority_waiters[exchange] = (
+                        self.priority_waiters.get(exchange, 0) + 1
+                    )
+                return delay
+
+            class_bucket.tokens -= 1
+            exchange_bucket.tokens -= 1
+            if priority > 0 and waiting:
+                self.priority_waiters[exchange] -= 1
+            return 0.0
+
+    def _leave_wait(self, exchange: str, endpoint_class: str):
+        """
+        Forgets a waiting high-priority call that gave up (e.g. a cancelled task).
+        """
+        if ENDPOINT_CLASSES.get(endpoint_class, 0) > 0:
+            with self.lock:
+                self.priority_waiters[exchange] -= 1
+
+    def acquire(self, exchange: str, endpoint_class: str = "market"):
+        """
+        Waits until a request to the exchange endpoint class is allowed (blocking).
+        """
+        waiting = False
+        try:
+            while True:
+                delay = self._try_acquire(exchange, endpoint_class, waiting)
+                if delay == 0:
+                    waiting = False
+                    return
+                waiting = True
+                time.sleep(delay)
+        finally:
+            if waiting:
+                self._leave_wait(exchange, endpoint_class)
+
+    async def acquire_async(self, exchange: str, endpoint_class: str = "market"):
+        """
+        Waits until a request to the exchange endpoint class is allowed (asyncio).
+        """
+        waiting = False
+        try:
+            while True:
+                delay = self._try_acquire(exchange, endpoint_class, waiting)
+                if delay == 0:
+                    waiting = False
+                    return
+                waiting = True
+                await asyncio.sleep(delay)
+        finally:
+            if waiting:
+                self._leave_wait(exchange, endpoint_class)
+
+    def _parse_retry_after(self, retry_after) -> float | None:
+        if retry_after is None:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                retry_date = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                return None
+            return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def backoff(self, exchange: str, endpoint_class: str, retry_after=None) -> float:
+        """
+        Blocks the class bucket and the shared exchange bucket after a rate-limit response.
+
+        Args:
+            exchange (str): The name of the exchange.
+            endpoint_class (str): "market" or "account".
+            retry_after (str, optional): Value of the Retry-After header.
+
+        Returns:
+            float: Seconds the exchange is blocked.
+        """
+        delay = self._parse_retry_after(retry_after)
+        with self.lock:
+            bucket = self._get_bucket(exchange, endpoint_class)
+            bucket.failures += 1
+            if delay is None:
+                ### Exponential backoff with jitter (half fixed, half random)
+                delay = min(
+                    self.backoff_max, self.backoff_base * 2 ** (bucket.failures - 1)
+                )
+                delay = delay / 2 + random.uniform(0, delay / 2)
+            blocked_until = time.monotonic() + delay
+            for blocked_bucket in (bucket, self._get_bucket(exchange, "exchange")):
+                blocked_bucket.blocked_until = max(
+                    blocked_bucket.blocked_until, blocked_until
+                )
+        return delay
+
+    def success(self, exchange: str, endpoint_class: str):
+        """
+        Resets the backoff of the bucket after a successful response.
+        """
+        with self.lock:
+            self._get_bucket(exchange, endpoint_class).failures = 0
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Returns the RateLimiter shared by all exchange clients of the process.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def set_rate_limiter(rate_limiter: RateLimiter) -> None:
+    """
+    Replaces the RateLimiter shared by all exchange clients (e.g. to change the limits).
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = rate_limiter
@@ -0,0 +1,516 @@
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+import threading
+import requests
+import asyncio
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.RateLimitClass import (
+    RateLimiter,
+    get_rate_limiter,
+    retry_status,
+    RETRY_STATUS,
+)
+
+try:
+    import aiohttp
+except ImportError:  # Optional, only needed by the asyncio clients
+    aiohttp = None
+
+### DEFAULT_POOL_SIZE (int): Number of keep-alive connections kept per host.
+DEFAULT_POOL_SIZE: int = 10
+### POOL_SIZE_HOST (dict): Number of keep-alive connections for specific hosts.
+POOL_SIZE_HOST: dict = {
+    "api.wallex.ir": 20,
+}
+### DEFAULT_TIMEOUT (tuple): (connect, read) timeout in seconds.
+DEFAULT_TIMEOUT: tuple = (3.05, 10)
+### DEFAULT_HEADERS (dict): Headers sent with every request.
+DEFAULT_HEADERS: dict = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class ConnectionCounter:
+    """
+    Thread-safe counters of the connections opened and reused by a connection pool.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.checkouts = 0
+
+    def add_opened(self):
+        with self.lock:
+            self.opened += 1
+
+    def add_checkout(self):
+        with self.lock:
+            self.checkouts += 1
+
+    def get_counters(self) -> dict:
+        with self.lock:
+            return {
+                "opened": self.opened,
+                "reused": self.checkouts - self.opened,
+                "requests": self.checkouts,
+            }
+
+
+def _counting_pool_class(pool_class, counter: ConnectionCounter):
+    """
+    Builds a urllib3 connection pool class that reports to the given counter.
+    """
+
+    class CountingPool(pool_class):
+        def _new_conn(self):
+            counter.add_opened()
+            return super()._new_conn()
+
+        def _get_conn(self, timeout=None):
+            counter.add_checkout()
+            return super()._get_conn(timeout=timeout)
+
+    return CountingPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with keep-alive pools that count opened and reused connections.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, **kwargs):
+        self.counter = ConnectionCounter()
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.counter),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.counter),
+        }
+
+
+class SessionPool:
+    """
+    A shared pool of keep-alive HTTP connections for all exchange clients.
+
+    One requests.Session is shared by all clients, every host gets its own adapter,
+    so pool sizes and the opened/reused counters are kept per host.
+
+    Methods:
+        get_session(self): Returns the shared requests.Session.
+        request(self, method: str, url: str, **kwargs): Sends an HTTP request through the pool.
+        get(self, url: str, **kwargs): Sends an HTTP GET request through the pool.
+        get_counters(self): Returns the opened/reused connection counters per host and in total.
+        close(self): Closes all pooled connections.
+
+    Example:
+        session_pool = SessionPool(pool_sizes={"api.binance.com": 4}, timeout=(2, 5))
+        response = session_pool.get("https://api.wallex.ir/v1/markets")
+        print(session_pool.get_counters())
+    """
+
+    def __init__(
+        self,
+        pool_sizes: dict = None,
+        default_pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: tuple = DEFAULT_TIMEOUT,
+        max_retries: int = 0,
+        rate_limiter: RateLimiter = None,
+    ):
+        """
+        Initializes a new instance of the SessionPool class.
+
+        Args:
+            pool_sizes (dict, optional): Number of keep-alive connections per host. Defaults to POOL_SIZE_HOST.
+            default_pool_size (int, optional): Number of keep-alive connections for other hosts.
+            timeout (tuple, optional): Default (connect, read) timeout in seconds.
+            max_retries (int, optional): Number of retries on connection errors.
+            rate_limiter (RateLimiter, optional): Rate-limit scheduler. Defaults to the shared one.
+        """
+        self.pool_sizes = dict(POOL_SIZE_HOST if pool_sizes is None else pool_sizes)
+        self.default_pool_size = default_pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        self.lock = threading.Lock()
+        self.adapters = {}
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+    def _mount_host(self, url: str) -> str:
+        """
+        Mounts a keep-alive adapter for the host of the URL (once per host).
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            str: The host of the URL.
+        """
+        parts = urlsplit(url)
+        host = parts.netloc
+        if host not in self.adapters:
+            with self.lock:
+                if host not in self.adapters:
+                    adapter = CountingHTTPAdapter(
+                        pool_size=self.pool_sizes.get(host, self.default_pool_size),
+                        max_retries=self.max_retries,
+                    )
+                    self.session.mount(f"{parts.scheme}://{host}", adapter)
+                    self.adapters[host] = adapter
+        return host
+
+    def get_session(self) -> requests.Session:
+        """
+        Returns the shared requests.Session.
+        """
+        return self.session
+
+    def request(
+        self, method: str, url: str, rate_key: tuple = None, **kwargs
+    ) -> requests.Response:
+        """
+        Sends an HTTP request through the pool.
+
+        Args:
+            method (str): The HTTP method (GET or POST or DELETE).
+            url (str): The request URL.
+            rate_key (tuple, optional): (exchange, endpoint class) of the rate limiter, no rate limit if None.
+            **kwargs: Arguments of requests.Session.request (timeout defaults to the pool timeout).
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        self._mount_host(url)
+        kwargs.setdefault("timeout", self.timeout)
+        if rate_key is None:
+            return self.session.request(method, url, **kwargs)
+
+        response = None
+        retry_codes = retry_status(method)
+        for _ in range(self.rate_limiter.max_retries + 1):
+            if response is not None:
+                ### Returns the connection of the throttled response to the pool
+                response.close()
+            self.rate_limiter.acquire(*rate_key)
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS:
+                self.rate_limiter.success(*rate_key)
+                return response
+            ### The next acquire waits until the backoff of the bucket is over
+            self.rate_limiter.backoff(
+                *rate_key, retry_after=response.headers.get("Retry-After")
+            )
+            if response.status_code not in retry_codes:
+                ### The exchange may have processed it (e.g. an order behind a 503)
+                return response
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an HTTP GET request through the pool.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def get_counters(self) -> dict:
+        """
+        Returns the opened/reused connection counters per host and in total.
+
+        Returns:
+            dict: {"total": {...}, "hosts": {host: {"opened", "reused", "requests"}}}
+        """
+        hosts = {
+            host: adapter.counter.get_counters()
+            for host, adapter in list(self.adapters.items())
+        }
+        total = {"opened": 0, "reused": 0, "requests": 0}
+        for counters in hosts.values():
+            for key in total:
+                total[key] += counters[key]
+        return {"total": total, "hosts": hosts}
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
+
+
+class AsyncSessionPool:
+    """
+    The asyncio counterpart of SessionPool (requires the optional package `aiohttp`).
+
+    Every host gets its own aiohttp.ClientSession with a connector limited to the host pool size,
+    connections are kept alive and counted as opened/reused like in SessionPool. The sessions
+    belong to one event loop: when the pool is used in another loop, those of the previous loop
+    are closed (in that loop) before new ones are created.
+
+    Methods:
+        request_json(self, method: str, url: str, params: dict = None, headers: dict = None, json: dict = None): Sends an HTTP request and returns the decoded JSON.
+        get_json(self, url: str, params: dict = None, headers: dict = None): Sends an HTTP GET request and returns the decoded JSON.
+        get_counters(self): Returns the opened/reused connection counters per host and in total.
+        close(self): Closes all pooled connections.
+
+    Example:
+        async with AsyncSessionPool() as session_pool:
+            markets = await session_pool.get_json("https://api.wallex.ir/v1/markets")
+            print(session_pool.get_counters())
+    """
+
+    def __init__(
+        self,
+        pool_sizes: dict = None,
+        default_pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: tuple = DEFAULT_TIMEOUT,
+        rate_limiter: RateLimiter = None,
+    ):
+        """
+        Initializes a new instance of the AsyncSessionPool class.
+
+        Args:
+            pool_sizes (dict, optional): Number of keep-alive connections per host. Defaults to POOL_SIZE_HOST.
+            default_pool_size (int, optional): Number of keep-alive connections for other hosts.
+            timeout (tuple, optional): Default (connect, read) timeout in seconds.
+            rate_limiter (RateLimiter, optional): Rate-limit scheduler. Defaults to the shared one.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSessionPool requires the 'aiohttp' package.")
+
+        self.pool_sizes = dict(POOL_SIZE_HOST if pool_sizes is None else pool_sizes)
+        self.default_pool_size = default_pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        self.loop = None
+        self.sessions = {}
+        self.counters = {}
+
+    def _get_session(self, url: str):
+        """
+        Returns the aiohttp.ClientSession of the host of the URL (created once per host and event loop).
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            self._close_loop_sessions()
+            self.loop = loop
+
+        host = urlsplit(url).netloc
+        if host not in self.sessions:
+            counter = self.counters.setdefault(host, ConnectionCounter())
+
+            async def on_connection_create_end(session, context, params):
+                counter.add_opened()
+                counter.add_checkout()
+
+            async def on_connection_reuseconn(session, context, params):
+                counter.add_checkout()
+
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+            connect_timeout, read_timeout = self.timeout
+            self.sessions[host] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_sizes.get(host, self.default_pool_size)
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=connect_timeout, sock_read=read_timeout
+                ),
+                headers=DEFAULT_HEADERS,
+                trace_configs=[trace_config],
+            )
+        return self.sessions[host]
+
+    def _close_loop_sessions(self):
+        """
+        Closes the sessions of the previous event loop, they can not be used in another one.
+        """
+        sessions, self.sessions = self.sessions, {}
+        loop = self.loop
+        if not sessions or loop is None:
+            return
+
+        async def close_sessions():
+            for session in sessions.values():
+                await session.close()
+
+        if loop.is_running():
+            ### Loop of another thread
+            asyncio.run_coroutine_threadsafe(close_sessions(), loop)
+        elif not loop.is_closed():
+            ### The running loop of this thread can not run the old one, a thread can
+            thread = threading.Thread(
+                target=loop.run_until_complete, args=(close_sessions(),)
+            )
+            thread.start()
+            thread.join()
+        else:
+            ### A closed loop can not close its connections, they are freed with the
+            ### connectors; detached, the sessions do not report them as leaked
+            for session in sessions.values():
+                session.detach()
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        json: dict = None,
+        rate_key: tuple = None,
+        loads=None,
+    ):
+        """
+        Sends an HTTP request through the pool and returns the decoded JSON.
+
+        Args:
+            method (str): The HTTP method (GET or POST or DELETE).
+            url (str): The request URL.
+            params (dict, optional): Query parameters (None values are dropped like in requests).
+            headers (dict, optional): Request headers.
+            json (dict, optional): JSON payload.
+            rate_key (tuple, optional): (exchange, endpoint class) of the rate limiter, no rate limit if None.
+            loads (callable, optional): Decoder of the response body (bytes), replaces the JSON decoding.
+
+        Returns:
+            dict | list: The JSON response (or the result of `loads`).
+        """
+        if params is not None:
+            params = {key: value for key, value in params.items() if value is not None}
+        session = self._get_session(url)
+
+        max_retries = 0 if rate_key is None else self.rate_limiter.max_retries
+        retry_codes = retry_status(method)
+        for attempt in range(max_retries + 1):
+            if rate_key is not None:
+                await self.rate_limiter.acquire_async(*rate_key)
+            async with session.request(
+                method, url, params=params, headers=headers, json=json
+            ) as response:
+                if rate_key is None or response.status not in RETRY_STATUS:
+                    if rate_key is not None:
+                        self.rate_limiter.success(*rate_key)
+                    return await self._read_body(response, loads=loads)
+                retry_after = response.headers.get("Retry-After")
+                if attempt == max_retries or response.status not in retry_codes:
+                    ### Not sent again if the exchange may have processed it (order behind a 503)
+                    self.rate_limiter.backoff(*rate_key, retry_after=retry_after)
+                    return await self._read_body(response, loads=loads)
+            ### The next acquire waits until the backoff of the bucket is over
+            self.rate_limiter.backoff(*rate_key, retry_after=retry_after)
+
+    async def _read_body(self, response, loads=None):
+        if loads is None:
+            return await response.json(content_type=None)
+        return loads(await response.read())
+
+    async def get_json(
+        self,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        rate_key=None,
+        loads=None,
+    ):
+        """
+        Sends an HTTP GET request through the pool and returns the decoded JSON.
+        """
+        return await self.request_json(
+            "GET", url, params=params, headers=headers, rate_key=rate_key, loads=loads
+        )
+
+    def get_counters(self) -> dict:
+        """
+        Returns the opened/reused connection counters per host and in total.
+        """
+        hosts = {host: counter.get_counters() for host, counter in self.counters.items()}
+        total = {"opened": 0, "reused": 0, "requests": 0}
+        for counters in hosts.values():
+            for key in total:
+                total[key] += counters[key]
+        return {"total": total, "hosts": hosts}
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        if self.loop is not asyncio.get_running_loop():
+            self._close_loop_sessions()
+            return
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """
+    Returns the SessionPool shared by all exchange clients of the process.
+    """
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SessionPool()
+    return _session_pool
+
+
+def set_session_pool(session_pool: SessionPool) -> None:
+    """
+    Replaces the SessionPool shared by all exchange clients (e.g. to change pool sizes or timeouts).
+    """
+    global _session_pool
+    with _session_pool_lock:
+        _session_pool = session_pool
+
+
+_async_session_pool = None
+
+
+def get_async_session_pool() -> AsyncSessionPool:
+    """
+    Returns the AsyncSessionPool shared by the asyncio exchange clients of the process.
+    """
+    global _async_session_pool
+    if _async_session_pool is None:
+        _async_session_pool = AsyncSessionPool()
+    return _async_session_pool
+
+
+def set_async_session_pool(session_pool: AsyncSessionPool) -> None:
+    """
+    Replaces the AsyncSessionPool shared by the asyncio exchange clients.
+    """
+    global _async_session_pool
+    _async_session_pool = session_pool
+
+
+if __name__ == "__main__":
+    # Example usage:
+    session_pool = get_session_pool()
+    for _ in range(3):
+        response = session_pool.get("https://api.wallex.ir/v1/markets")
+        print("Status:", response.status_code)
+    print("Counters:", session_pool.get_counters())
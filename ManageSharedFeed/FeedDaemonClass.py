@@ -0,0 +1,406 @@
+import pandas as pd
+import argparse
+import signal
+import time
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.ManagerFeeds import FeedManager
+from TF_Generator.ManagerLogger import LoggerManager
+from TF_Generator.OrganizerTimeFrame import TimeFrameOrg
+from TF_Generator.ManagerFile import DEFAULT_FILE_FORMAT
+from ManageTimeIdx.CandleSchedulerClass import CandleScheduler, DEFAULT_SETTLE_DELAY
+from ManageSharedFeed.SharedCandleClass import (
+    SharedCandleBuffer,
+    segment_name,
+    SEGMENT_PREFIX,
+)
+
+APP_DIRECTORY = app_directory
+### ATTACH_TIMEOUT (float): Seconds a client waits for the segment of its feed (daemon starting).
+ATTACH_TIMEOUT = 60.0
+### FRESH_TIMEOUT (float): Seconds a client waits for the refresh of the last candle close.
+FRESH_TIMEOUT = 30.0
+### POLL_INTERVAL (float): Seconds between two checks of the header by a waiting client.
+POLL_INTERVAL = 0.01
+
+
+class FeedDaemon:
+    """
+    One ingest process for all feeds: refreshes them with a FeedManager at every candle close
+    and publishes their base candles in shared memory (SharedCandleBuffer, one segment per feed).
+
+    The strategy processes read the candles with FeedClient, so the API requests, the journal
+    and the files of a symbol are handled once, whatever the number of strategies, and the
+    candles are in memory once.
+
+    Methods:
+        - __init__(num_candles: int, data_directory: str, file_format: str, settle_delay: float, prefix: str): Initializes the daemon.
+        - add_feed(symbol: str, exchange: str, timeframe: str, num_candles: int = None) -> SharedCandleBuffer: Adds a feed and publishes its stored candles.
+        - refresh(keys: list = None) -> dict: Refreshes the feeds and publishes them, returns {key: version}.
+        - run(cycles: int = None): Refreshes and publishes the feeds at every candle close.
+        - stop(): Stops run() after the current refresh.
+        - close(): Saves the files of the feeds and removes the segments.
+
+    Example:
+        with FeedDaemon(num_candles=400) as feed_daemon:
+            feed_daemon.add_feed(symbol="SHIBTMN", exchange="Wallex", timeframe="1min")
+            feed_daemon.run()
+    """
+
+    def __init__(
+        self,
+        num_candles: int,
+        data_directory: str = APP_DIRECTORY,
+        file_format: str = DEFAULT_FILE_FORMAT,
+        settle_delay: float = DEFAULT_SETTLE_DELAY,
+        prefix: str = SEGMENT_PREFIX,
+    ):
+        """
+        Initialize FeedDaemon class.
+
+        Parameters:
+            num_candles (int): Default number of candles of a feed.
+            data_directory (str): Directory path to store the OHLCV DataFrame files.
+            file_format (str): Storage format of the OHLCV DataFrame files.
+            settle_delay (float): Seconds waited after a candle close before the refresh.
+            prefix (str): Prefix of the segment names (one daemon per prefix).
+        """
+        self.prefix = prefix
+        self.feed_manager = FeedManager(
+            num_candles=num_candles,
+            data_directory=data_directory,
+            file_format=file_format,
+        )
+        self.logger = self.feed_manager.logger
+        ### The base candles of the feeds close at most every minute
+        self.candle_scheduler = CandleScheduler(timeframe="1min", settle_delay=settle_delay)
+        self.buffers = {}
+        self.running = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # -------------------------------
+    def add_feed(
+        self, symbol: str, exchange: str, timeframe: str, num_candles: int = None
+    ) -> SharedCandleBuffer:
+        """
+        Adds a feed, creates its segment and publishes its stored candles (not refreshed yet).
+
+        Returns:
+            SharedCandleBuffer: The segment of the feed.
+        """
+        key = (exchange, symbol, timeframe)
+        if key not in self.buffers:
+            feed = self.feed_manager.add_feed(
+                symbol=symbol, exchange=exchange, timeframe=timeframe, num_candles=num_candles
+            )
+            buffer = SharedCandleBuffer(
+                name=segment_name(exchange, symbol, timeframe, prefix=self.prefix),
+                capacity=feed.reg_input_values_instance._actual_candles(),
+                create=True,
+                base_seconds=feed.time_manager_instance.seconds_time_unit,
+            )
+            if feed.ohlcv_df is not None and len(feed.ohlcv_df):
+                buffer.publish_dataframe(feed.ohlcv_df)
+            self.buffers[key] = buffer
+            self.logger.logger.info(f"Feed {key} published in segment {buffer.name}")
+        return self.buffers[key]
+
+    def refresh(self, keys: list = None) -> dict:
+        """
+        Refreshes the feeds with the FeedManager and publishes their new windows.
+
+        Parameters:
+            keys (list): (exchange, symbol, timeframe) of the feeds to refresh (all feeds if None).
+
+        Returns:
+            dict: {(exchange, symbol, timeframe): version of the publish}
+        """
+        keys = list(self.buffers) if keys is None else list(keys)
+        if not keys:
+            return {}
+        time_now = int(time.time())
+        self.feed_manager.refresh(keys=keys)
+
+        versions = {}
+        for key in keys:
+            buffer = self.buffers[key]
+            feed = self.feed_manager.feeds[key]
+            versions[key] = buffer.publish_dataframe(
+                feed.ohlcv_df,
+                boundary=time_now - time_now % buffer.base_seconds,
+                rewrites=feed.history_rewrites,
+            )
+        return versions
+
+    def _due_keys(self, event: dict) -> list:
+        """
+        Feeds with a base candle closed since the previous event (every minute for "1min").
+        """
+        boundaries = [*event["missed"], event["boundary"]]
+        return [
+            key
+            for key, buffer in self.buffers.items()
+            if any(boundary % buffer.base_seconds == 0 for boundary in boundaries)
+        ]
+
+    def run(self, cycles: int = None):
+        """
+        Publishes the refreshed feeds at once, then at every candle close until stop().
+
+        Parameters:
+            cycles (int): Number of candle closes (forever if None).
+        """
+        self.running = True
+        self.refresh()
+        cycle = 0
+        while self.running and (cycles is None or cycle < cycles):
+            event = self.candle_scheduler.wait_next()
+            if not self.running:
+                break
+            versions = self.refresh(keys=self._due_keys(event))
+            self.candle_scheduler.mark("published")
+            self.logger.logger.info(
+                f"Published {len(versions)} feeds for the candle close {event['boundary']}"
+            )
+            cycle += 1
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        """
+        Saves the files of the feeds and removes the segments (the clients keep their mapping
+        until they close it).
+        """
+        self.feed_manager.close()
+        for buffer in self.buffers.values():
+            buffer.unlink()
+            buffer.close()
+        self.buffers = {}
+
+
+class FeedClient:
+    """
+    Read side of a FeedDaemon feed, with the release API of GenerateOHLCV.
+
+    dataframe_release() waits until the daemon published the last candle close of the feed
+    (like GenerateOHLCV fetching up to now) and returns the base candles as a zero-copy DataFrame
+    on the shared memory. timeframe_release() converts them incrementally to the timeframe of
+    the feed with its own TimeFrameOrg. The released DataFrames are read-only views valid until
+    the second publish after them (at least one candle); copy them to keep them longer. When the
+    daemon filled a hole in the history, the kept bars of the conversion are reset.
+
+    Methods:
+        - __init__(symbol: str, timeframe: str, exchange: str, attach_timeout: float, fresh_timeout: float, prefix: str): Maps the segment of a feed.
+        - version (property) -> int: Version of the last publish of the feed.
+        - wait_fresh(timeout: float = None) -> bool: Waits for the publish of the last candle close.
+        - dataframe_release() -> pd.DataFrame: Base candles of the feed (zero-copy).
+        - timeframe_release(ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None) -> pd.DataFrame: Candles of the feed in a timeframe.
+        - timeframes_release(new_timeframes: list, ohlcv_dataframe: pd.DataFrame = None) -> dict: Candles of the feed in several timeframes.
+        - close(): Unmaps the segment.
+
+    Example:
+        with FeedClient(symbol="SHIBTMN", timeframe="1min", exchange="Wallex") as ohlcv_object:
+            data = ohlcv_object.timeframe_release()
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        exchange: str,
+        attach_timeout: float = ATTACH_TIMEOUT,
+        fresh_timeout: float = FRESH_TIMEOUT,
+        prefix: str = SEGMENT_PREFIX,
+        logger=None,
+    ):
+        """
+        Initialize FeedClient class.
+
+        Parameters:
+            symbol (str): Market symbol.
+            timeframe (str): Timeframe of the released DataFrame.
+            exchange (str): Exchange name.
+            attach_timeout (float): Seconds waited for the segment of the feed.
+            fresh_timeout (float): Seconds waited for the publish of the last candle close.
+            prefix (str): Prefix of the segment names of the daemon.
+            logger: LoggerManager instance.
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.exchange = exchange
+        self.fresh_timeout = fresh_timeout
+        self.logger = logger or LoggerManager(log_file_name="FeedClient.log")
+        self.logger.logger.warning(f"--- Start : Class {self.__class__.__name__} ---")
+
+        self.ohlcv_df = None
+        self.ohlcv_tf = None
+        self.history_rewrites = None
+        self.buffer = self._attach(
+            name=segment_name(exchange, symbol, timeframe, prefix=prefix),
+            timeout=attach_timeout,
+        )
+        self.tf_organizer_instance = TimeFrameOrg(exchange=exchange, logger=self.logger)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _attach(self, name: str, timeout: float) -> SharedCandleBuffer:
+        """
+        Maps the segment of the feed, waits until it exists and has a first publish.
+        """
+        deadline = time.monotonic() + timeout
+        buffer = None
+        while True:
+            if buffer is None:
+                try:
+                    buffer = SharedCandleBuffer(name=name)
+                except FileNotFoundError:
+                    pass
+            if buffer is not None and buffer.version > 0:
+                return buffer
+            if time.monotonic() > deadline:
+                if buffer is not None:
+                    buffer.close()
+                raise TimeoutError(f"No candles published in segment '{name}'")
+            time.sleep(POLL_INTERVAL * 10)
+
+    @property
+    def version(self) -> int:
+        return self.buffer.version
+
+    def wait_fresh(self, timeout: float = None) -> bool:
+        """
+        Waits until the daemon published the last base candle close.
+
+        Parameters:
+            timeout (float): Seconds to wait (default: fresh_timeout).
+
+        Returns:
+            bool: False if the timeout expired (the last publish is returned anyway).
+        """
+        timeout = self.fresh_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        base_seconds = self.buffer.base_seconds
+        while True:
+            time_now = int(time.time())
+            if self.buffer.boundary >= time_now - time_now % base_seconds:
+                return True
+            if time.monotonic() > deadline:
+                self.logger.logger.warning(
+                    f"Feed {self.exchange}-{self.symbol} not refreshed for {time_now}, "
+                    f"last refresh {self.buffer.boundary}"
+                )
+                return False
+            time.sleep(POLL_INTERVAL)
+
+    def dataframe_release(self) -> pd.DataFrame:
+        """
+        Releases the base candles of the feed, up to the last candle close.
+
+        Returns:
+            pd.DataFrame: Read-only OHLCV DataFrame on the shared memory.
+        """
+        self.logger.logger.info("dataframe_release (function)")
+        self.wait_fresh()
+        self.ohlcv_df = self.buffer.to_dataframe()
+        rewrites = self.buffer.rewrites(self.buffer.dataframe_version)
+        if rewrites != self.history_rewrites:
+            ### Older candles changed in the daemon: convert the whole window again
+            self.tf_organizer_instance.reset_resample_state()
+            self.history_rewrites = rewrites
+        return self.ohlcv_df
+
+    def timeframe_release(
+        self, ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None
+    ) -> pd.DataFrame:
+        """
+        Releases OHLCV DataFrame with a specified timeframe.
+
+        Parameters:
+            ohlcv_dataframe (pd.DataFrame): OHLCV DataFrame (default: dataframe_release()).
+            new_timeframe (str): New timeframe for the released DataFrame (default: timeframe).
+
+        Returns:
+            pd.DataFrame: Released OHLCV DataFrame with the specified timeframe.
+        """
+        self.logger.logger.info("timeframe_release (function)")
+
+        if ohlcv_dataframe is None:
+            ohlcv_dataframe = self.dataframe_release()
+        if new_timeframe is None:
+            new_timeframe = self.timeframe
+
+        self.ohlcv_tf = self.tf_organizer_instance.convert_timeframe_incremental(
+            ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+        )
+        return self.ohlcv_tf
+
+    def timeframes_release(
+        self, new_timeframes: list, ohlcv_dataframe: pd.DataFrame = None
+    ) -> dict:
+        """
+        Releases OHLCV DataFrames with several timeframes from the same base OHLCV DataFrame.
+
+        Returns:
+            dict: {timeframe: released OHLCV DataFrame}
+        """
+        if ohlcv_dataframe is None:
+            ohlcv_dataframe = self.dataframe_release()
+        return self.tf_organizer_instance.convert_timeframes(
+            ohlcv_dataframe=ohlcv_dataframe, new_timeframes=new_timeframes
+        )
+
+    def close(self):
+        self.ohlcv_df = None
+        self.ohlcv_tf = None
+        self.buffer.close()
+
+
+if __name__ == "__main__":
+    # Run the daemon: python ManageSharedFeed/FeedDaemonClass.py --feeds Wallex:SHIBTMN:1min
+    parser = argparse.ArgumentParser(description="Shared-memory candle feed daemon")
+    parser.add_argument(
+        "--feeds",
+        nargs="+",
+        required=True,
+        metavar="EXCHANGE:SYMBOL:TIMEFRAME",
+        help="Feeds to ingest and publish",
+    )
+    parser.add_argument("--num-candles", type=int, default=400)
+    parser.add_argument("--settle-delay", type=float, default=DEFAULT_SETTLE_DELAY)
+    parser.add_argument("--prefix", default=SEGMENT_PREFIX)
+    args = parser.parse_args()
+
+    with FeedDaemon(
+        num_candles=args.num_candles,
+        settle_delay=args.settle_delay,
+        prefix=args.prefix,
+    ) as feed_daemon:
+        ### SIGTERM stops the daemon like Ctrl+C: the files are saved, the segments removed
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        for feed in args.feeds:
+            exchange, symbol, timeframe = feed.split(":")
+            buffer = feed_daemon.add_feed(
+                symbol=symbol, exchange=exchange, timeframe=timeframe
+            )
+            print("segment:", buffer.name, "capacity:", buffer.capacity)
+        try:
+            feed_daemon.run()
+        except KeyboardInterrupt:
+            pass
+        print(feed_daemon.candle_scheduler.get_stats())
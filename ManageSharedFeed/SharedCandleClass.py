@@ -0,0 +1,293 @@
+from multiprocessing import shared_memory, resource_tracker
+import pandas as pd
+import numpy as np
+import threading
+import time
+import sys
+import re
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.ManagerCandleStore import CANDLE_COLUMNS
+from TF_Generator.TimeIndex import epoch_index, epoch_seconds
+
+### SEGMENT_PREFIX (str): Prefix of the names of the shared candle segments.
+SEGMENT_PREFIX = "candles"
+### SEGMENT_MAGIC (int): First header field of a segment (layout version of the segment).
+SEGMENT_MAGIC = 0x43414E444C450001
+### HEADER_FIELDS (int): int64 fields of the header (two cache lines).
+HEADER_FIELDS = 16
+### NUM_SLOTS (int): Slots of a segment, publish n is written in slot n % NUM_SLOTS.
+NUM_SLOTS = 2
+_MAGIC, _CAPACITY, _SEQUENCE, _LENGTH, _PUBLISH_NS, _BASE_SECONDS, _BOUNDARY = (
+    0, 1, 2, 3, 5, 6, 7
+)
+### Rewrites of older candles (gap fills), one field per slot like the length
+_REWRITES = 8
+_tracker_lock = threading.Lock()
+
+
+def segment_name(
+    exchange: str, symbol: str, timeframe: str, prefix: str = SEGMENT_PREFIX
+) -> str:
+    """
+    Name of the shared candle segment of a feed (the same in the daemon and in the clients).
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{prefix}-{exchange}-{symbol}-{timeframe}")
+
+
+def _attach_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Maps an existing segment without registering it in the resource tracker, which would unlink
+    the segment of the daemon at the exit of a client (and forget it after a fork).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        ### Python < 3.13 (no track argument): skip the registration of the attach
+        with _tracker_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+
+class SharedCandleBuffer:
+    """
+    Candle window of one feed in a `multiprocessing.shared_memory` segment, written by one
+    process (the feed daemon) and read zero-copy by any number of processes.
+
+    Layout: an int64 header (magic, capacity, sequence, length of every slot, publish time,
+    seconds of the base candle, candle close of the last refresh, history rewrites of every
+    slot), then two slots of `capacity` candles (int64 epoch-second timestamps, then one float64
+    row per CANDLE_COLUMNS column).
+
+    Publish n is written in slot n % 2 under a seqlock: the sequence is 2n - 1 (odd) while the
+    slot is written and 2n once it is complete. A reader takes the last complete publish
+    (sequence // 2) and maps its slot without copying. The slot is only written again by publish
+    n + 2, so the views stay valid until then (at least one candle of the daemon), and
+    `is_valid(version)` (sequence <= 2n + 2) tells a reader whether they still are.
+
+    Methods:
+        - __init__(name: str, capacity: int = None, create: bool = False, base_seconds: int = 60): Creates or maps a segment.
+        - publish(time_s: np.ndarray, values: np.ndarray, boundary: int = 0, rewrites: int = 0) -> int: Writes a new window (writer).
+        - publish_dataframe(ohlcv_dataframe: pd.DataFrame, boundary: int = 0, rewrites: int = 0) -> int: Writes the last candles of an OHLCV DataFrame (writer).
+        - version (property) -> int: Number of the last complete publish (0 before the first one).
+        - publish_time (property) -> float: Epoch seconds of the last publish.
+        - boundary (property) -> int: Candle close the last publish is up to date with (0: not refreshed yet).
+        - window() -> tuple: (version, time_s, values) views of the last publish.
+        - rewrites(version: int) -> int: History rewrites of the feed at a publish.
+        - is_valid(version: int) -> bool: True while the slot of a publish is not written again.
+        - to_dataframe() -> pd.DataFrame: Zero-copy DataFrame of the last publish (built once per publish).
+        - snapshot() -> pd.DataFrame: Copy of the last publish, consistent whatever the writer does.
+        - close(): Unmaps the segment.
+        - unlink(): Removes the segment (writer).
+
+    Example:
+        buffer = SharedCandleBuffer(segment_name("Wallex", "SHIBTMN", "1min"))
+        ohlcv_df = buffer.to_dataframe()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = None,
+        create: bool = False,
+        base_seconds: int = 60,
+    ):
+        """
+        Initialize SharedCandleBuffer class.
+
+        Parameters:
+            name (str): Name of the segment (see segment_name).
+            capacity (int): Maximum number of candles of the window (create only).
+            create (bool): Create the segment (writer), a stale one of the same name is replaced.
+            base_seconds (int): Seconds of the base candle (create only).
+        """
+        self.name = name
+        self.owner = create
+        if create:
+            size = self._header_bytes() + NUM_SLOTS * self._slot_bytes(int(capacity))
+            try:
+                self.memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                ### Left by a daemon that did not exit cleanly
+                stale = _attach_memory(name)
+                stale.close()
+                stale.unlink()
+                self.memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.header = np.ndarray(HEADER_FIELDS, dtype=np.int64, buffer=self.memory.buf)
+            self.header[:] = 0
+            self.header[_CAPACITY] = int(capacity)
+            self.header[_BASE_SECONDS] = int(base_seconds)
+            self.header[_MAGIC] = SEGMENT_MAGIC
+        else:
+            self.memory = _attach_memory(name)
+            self.header = np.ndarray(HEADER_FIELDS, dtype=np.int64, buffer=self.memory.buf)
+            if self.header[_MAGIC] != SEGMENT_MAGIC:
+                self.memory.close()
+                raise ValueError(f"Segment '{name}' is not a candle segment")
+
+        self.capacity = int(self.header[_CAPACITY])
+        self.base_seconds = int(self.header[_BASE_SECONDS])
+        self.slots = [self._map_slot(slot) for slot in range(NUM_SLOTS)]
+        self._dataframe = None
+        self.dataframe_version = -1
+
+    # ------- Functions: Layout -------
+    @staticmethod
+    def _header_bytes() -> int:
+        return HEADER_FIELDS * 8
+
+    @staticmethod
+    def _slot_bytes(capacity: int) -> int:
+        return capacity * 8 * (1 + len(CANDLE_COLUMNS))
+
+    def _map_slot(self, slot: int) -> tuple:
+        offset = self._header_bytes() + slot * self._slot_bytes(self.capacity)
+        time_s = np.ndarray(
+            self.capacity, dtype=np.int64, buffer=self.memory.buf, offset=offset
+        )
+        values = np.ndarray(
+            (len(CANDLE_COLUMNS), self.capacity),
+            dtype=np.float64,
+            buffer=self.memory.buf,
+            offset=offset + self.capacity * 8,
+        )
+        if not self.owner:
+            ### The candles of the daemon are read-only in the clients
+            time_s.flags.writeable = False
+            values.flags.writeable = False
+        return time_s, values
+
+    # ------- Functions: Writer -------
+    def publish(
+        self, time_s: np.ndarray, values: np.ndarray, boundary: int = 0, rewrites: int = 0
+    ) -> int:
+        """
+        Writes a new window in the free slot and makes it the last publish.
+
+        Parameters:
+            time_s (np.ndarray): int64 epoch-second timestamps, ascending.
+            values (np.ndarray): float64 (len(CANDLE_COLUMNS), n) candles.
+            boundary (int): Candle close the window is up to date with (0 for stored candles).
+            rewrites (int): Number of times older candles of the feed were changed (gap fills).
+
+        Returns:
+            int: Version of the publish.
+        """
+        length = min(len(time_s), self.capacity)
+        version = int(self.header[_SEQUENCE]) // 2 + 1
+        slot = version % NUM_SLOTS
+        slot_time_s, slot_values = self.slots[slot]
+
+        self.header[_SEQUENCE] = 2 * version - 1
+        slot_time_s[:length] = time_s[len(time_s) - length :]
+        slot_values[:, :length] = values[:, values.shape[1] - length :]
+        self.header[_LENGTH + slot] = length
+        self.header[_REWRITES + slot] = rewrites
+        self.header[_PUBLISH_NS] = time.time_ns()
+        self.header[_BOUNDARY] = boundary
+        self.header[_SEQUENCE] = 2 * version
+        return version
+
+    def publish_dataframe(
+        self, ohlcv_dataframe: pd.DataFrame, boundary: int = 0, rewrites: int = 0
+    ) -> int:
+        """
+        Writes the last `capacity` candles of an OHLCV DataFrame (CandleStore view or any
+        DataFrame with the CANDLE_COLUMNS and a time index).
+        """
+        ohlcv_dataframe = ohlcv_dataframe.iloc[-self.capacity :]
+        values = np.vstack(
+            [
+                np.asarray(ohlcv_dataframe[column], dtype=np.float64)
+                for column in CANDLE_COLUMNS
+            ]
+        )
+        return self.publish(
+            time_s=epoch_seconds(ohlcv_dataframe.index),
+            values=values,
+            boundary=boundary,
+            rewrites=rewrites,
+        )
+
+    def unlink(self):
+        if self.owner:
+            self.memory.unlink()
+
+    # ------- Functions: Reader -------
+    @property
+    def version(self) -> int:
+        return int(self.header[_SEQUENCE]) // 2
+
+    @property
+    def publish_time(self) -> float:
+        return int(self.header[_PUBLISH_NS]) / 1e9
+
+    @property
+    def boundary(self) -> int:
+        return int(self.header[_BOUNDARY])
+
+    def is_valid(self, version: int) -> bool:
+        return int(self.header[_SEQUENCE]) <= 2 * version + 2
+
+    def rewrites(self, version: int) -> int:
+        return int(self.header[_REWRITES + version % NUM_SLOTS])
+
+    def window(self) -> tuple:
+        """
+        Zero-copy views of the last complete publish.
+
+        Returns:
+            tuple: (version, time_s, values), empty views before the first publish.
+        """
+        while True:
+            version = self.version
+            slot_time_s, slot_values = self.slots[version % NUM_SLOTS]
+            length = int(self.header[_LENGTH + version % NUM_SLOTS]) if version else 0
+            if self.is_valid(version):
+                return version, slot_time_s[:length], slot_values[:, :length]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame of the last publish, built once per publish. The columns and the index share
+        the memory of the segment: the DataFrame is valid while is_valid(version) is True (until
+        the second publish after it), use snapshot() to keep the candles longer.
+        """
+        if self.dataframe_version != self.version or not self.is_valid(
+            self.dataframe_version
+        ):
+            version, time_s, values = self.window()
+            self._dataframe = pd.DataFrame(
+                values.T,
+                index=epoch_index(time_s),
+                columns=list(CANDLE_COLUMNS),
+                copy=False,
+            )
+            self.dataframe_version = version
+        return self._dataframe
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        Copy of the last publish, checked against the sequence after the copy.
+        """
+        while True:
+            version, time_s, values = self.window()
+            time_s, values = time_s.copy(), values.copy()
+            if self.is_valid(version):
+                return pd.DataFrame(
+                    values.T, index=epoch_index(time_s), columns=list(CANDLE_COLUMNS)
+                )
+
+    def close(self):
+        self._dataframe = None
+        self.slots = []
+        self.header = None
+        self.memory.close()
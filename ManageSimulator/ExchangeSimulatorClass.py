@@ -0,0 +1,796 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl, unquote
+from datetime import datetime, timezone
+import numpy as np
+import threading
+import random
+import json
+import time
+import zlib
+import sys
+import re
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.HistoryFetch import HistoryOHLCV
+from ManageSession.RateLimitClass import TokenBucket, RATE_LIMITS
+
+### MINUTE (int): Seconds of the base candle of the price generator.
+MINUTE = 60
+### QUOTE_ASSETS (tuple): Quote assets recognized at the end of a symbol ("BTCUSDT", "BTC-USDT").
+QUOTE_ASSETS = ("USDT", "TMN", "USDC", "USD", "BTC")
+### DEFAULT_SYMBOLS (tuple): Markets listed by the market endpoints (markets, depth/all).
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT", "USDTTMN", "SHIBTMN", "DOGETMN")
+### DEPTH_LEVELS (int): Number of price levels per side of the order book.
+DEPTH_LEVELS = 20
+### NUM_TRADES (int): Number of trades returned by the latest trades endpoints.
+NUM_TRADES = 50
+### EXCHANGE_RATE_LIMITS (dict): (requests per second, burst) per exchange, the IP budget of RATE_LIMITS.
+EXCHANGE_RATE_LIMITS = {
+    exchange: limits["exchange"] for exchange, limits in RATE_LIMITS.items()
+}
+
+### ROUTES (list): (method, path pattern, exchange, handler) of every simulated endpoint.
+ROUTES = [
+    ("GET", r"/v1/udf/history", "Wallex", "_udf_history"),
+    ("GET", r"/market/udf/history", "Nobitex", "_udf_history"),
+    ("GET", r"/api/v3/(?:ui)?[kK]lines", "Binance", "_binance_klines"),
+    ("GET", r"/openApi/swap/v3/quote/klines", "BingX", "_bingx_klines"),
+    ("GET", r"/products/(?P<symbol>[^/]+)/candles", "Coinbase", "_coinbase_candles"),
+    ("GET", r"/v1/markets", "Wallex", "_markets"),
+    ("GET", r"/v1/currencies/stats", "Wallex", "_currencies_stats"),
+    ("GET", r"/v1/depth", "Wallex", "_depth"),
+    ("GET", r"/v2/depth/all", "Wallex", "_depth_all"),
+    ("GET", r"/v1/trades", "Wallex", "_trades"),
+    ("POST", r"/v1/account/orders", "Wallex", "_set_order"),
+    ("GET", r"/v1/account/orders/(?P<client_id>[^/]+)", "Wallex", "_get_order"),
+    ("DELETE", r"/v1/account/orders/(?P<client_id>[^/]+)", "Wallex", "_del_order"),
+    ("GET", r"/v1/account/openOrders", "Wallex", "_open_orders"),
+    ("GET", r"/v1/account/trades", "Wallex", "_account_trades"),
+]
+
+
+def _hash_uniform(keys: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Deterministic uniform [0, 1) numbers of integer keys (splitmix64).
+    """
+    x = np.asarray(keys, dtype=np.int64).astype(np.uint64)
+    x = x + np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _fmt(value) -> str:
+    """
+    Formats a number like the exchanges do in their JSON strings ("0.0001234", "65000.5").
+    """
+    return np.format_float_positional(float(value), precision=10, trim="-")
+
+
+class PriceGenerator:
+    """
+    Deterministic OHLCV generator: the same symbol and time always give the same candle.
+
+    The minute close is a function of the minute itself (slow waves plus hashed noise), so any
+    time range is generated directly, without replaying the history before it. Longer candles
+    are aggregated from the minute candles, so the timeframes are consistent with each other.
+
+    Methods:
+        - __init__(seed: int = 0, volatility: float = 0.0015, base_prices: dict = None): Initializes the generator.
+        - base_price(symbol: str) -> float: Mean price of a symbol.
+        - candles(symbol: str, start: int, end: int, step: int) -> dict: Candles opened in [start, end].
+        - price(symbol: str, time_now: float = None) -> float: Price at a time.
+    """
+
+    def __init__(self, seed: int = 0, volatility: float = 0.0015, base_prices: dict = None):
+        self.seed = seed
+        self.volatility = volatility
+        self.base_prices = base_prices or {}
+
+    def _symbol_seed(self, symbol: str) -> int:
+        return zlib.crc32(symbol.replace("-", "").upper().encode()) ^ self.seed
+
+    def base_price(self, symbol: str) -> float:
+        if symbol in self.base_prices:
+            return self.base_prices[symbol]
+        ### Log-uniform between 0.01 and 100000
+        unit = _hash_uniform(np.array([0]), self._symbol_seed(symbol))[0]
+        return float(10 ** (unit * 7 - 2))
+
+    def _minute_closes(self, symbol: str, minutes: np.ndarray) -> np.ndarray:
+        symbol_seed = self._symbol_seed(symbol)
+        phases = 2 * np.pi * _hash_uniform(np.arange(3), symbol_seed + 1)
+        noise = _hash_uniform(minutes, symbol_seed) - 0.5
+        log_price = (
+            0.05 * np.sin(2 * np.pi * minutes / (1440 * 7) + phases[0])
+            + 0.02 * np.sin(2 * np.pi * minutes / 1440 + phases[1])
+            + 0.008 * np.sin(2 * np.pi * minutes / 97 + phases[2])
+            + self.volatility * np.sqrt(12) * noise
+        )
+        return self.base_price(symbol) * np.exp(log_price)
+
+    def candles(self, symbol: str, start: int, end: int, step: int = MINUTE) -> dict:
+        """
+        Candles of `step` seconds opened in [start, end] (open times aligned on `step`).
+
+        Returns:
+            dict: {"time", "open", "high", "low", "close", "volume"} NumPy arrays.
+        """
+        step = max(MINUTE, int(step) - int(step) % MINUTE)
+        first = -(-int(start) // step) * step
+        times = np.arange(first, int(end) + 1, step, dtype=np.int64)
+        if len(times) == 0:
+            empty = np.array([], dtype=np.float64)
+            return {"time": times} | {
+                column: empty for column in ("open", "high", "low", "close", "volume")
+            }
+
+        per_candle = step // MINUTE
+        minutes = np.arange(
+            times[0] // MINUTE - 1, times[-1] // MINUTE + per_candle, dtype=np.int64
+        )
+        closes = self._minute_closes(symbol, minutes)
+        symbol_seed = self._symbol_seed(symbol)
+        minute_open, minute_close = closes[:-1], closes[1:]
+        wick = self.volatility * 0.5
+        minute_high = np.maximum(minute_open, minute_close) * (
+            1 + wick * _hash_uniform(minutes[1:], symbol_seed + 2)
+        )
+        minute_low = np.minimum(minute_open, minute_close) * (
+            1 - wick * _hash_uniform(minutes[1:], symbol_seed + 3)
+        )
+        minute_volume = (0.5 + _hash_uniform(minutes[1:], symbol_seed + 4)) * (
+            1000 / np.sqrt(self.base_price(symbol))
+        )
+
+        shape = (len(times), per_candle)
+        return {
+            "time": times,
+            "open": minute_open.reshape(shape)[:, 0],
+            "high": minute_high.reshape(shape).max(axis=1),
+            "low": minute_low.reshape(shape).min(axis=1),
+            "close": minute_close.reshape(shape)[:, -1],
+            "volume": minute_volume.reshape(shape).sum(axis=1),
+        }
+
+    def price(self, symbol: str, time_now: float = None) -> float:
+        if time_now is None:
+            time_now = time.time()
+        minute = np.array([int(time_now) // MINUTE])
+        return float(self._minute_closes(symbol, minute)[0])
+
+
+class ExchangeSimulator:
+    """
+    Local stand-in HTTP server of the exchange endpoints used by the robot.
+
+    It serves the market history paths of ExchangeAPI.PATH_URL (Wallex, Nobitex, Binance, BingX,
+    Coinbase), the Wallex MARKET_EP endpoints (markets, currencies stats, depth, trades) and the
+    Wallex ORDERS_EP endpoints (orders, openOrders, trades) with the response shapes of the
+    exchanges. Prices come from a deterministic PriceGenerator, LIMIT orders are filled when the
+    generated price crosses them. Latency, error rate and per-exchange rate limits (429 with a
+    Retry-After header) are configurable. The history of Coinbase is served like Coinbase does:
+    newest first, [time, low, high, open, close, volume].
+
+    Methods:
+        - __init__(host: str, port: int, latency: float, latency_jitter: float, error_rate: float, ...): Initializes the simulator.
+        - start() -> ExchangeSimulator: Starts the server in a background thread.
+        - stop(): Stops the server.
+        - base_urls() -> dict: Base URLs of the exchanges (see ExchangeAPI.BASE_URL).
+        - handle(method: str, path: str, query: dict, headers: dict, body: dict) -> tuple: Answers one request (without HTTP).
+        - get_stats() -> dict: Number of requests per route and status.
+
+    Example:
+        with ExchangeSimulator(latency=0.02, error_rate=0.01) as simulator:
+            history_client = HistoryOHLCV(base_urls=simulator.base_urls())
+            orders_api = OrdersManage(api_key="test", base_url=simulator.base_urls()["Wallex"])
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limits: dict = None,
+        symbols: tuple = DEFAULT_SYMBOLS,
+        price_generator: PriceGenerator = None,
+        seed: int = 0,
+    ):
+        """
+        Initializes a new instance of the ExchangeSimulator class.
+
+        Args:
+            host (str, optional): Address of the server.
+            port (int, optional): Port of the server (a free port if 0).
+            latency (float, optional): Seconds added to every response.
+            latency_jitter (float, optional): Mean of an exponential delay added to the latency (tail latency).
+            error_rate (float, optional): Share of the requests answered with `error_status`.
+            error_status (int, optional): HTTP status of the simulated errors.
+            rate_limits (dict, optional): (requests per second, burst) per exchange, no limit if None (see EXCHANGE_RATE_LIMITS).
+            symbols (tuple, optional): Markets listed by the market endpoints.
+            price_generator (PriceGenerator, optional): Candle generator. Defaults to PriceGenerator(seed).
+            seed (int, optional): Seed of the prices, latencies and errors.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.symbols = tuple(symbols)
+        self.price_generator = price_generator or PriceGenerator(seed=seed)
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.buckets = {
+            exchange: TokenBucket(rate=rate, capacity=burst)
+            for exchange, (rate, burst) in (rate_limits or {}).items()
+        }
+        self.routes = [
+            (method, re.compile(pattern), exchange, getattr(self, handler))
+            for method, pattern, exchange, handler in ROUTES
+        ]
+        ### Only used for the interval formats of the exchanges
+        self.history_client = HistoryOHLCV()
+
+        self.orders = {}
+        self.account_trades = {}
+        self.stats = {}
+        self.server = None
+        self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    # ------- Functions: Server -------
+    def start(self):
+        simulator = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            ### Headers and body are written separately, Nagle would delay the body
+            disable_nagle_algorithm = True
+
+            def _serve(self, method: str):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = None
+                if length:
+                    try:
+                        body = json.loads(self.rfile.read(length))
+                    except ValueError:
+                        body = None
+                status, payload, headers = simulator.handle(
+                    method=method,
+                    path=url.path,
+                    query=dict(parse_qsl(url.query)),
+                    headers={key.lower(): value for key, value in self.headers.items()},
+                    body=body,
+                )
+                content = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def do_DELETE(self):
+                self._serve("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def base_urls(self) -> dict:
+        """
+        Base URLs of the exchanges, in the format of ExchangeAPI.BASE_URL (Wallex ends with "/").
+        """
+        root = f"http://{self.host}:{self.port}"
+        return {
+            "Wallex": f"{root}/",
+            "Nobitex": root,
+            "BingX": root,
+            "Binance": root,
+            "Coinbase": root,
+        }
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {f"{route} {status}": count for (route, status), count in self.stats.items()}
+
+    # ------- Functions: Request -------
+    def _count(self, route: str, status: int):
+        with self.lock:
+            self.stats[(route, status)] = self.stats.get((route, status), 0) + 1
+
+    def _delay(self) -> float:
+        with self.lock:
+            delay = self.latency
+            if self.latency_jitter > 0:
+                delay += self.random.expovariate(1 / self.latency_jitter)
+            return delay
+
+    def _rate_limited(self, exchange: str) -> float:
+        """
+        Takes a token of the exchange, returns the seconds to wait if there is none (0 otherwise).
+        """
+        bucket = self.buckets.get(exchange)
+        if bucket is None:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            bucket.refill(now)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return bucket.wait_time(now)
+
+    def handle(
+        self, method: str, path: str, query: dict, headers: dict = None, body: dict = None
+    ) -> tuple:
+        """
+        Answers one request, without HTTP (the server threads call it).
+
+        Returns:
+            tuple: (HTTP status, JSON payload, extra headers)
+        """
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        for route_method, pattern, exchange, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match is None or route_method != method:
+                continue
+            route = f"{method} {pattern.pattern}"
+
+            retry_after = self._rate_limited(exchange)
+            if retry_after > 0:
+                self._count(route, 429)
+                return (
+                    429,
+                    {"code": 429, "msg": "Too many requests (simulated)"},
+                    {"Retry-After": str(max(1, round(retry_after)))},
+                )
+            with self.lock:
+                failed = self.error_rate > 0 and self.random.random() < self.error_rate
+            if failed:
+                self._count(route, self.error_status)
+                return (
+                    self.error_status,
+                    {"success": False, "message": "Internal error (simulated)"},
+                    {},
+                )
+
+            try:
+                status, payload = handler(
+                    query=query,
+                    headers=headers or {},
+                    body=body or {},
+                    exchange=exchange,
+                    **match.groupdict(),
+                )
+            except (KeyError, ValueError) as e:
+                status, payload = 400, {"success": False, "message": f"Bad request: {e}"}
+            self._count(route, status)
+            return status, payload, {}
+
+        self._count("unknown", 404)
+        return 404, {"success": False, "message": f"Not found: {method} {path}"}, {}
+
+    # ------- Functions: Market history -------
+    def _history(self, exchange: str, symbol: str, interval: str, start: int, end: int) -> dict:
+        step = self.history_client._interval_seconds(exchange=exchange, interval=interval)
+        time_now = int(time.time())
+        end = min(int(end), time_now - time_now % step)
+        candles = self.price_generator.candles(symbol, start=int(start), end=end, step=step)
+        limit = HistoryOHLCV.MAX_CANDLES_REQUEST.get(exchange, 1000)
+        return {key: values[:limit] for key, values in candles.items()}
+
+    def _udf_history(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        candles = self._history(
+            exchange=exchange,
+            symbol=query["symbol"],
+            interval=query["resolution"],
+            start=int(query["from"]),
+            end=int(query["to"]),
+        )
+        if len(candles["time"]) == 0:
+            return 200, {"s": "no_data"}
+        payload = {"s": "ok", "t": candles["time"].tolist()}
+        for key, column in zip("ohlcv", ("open", "high", "low", "close", "volume")):
+            if exchange == "Wallex":
+                ### Wallex sends the numbers as strings, Nobitex as numbers
+                payload[key] = [_fmt(value) for value in candles[column]]
+            else:
+                payload[key] = candles[column].tolist()
+        return 200, payload
+
+    def _binance_klines(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        limit = min(int(query.get("limit", 500)), 1000)
+        candles = self._history(
+            exchange="Binance",
+            symbol=query["symbol"],
+            interval=query["interval"],
+            start=int(query["startTime"]) // 1000,
+            end=int(query.get("endTime", time.time() * 1000)) // 1000,
+        )
+        step = self.history_client._interval_seconds("Binance", query["interval"])
+        rows = []
+        for i in range(min(limit, len(candles["time"]))):
+            open_time = int(candles["time"][i]) * 1000
+            volume = candles["volume"][i]
+            rows.append(
+                [
+                    open_time,
+                    _fmt(candles["open"][i]),
+                    _fmt(candles["high"][i]),
+                    _fmt(candles["low"][i]),
+                    _fmt(candles["close"][i]),
+                    _fmt(volume),
+                    open_time + step * 1000 - 1,
+                    _fmt(volume * candles["close"][i]),
+                    int(volume) + 1,
+                    _fmt(volume / 2),
+                    _fmt(volume * candles["close"][i] / 2),
+                    "0",
+                ]
+            )
+        return 200, rows
+
+    def _bingx_klines(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        limit = min(int(query.get("limit", 500)), 1440)
+        candles = self._history(
+            exchange="BingX",
+            symbol=query["symbol"],
+            interval=query["interval"],
+            start=int(query["startTime"]) // 1000,
+            end=int(query.get("endTime", time.time() * 1000)) // 1000,
+        )
+        data = [
+            {
+                "open": _fmt(candles["open"][i]),
+                "close": _fmt(candles["close"][i]),
+                "high": _fmt(candles["high"][i]),
+                "low": _fmt(candles["low"][i]),
+                "volume": _fmt(candles["volume"][i]),
+                "time": int(candles["time"][i]) * 1000,
+            }
+            for i in range(min(limit, len(candles["time"])))
+        ]
+        return 200, {"code": 0, "msg": "", "data": data}
+
+    def _coinbase_candles(
+        self, query: dict, headers: dict, body: dict, exchange: str, symbol: str
+    ) -> tuple:
+        candles = self._history(
+            exchange="Coinbase",
+            symbol=symbol,
+            interval=query["granularity"],
+            start=int(float(query["start"])),
+            end=int(float(query["end"])),
+        )
+        rows = [
+            [
+                int(candles["time"][i]),
+                float(candles["low"][i]),
+                float(candles["high"][i]),
+                float(candles["open"][i]),
+                float(candles["close"][i]),
+                float(candles["volume"][i]),
+            ]
+            for i in range(len(candles["time"]) - 1, -1, -1)
+        ]
+        return 200, rows
+
+    # ------- Functions: Market info -------
+    def _split_symbol(self, symbol: str) -> tuple:
+        for quote in QUOTE_ASSETS:
+            if symbol.endswith(quote) and len(symbol) > len(quote):
+                return symbol[: -len(quote)].rstrip("-"), quote
+        return symbol, ""
+
+    def _wallex(self, result) -> tuple:
+        return 200, {"result": result, "message": "The operation was successful", "success": True}
+
+    def _markets(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        time_now = time.time()
+        symbols = {}
+        for symbol in self.symbols:
+            base_asset, quote_asset = self._split_symbol(symbol)
+            last_price = self.price_generator.price(symbol, time_now)
+            day_ago = self.price_generator.price(symbol, time_now - 86400)
+            symbols[symbol] = {
+                "symbol": symbol,
+                "baseAsset": base_asset,
+                "quoteAsset": quote_asset,
+                "stats": {
+                    "bidPrice": _fmt(last_price * 0.9995),
+                    "askPrice": _fmt(last_price * 1.0005),
+                    "lastPrice": _fmt(last_price),
+                    "24h_ch": round((last_price / day_ago - 1) * 100, 2),
+                },
+            }
+        return self._wallex({"symbols": symbols})
+
+    def _currencies_stats(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        time_now = time.time()
+        result = []
+        for symbol in self.symbols:
+            base_asset, quote_asset = self._split_symbol(symbol)
+            if quote_asset != "USDT":
+                continue
+            price = self.price_generator.price(symbol, time_now)
+            result.append(
+                {
+                    "key": base_asset,
+                    "price": price,
+                    "daily_high_price": price * 1.01,
+                    "daily_low_price": price * 0.99,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+        return self._wallex(result)
+
+    def _order_book(self, symbol: str) -> dict:
+        second = int(time.time())
+        price = self.price_generator.price(symbol, second)
+        seed = self.price_generator._symbol_seed(symbol)
+        levels = np.arange(1, DEPTH_LEVELS + 1)
+        quantity = (0.1 + _hash_uniform(second * 100 + levels, seed + 5)) * (
+            1000 / np.sqrt(price)
+        )
+        book = {}
+        for side, sign in (("ask", 1), ("bid", -1)):
+            prices = price * (1 + sign * 0.0005 * levels)
+            book[side] = [
+                {
+                    "price": _fmt(level_price),
+                    "quantity": float(level_quantity),
+                    "sum": _fmt(level_price * level_quantity),
+                }
+                for level_price, level_quantity in zip(prices, quantity[:: sign])
+            ]
+        return book
+
+    def _depth(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        return self._wallex(self._order_book(query["symbol"]))
+
+    def _depth_all(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        return self._wallex({symbol: self._order_book(symbol) for symbol in self.symbols})
+
+    def _trades(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        symbol = query["symbol"]
+        second = int(time.time())
+        seed = self.price_generator._symbol_seed(symbol)
+        ages = np.floor(_hash_uniform(second * 100 + np.arange(NUM_TRADES), seed + 6) * 60)
+        trades = []
+        for i, age in enumerate(np.sort(ages)):
+            trade_time = second - int(age)
+            price = self.price_generator.price(symbol, trade_time)
+            quantity = float(10 / np.sqrt(price) * (1 + i % 7))
+            trades.append(
+                {
+                    "symbol": symbol,
+                    "quantity": _fmt(quantity),
+                    "price": _fmt(price),
+                    "sum": _fmt(price * quantity),
+                    "isBuyOrder": bool(i % 2),
+                    "timestamp": datetime.fromtimestamp(trade_time, timezone.utc).isoformat(),
+                }
+            )
+        return self._wallex({"latestTrades": trades})
+
+    # ------- Functions: Orders -------
+    def _account(self, headers: dict) -> str:
+        api_key = headers.get("x-api-key")
+        if not api_key:
+            raise PermissionError
+        return api_key
+
+    def _unauthorized(self) -> tuple:
+        return 401, {"success": False, "message": "Unauthorized", "result": {}}
+
+    def _fill_orders(self, api_key: str):
+        """
+        Fills the open LIMIT orders crossed by the current price.
+        """
+        time_now = time.time()
+        for order in self.orders.get(api_key, {}).values():
+            if order["status"] != "NEW":
+                continue
+            price = self.price_generator.price(order["symbol"], time_now)
+            order_price = float(order["price"])
+            if order["side"] == "BUY" and price > order_price:
+                continue
+            if order["side"] == "SELL" and price < order_price:
+                continue
+            quantity = float(order["origQty"])
+            order.update(
+                {
+                    "status": "FILLED",
+                    "active": False,
+                    "executedQty": order["origQty"],
+                    "executedPrice": order["price"],
+                    "executedSum": _fmt(order_price * quantity),
+                    "executedPercent": 100,
+                }
+            )
+            trade = {
+                "symbol": order["symbol"],
+                "quantity": order["origQty"],
+                "price": order["price"],
+                "sum": _fmt(order_price * quantity),
+                "isBuyer": order["side"] == "BUY",
+                "clientOrderId": order["clientOrderId"],
+                "timestamp": datetime.fromtimestamp(time_now, timezone.utc).isoformat(),
+            }
+            order["fills"] = [trade]
+            self.account_trades.setdefault(api_key, []).append(trade)
+
+    def _set_order(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        try:
+            api_key = self._account(headers)
+        except PermissionError:
+            return self._unauthorized()
+        missing = [key for key in ("symbol", "type", "side", "quantity") if not body.get(key)]
+        if missing:
+            return 422, {"success": False, "message": f"Missing fields: {missing}", "result": {}}
+        if body["type"] == "LIMIT" and body.get("price") in (None, ""):
+            return 422, {"success": False, "message": "Missing fields: ['price']", "result": {}}
+
+        client_id = body.get("client_id") or f"SIM-{time.time_ns()}"
+        price = body.get("price") or self.price_generator.price(body["symbol"])
+        with self.lock:
+            orders = self.orders.setdefault(api_key, {})
+            if client_id in orders:
+                return 400, {"success": False, "message": "Duplicate client_id", "result": {}}
+            orders[client_id] = {
+                "symbol": body["symbol"],
+                "type": body["type"],
+                "side": body["side"],
+                "clientOrderId": client_id,
+                "transactTime": int(time.time()),
+                "price": _fmt(price),
+                "origQty": _fmt(body["quantity"]),
+                "executedSum": "0",
+                "executedQty": "0",
+                "executedPrice": "0",
+                "sum": _fmt(float(price) * float(body["quantity"])),
+                "executedPercent": 0,
+                "status": "NEW",
+                "active": True,
+                "fills": [],
+            }
+            if body["type"] == "MARKET":
+                orders[client_id]["price"] = _fmt(self.price_generator.price(body["symbol"]))
+            self._fill_orders(api_key)
+            return self._wallex(dict(orders[client_id]))
+
+    def _find_order(self, headers: dict, client_id: str):
+        api_key = self._account(headers)
+        self._fill_orders(api_key)
+        return self.orders.get(api_key, {}).get(unquote(client_id))
+
+    def _get_order(
+        self, query: dict, headers: dict, body: dict, exchange: str, client_id: str
+    ) -> tuple:
+        with self.lock:
+            try:
+                order = self._find_order(headers, client_id)
+            except PermissionError:
+                return self._unauthorized()
+            if order is None:
+                return 404, {"success": False, "message": "Order not found", "result": {}}
+            return self._wallex(dict(order))
+
+    def _del_order(
+        self, query: dict, headers: dict, body: dict, exchange: str, client_id: str
+    ) -> tuple:
+        with self.lock:
+            try:
+                order = self._find_order(headers, client_id)
+            except PermissionError:
+                return self._unauthorized()
+            if order is None:
+                return 404, {"success": False, "message": "Order not found", "result": {}}
+            if order["status"] == "NEW":
+                order.update({"status": "CANCELED", "active": False})
+            return self._wallex(dict(order))
+
+    def _open_orders(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        with self.lock:
+            try:
+                api_key = self._account(headers)
+            except PermissionError:
+                return self._unauthorized()
+            self._fill_orders(api_key)
+            orders = [
+                dict(order)
+                for order in self.orders.get(api_key, {}).values()
+                if order["active"]
+                and (not query.get("symbol") or order["symbol"] == query["symbol"])
+            ]
+            return self._wallex({"orders": orders})
+
+    def _account_trades(self, query: dict, headers: dict, body: dict, exchange: str) -> tuple:
+        with self.lock:
+            try:
+                api_key = self._account(headers)
+            except PermissionError:
+                return self._unauthorized()
+            self._fill_orders(api_key)
+            trades = [
+                trade
+                for trade in self.account_trades.get(api_key, [])
+                if (not query.get("symbol") or trade["symbol"] == query["symbol"])
+                and (
+                    not query.get("side")
+                    or trade["isBuyer"] == (query["side"].lower() == "buy")
+                )
+            ]
+            return self._wallex({"AccountLatestTrades": trades[-NUM_TRADES:]})
+
+
+if __name__ == "__main__":
+    # Example usage: fetch history of every exchange and place an order against the simulator
+    from WallexApiClass.WallexOrdersManage import OrdersManage
+
+    with ExchangeSimulator(latency=0.005, latency_jitter=0.005) as simulator:
+        history_client = HistoryOHLCV(base_urls=simulator.base_urls())
+        end_time = int(time.time()) // 60 * 60
+        for exchange, symbol, interval in [
+            ("Wallex", "SHIBTMN", "1"),
+            ("Nobitex", "BTCUSDT", "60"),
+            ("Binance", "BTCUSDT", "1m"),
+            ("BingX", "BTC-USDT", "1m"),
+            ("Coinbase", "BTC-USD", "60"),
+        ]:
+            history = history_client.get_ohlcv_history(
+                exchange=exchange,
+                symbol=symbol,
+                interval=interval,
+                startTime=end_time - 3000 * 60,
+                endTime=end_time,
+            )
+            if isinstance(history, dict):
+                history = history.get("data") or history["t"]
+            print(exchange, symbol, interval, "candles:", len(history))
+
+        orders_api = OrdersManage(api_key="test", base_url=simulator.base_urls()["Wallex"])
+        print(orders_api.set_order("SHIBTMN", "LIMIT", "BUY", "0.0001", "1000", "MohZeh-1"))
+        print(orders_api.get_open_orders(symbol="SHIBTMN"))
+        print(orders_api.del_order("MohZeh-1"))
+        print(simulator.get_stats())
@@ -0,0 +1,224 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import asyncio
+import time
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.HistoryFetch import HistoryOHLCV
+from TF_Generator.HistoryFetchAsync import AsyncHistoryOHLCV
+from ManageSession.SessionPoolClass import SessionPool, AsyncSessionPool, aiohttp
+from ManageSession.RateLimitClass import RateLimiter
+from ManageSimulator.ExchangeSimulatorClass import DEFAULT_SYMBOLS
+
+### HISTORY_INTERVAL (dict): Interval of one minute in the format of every exchange.
+HISTORY_INTERVAL = {
+    "Wallex": "1",
+    "Nobitex": "1",
+    "Binance": "1m",
+    "BingX": "1m",
+    "Coinbase": "60",
+}
+### UNLIMITED_RATE (tuple): (tokens per second, burst) of a client rate limiter that never waits.
+UNLIMITED_RATE = (1e9, 1e9)
+
+
+class LoadGenerator:
+    """
+    Load generator of the market history clients, against the ExchangeSimulator (or any server).
+
+    Every request is one HistoryOHLCV.get_ohlcv_history call of `num_candles` minute candles
+    for a symbol, so the numbers include the chunking, the session pool and the JSON decoding of
+    the robot. The client rate limiter is disabled unless `client_rate_limit` is set, the
+    throughput is then only limited by the client and the server.
+
+    Methods:
+        - __init__(base_urls: dict, exchange: str, symbols: tuple, num_candles: int, concurrency: int, client_rate_limit: bool): Initializes the generator.
+        - run_threads(num_requests: int) -> dict: Blocking clients in a thread pool.
+        - run_async(num_requests: int) -> dict: Asyncio clients (requires aiohttp).
+        - run(num_requests: int, mode: str = "async") -> dict: run_async or run_threads.
+
+    The report is a dict: {"mode", "requests", "errors", "elapsed", "throughput", "p50", "p90", "p99", "max"}
+    (throughput in requests per second, latencies in milliseconds).
+
+    Example:
+        with ExchangeSimulator(latency=0.01) as simulator:
+            load_generator = LoadGenerator(base_urls=simulator.base_urls(), concurrency=32)
+            print(load_generator.run(num_requests=1000))
+    """
+
+    def __init__(
+        self,
+        base_urls: dict,
+        exchange: str = "Wallex",
+        symbols: tuple = DEFAULT_SYMBOLS,
+        num_candles: int = 500,
+        concurrency: int = 16,
+        client_rate_limit: bool = False,
+    ):
+        """
+        Initializes a new instance of the LoadGenerator class.
+
+        Args:
+            base_urls (dict): Base URLs of the exchanges (see ExchangeSimulator.base_urls).
+            exchange (str, optional): Exchange of the requests.
+            symbols (tuple, optional): Symbols requested in turn.
+            num_candles (int, optional): Minute candles per request.
+            concurrency (int, optional): Number of requests in flight.
+            client_rate_limit (bool, optional): Keep the rate limits of RATE_LIMITS in the clients.
+        """
+        self.base_urls = base_urls
+        self.exchange = exchange
+        self.symbols = tuple(symbols)
+        self.num_candles = num_candles
+        self.concurrency = concurrency
+        self.client_rate_limit = client_rate_limit
+
+    def _rate_limiter(self) -> RateLimiter:
+        if self.client_rate_limit:
+            return RateLimiter()
+        return RateLimiter(
+            rate_limits={
+                self.exchange: {
+                    "exchange": UNLIMITED_RATE,
+                    "market": UNLIMITED_RATE,
+                    "account": UNLIMITED_RATE,
+                }
+            },
+            priority_reserve=0,
+        )
+
+    def _requests(self, num_requests: int) -> list:
+        """
+        Returns the (symbol, startTime, endTime) of the requests.
+        """
+        end_time = int(time.time()) // 60 * 60
+        start_time = end_time - (self.num_candles - 1) * 60
+        return [
+            (self.symbols[i % len(self.symbols)], start_time, end_time)
+            for i in range(num_requests)
+        ]
+
+    def _is_valid(self, payload) -> bool:
+        if isinstance(payload, dict):
+            return bool(payload.get("t") or payload.get("data"))
+        return bool(payload)
+
+    def _report(self, mode: str, latencies: list, errors: int, elapsed: float) -> dict:
+        values = np.asarray(latencies) * 1e3
+        report = {
+            "mode": mode,
+            "requests": len(latencies),
+            "errors": errors,
+            "elapsed": elapsed,
+            "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        }
+        for name, percentile in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100)):
+            report[name] = float(np.percentile(values, percentile)) if len(values) else None
+        return report
+
+    # -------------------------------
+    def run_threads(self, num_requests: int) -> dict:
+        session_pool = SessionPool(
+            pool_sizes={},
+            default_pool_size=self.concurrency,
+            rate_limiter=self._rate_limiter(),
+        )
+        history_client = HistoryOHLCV(session_pool=session_pool, base_urls=self.base_urls)
+        interval = HISTORY_INTERVAL[self.exchange]
+
+        def send(request: tuple) -> tuple:
+            symbol, start_time, end_time = request
+            begin = time.perf_counter()
+            try:
+                payload = history_client.get_ohlcv_history(
+                    exchange=self.exchange,
+                    symbol=symbol,
+                    interval=interval,
+                    startTime=start_time,
+                    endTime=end_time,
+                )
+                valid = self._is_valid(payload)
+            except Exception:
+                valid = False
+            return time.perf_counter() - begin, valid
+
+        begin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(send, self._requests(num_requests)))
+        elapsed = time.perf_counter() - begin
+        session_pool.close()
+
+        errors = sum(not valid for _, valid in results)
+        return self._report("threads", [latency for latency, _ in results], errors, elapsed)
+
+    async def run_async(self, num_requests: int) -> dict:
+        session_pool = AsyncSessionPool(
+            pool_sizes={},
+            default_pool_size=self.concurrency,
+            rate_limiter=self._rate_limiter(),
+        )
+        history_client = AsyncHistoryOHLCV(
+            session_pool=session_pool, base_urls=self.base_urls
+        )
+        interval = HISTORY_INTERVAL[self.exchange]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(request: tuple) -> tuple:
+            symbol, start_time, end_time = request
+            async with semaphore:
+                begin = time.perf_counter()
+                try:
+                    payload = await history_client.get_ohlcv_history(
+                        exchange=self.exchange,
+                        symbol=symbol,
+                        interval=interval,
+                        startTime=start_time,
+                        endTime=end_time,
+                    )
+                    valid = self._is_valid(payload)
+                except Exception:
+                    valid = False
+                return time.perf_counter() - begin, valid
+
+        begin = time.perf_counter()
+        results = await asyncio.gather(*(send(r) for r in self._requests(num_requests)))
+        elapsed = time.perf_counter() - begin
+        await session_pool.close()
+
+        errors = sum(not valid for _, valid in results)
+        return self._report("async", [latency for latency, _ in results], errors, elapsed)
+
+    def run(self, num_requests: int, mode: str = "async") -> dict:
+        if mode == "async" and aiohttp is not None:
+            return asyncio.run(self.run_async(num_requests=num_requests))
+        return self.run_threads(num_requests=num_requests)
+
+
+if __name__ == "__main__":
+    # Load-generation mode: throughput and tail latency of the history clients
+    from ManageSimulator.ExchangeSimulatorClass import ExchangeSimulator
+
+    num_requests = 400
+    with ExchangeSimulator(latency=0.01, latency_jitter=0.01, error_rate=0.01) as simulator:
+        for exchange in ("Wallex", "Binance"):
+            for concurrency in (1, 16):
+                load_generator = LoadGenerator(
+                    base_urls=simulator.base_urls(),
+                    exchange=exchange,
+                    concurrency=concurrency,
+                )
+                for mode in ("threads", "async"):
+                    report = load_generator.run(num_requests=num_requests, mode=mode)
+                    print(
+                        f"{exchange:8} {mode:7} x{concurrency:<3}"
+                        f" {report['throughput']:7.1f} req/s"
+                        f"  p50 {report['p50']:6.1f} ms  p99 {report['p99']:6.1f} ms"
+                        f"  max {report['max']:6.1f} ms  errors {report['errors']}"
+                    )
+        print(simulator.get_stats())
@@ -0,0 +1,199 @@
+from collections import deque
+import numpy as np
+import asyncio
+import time
+import re
+
+### SECONDS_TIME_UNIT (dict): Seconds of every time unit of a timeframe.
+SECONDS_TIME_UNIT = {"min": 60, "H": 3600, "D": 86400}
+### DEFAULT_SETTLE_DELAY (float): Seconds waited after a candle close before firing (exchange publication lag).
+DEFAULT_SETTLE_DELAY = 2.0
+### STATS_WINDOW (int): Number of recent samples kept for the jitter and latency statistics.
+STATS_WINDOW = 1000
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """
+    Seconds of a candle of the timeframe (e.g. "5min" -> 300, "4H" -> 14400).
+    """
+    match = re.fullmatch(r"(\d+)(min|H|D)", timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe for the scheduler: {timeframe}")
+    return int(match.group(1)) * SECONDS_TIME_UNIT[match.group(2)]
+
+
+class CandleScheduler:
+    """
+    Fires at every candle close of a timeframe, without drift.
+
+    Every deadline is computed from the candle boundary itself (a multiple of the timeframe since
+    the epoch, UTC) and waited with the monotonic clock, so the delays of the callbacks never
+    accumulate. When boundaries were missed (slow callback, suspended process) they are reported
+    together in the next event instead of being fired one by one.
+
+    The event of a candle close is a dict:
+        - "boundary" (int): Timestamp (seconds) of the candle close.
+        - "missed" (list): Timestamps of the candle closes missed since the previous event.
+        - "jitter" (float): Seconds between the deadline (boundary + settle delay) and the wake-up.
+
+    The latency from the candle close to a stage of the robot (e.g. the order submission) is
+    recorded with `mark(stage)`.
+
+    Methods:
+        - __init__(timeframe: str = "1min", settle_delay: float = DEFAULT_SETTLE_DELAY): Initializes the scheduler.
+        - next_boundary(time_now: float = None) -> int: Timestamp of the next candle close.
+        - wait_next() -> dict: Sleeps until the next candle close (blocking).
+        - wait_next_async() -> dict: Sleeps until the next candle close (asyncio).
+        - run(callback, cycles: int = None): Calls callback(event) at every candle close.
+        - mark(stage: str) -> float: Records the seconds since the last candle close.
+        - get_stats() -> dict: Jitter and latency statistics in milliseconds.
+
+    Example:
+        candle_scheduler = CandleScheduler(timeframe="5min", settle_delay=1.5)
+        event = candle_scheduler.wait_next()
+        ...
+        candle_scheduler.mark("order_submitted")
+    """
+
+    def __init__(self, timeframe: str = "1min", settle_delay: float = DEFAULT_SETTLE_DELAY):
+        """
+        Initializes a new instance of the CandleScheduler class.
+
+        Args:
+            timeframe (str, optional): Timeframe of the candles (e.g. "1min", "15min", "4H", "1D").
+            settle_delay (float, optional): Seconds waited after the candle close before firing.
+        """
+        self.timeframe = timeframe
+        self.settle_delay = settle_delay
+        self.period = timeframe_seconds(timeframe)
+
+        self.last_boundary = None
+        self.jitters = deque(maxlen=STATS_WINDOW)
+        self.latencies = {}
+
+    def next_boundary(self, time_now: float = None) -> int:
+        """
+        Returns the timestamp of the next candle close after `time_now` (wall clock).
+        """
+        if time_now is None:
+            time_now = time.time()
+        return (int(time_now - self.settle_delay) // self.period + 1) * self.period
+
+    # ------- Functions: Wait -------
+    def _deadline(self) -> tuple:
+        """
+        Returns (boundary, monotonic deadline) of the next candle close to fire.
+        """
+        time_now, monotonic_now = time.time(), time.monotonic()
+        boundary = self.next_boundary(time_now)
+        if self.last_boundary is not None and boundary - self.period > self.last_boundary:
+            ### Boundaries passed while the robot was busy: fire now for the last one
+            boundary -= self.period
+        deadline = monotonic_now + (boundary + self.settle_delay - time_now)
+        return boundary, deadline
+
+    def _event(self, boundary: int, deadline: float) -> dict:
+        jitter = time.monotonic() - deadline
+        missed = []
+        if self.last_boundary is not None:
+            missed = list(range(self.last_boundary + self.period, boundary, self.period))
+        self.last_boundary = boundary
+        self.jitters.append(jitter)
+        return {"boundary": boundary, "missed": missed, "jitter": jitter}
+
+    def wait_next(self) -> dict:
+        """
+        Sleeps until the next candle close (plus the settle delay).
+
+        Returns:
+            dict: The event of the candle close.
+        """
+        boundary, deadline = self._deadline()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(remaining)
+        return self._event(boundary=boundary, deadline=deadline)
+
+    async def wait_next_async(self) -> dict:
+        """
+        Sleeps until the next candle close (plus the settle delay), asyncio version.
+
+        Returns:
+            dict: The event of the candle close.
+        """
+        boundary, deadline = self._deadline()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+        return self._event(boundary=boundary, deadline=deadline)
+
+    def run(self, callback, cycles: int = None):
+        """
+        Calls callback(event) at every candle close.
+
+        Args:
+            callback: Function called with the event dict.
+            cycles (int, optional): Number of candle closes (forever if None).
+        """
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            callback(self.wait_next())
+            cycle += 1
+
+    # ------- Functions: Statistics -------
+    def mark(self, stage: str) -> float:
+        """
+        Records the seconds since the last candle close for a stage (e.g. "order_submitted").
+
+        Returns:
+            float: Seconds since the candle close.
+        """
+        if self.last_boundary is None:
+            return None
+        latency = time.time() - self.last_boundary
+        self.latencies.setdefault(stage, deque(maxlen=STATS_WINDOW)).append(latency)
+        return latency
+
+    def _summary(self, samples) -> dict:
+        values = np.asarray(samples) * 1e3
+        if len(values) == 0:
+            return {"count": 0}
+        return {
+            "count": len(values),
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p99": float(np.percentile(values, 99)),
+            "max": float(values.max()),
+        }
+
+    def get_stats(self) -> dict:
+        """
+        Returns the jitter of the wake-ups and the latency of every marked stage, in milliseconds.
+
+        Returns:
+            dict: {"jitter": {...}, "latency": {stage: {...}}}
+        """
+        return {
+            "jitter": self._summary(self.jitters),
+            "latency": {
+                stage: self._summary(samples) for stage, samples in self.latencies.items()
+            },
+        }
+
+
+if __name__ == "__main__":
+    # Example usage: fire 3 one-minute candle closes, the second callback is too slow
+    candle_scheduler = CandleScheduler(timeframe="1min", settle_delay=0.5)
+
+    def on_candle_close(event):
+        print(time.strftime("%H:%M:%S"), event)
+        candle_scheduler.mark("callback_done")
+        if len(candle_scheduler.jitters) == 2:
+            time.sleep(70)
+
+    candle_scheduler.run(callback=on_candle_close, cycles=3)
+    print(candle_scheduler.get_stats())
@@ -1,8 +1,16 @@
 from datetime import datetime
+import time
+
+### DEFAULT_LAST_TIME (int): Epoch seconds used when no candle was processed yet (2020-01-01).
+DEFAULT_LAST_TIME = 1577836800
+### DEFAULT_PERIOD_SECONDS (int): Seconds of a candle of the default timeframe ("1min").
+DEFAULT_PERIOD_SECONDS = 60
 
 
 class TimeAndIdxManage:
-    def __init__(self):
+    def __init__(self, period_seconds: int = DEFAULT_PERIOD_SECONDS):
+        ### period_seconds: seconds of a candle of the traded timeframe (CandleScheduler.period)
+        self.period_seconds = period_seconds
         self.define_variables()
 
     def define_variables(self):
@@ -16,16 +24,20 @@ class TimeAndIdxManage:
         self.set_variables()
 
     def set_variables(self):
+        ### last_date: open time of the last processed candle in epoch seconds (the DataFrame index)
         if self.last_date is None:
-            self.last_date = datetime.strptime("2020-01-01", "%Y-%m-%d")
+            self.last_date = DEFAULT_LAST_TIME
             print(self.last_date)
-        time_last = int(datetime.timestamp(self.last_date))
-        time_now = int(datetime.timestamp(datetime.now()))
+        if isinstance(self.last_date, datetime):
+            time_last = int(self.last_date.timestamp())
+        else:
+            time_last = int(self.last_date)
+        time_now = int(time.time())
         self.difference_time = time_now - time_last
         print("difference_time:", self.difference_time)
 
-        time_idx_now = time_now - (time_now % 60)
-        self.difference_idx = int((time_last - time_idx_now) / 60) + 1
+        time_idx_now = time_now - (time_now % self.period_seconds)
+        self.difference_idx = int((time_last - time_idx_now) / self.period_seconds) + 1
         print("difference_idx :", self.difference_idx)
 
     def set_idx_data_difference(self):
@@ -57,7 +69,9 @@ class TimeAndIdxManage:
     #     return self.is_coordinated
 
     def get_sleep_time(self):
-        self.sleep_time_sec = 60 - (self.difference_time % 60)
+        self.sleep_time_sec = self.period_seconds - (
+            self.difference_time % self.period_seconds
+        )
         return self.sleep_time_sec
 
     def get_idx(self, idx, last_date):
@@ -0,0 +1,202 @@
+from operator import itemgetter
+import numpy as np
+import json
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.ManagerCandleStore import CANDLE_COLUMNS
+from ManageMetrics.LatencyTracerClass import traced
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+### JSON_LOADS (callable): JSON parser of the responses (orjson if installed, bytes or str).
+JSON_LOADS = orjson.loads if orjson is not None else json.loads
+### UDF_KEYS (tuple): Keys of the CANDLE_COLUMNS in a Wallex / Nobitex (UDF) response.
+UDF_KEYS = ("t", "o", "h", "l", "c", "v")
+### BINGX_KEYS (tuple): Keys of the CANDLE_COLUMNS in a BingX candle.
+BINGX_KEYS = ("time", "open", "high", "low", "close", "volume")
+### COINBASE_FIELDS (tuple): Fields of the CANDLE_COLUMNS in a Coinbase candle [time, low, high, open, close, volume].
+COINBASE_FIELDS = (0, 3, 2, 1, 4, 5)
+
+
+def _floats(values) -> np.ndarray:
+    """
+    float64 array of a JSON column (numbers or numeric strings), None is NaN.
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(
+            [np.nan if value is None else float(value) for value in values],
+            dtype=np.float64,
+        )
+
+
+class OHLCVDecoder:
+    """
+    Decodes the market history responses of the exchanges straight into typed column arrays.
+
+    A response is parsed once (orjson if installed) and every candle field is converted once
+    to a float64 array, without the intermediate DataFrames of DataFrameOrg._regularize_dataframe.
+    The result is a dict {column: np.ndarray} of the CANDLE_COLUMNS (TimeStamp in seconds),
+    sorted by TimeStamp, without duplicates (last kept) and without incomplete candles. It is
+    accepted as is by CandleStore.load / CandleStore.append and JournalManager.append.
+
+    Methods:
+        - decode(exchange: str, content: bytes | str | dict | list) -> dict: Decodes a response (raw or parsed).
+        - merge(chunks: list) -> dict: Merges the decoded responses of several chunks.
+        - empty() -> dict: Arrays without candles.
+        - num_candles(ohlcv_arrays: dict) -> int: Number of candles of decoded arrays.
+
+    Example:
+        decoder = OHLCVDecoder()
+        ohlcv_arrays = decoder.decode("Binance", response.content)
+        candle_store.append(ohlcv_arrays)
+    """
+
+    EXCHANGE_FUNCTIONS = {
+        "Wallex": "_decode_udf",
+        "Nobitex": "_decode_udf",
+        "Binance": "_decode_binance",
+        "Coinbase": "_decode_coinbase",
+        "BingX": "_decode_bingx",
+    }
+
+    @staticmethod
+    def empty() -> dict:
+        return {column: np.empty(0, dtype=np.float64) for column in CANDLE_COLUMNS}
+
+    @staticmethod
+    def num_candles(ohlcv_arrays: dict) -> int:
+        return 0 if ohlcv_arrays is None else len(ohlcv_arrays["TimeStamp"])
+
+    @traced("decode.history")
+    def decode(self, exchange: str, content) -> dict:
+        """
+        Decodes a market history response of an exchange.
+
+        Parameters:
+            exchange (str): The name of the exchange ("Wallex", "Nobitex", "Binance", "Coinbase", "BingX").
+            content (bytes | str | dict | list): Body of the response, or its parsed JSON.
+
+        Returns:
+            dict: {column: float64 array} of the CANDLE_COLUMNS.
+
+        Raises:
+            ValueError: If the specified exchange is not supported.
+        """
+        if exchange not in self.EXCHANGE_FUNCTIONS:
+            raise ValueError(f"Exchange '{exchange}' not supported")
+        if isinstance(content, (bytes, bytearray, memoryview, str)):
+            content = JSON_LOADS(content)
+        if not content:
+            return self.empty()
+
+        decode_function = getattr(self, self.EXCHANGE_FUNCTIONS[exchange])
+        return self._finalize(decode_function(content))
+
+    def _decode_udf(self, payload: dict) -> list:
+        ### Wallex and Nobitex: one list per field (strings on Wallex), "s": "no_data" without candles
+        if not isinstance(payload, dict) or "t" not in payload:
+            return []
+        return [_floats(payload[key]) for key in UDF_KEYS]
+
+    def _decode_rows(self, rows: list, fields: tuple) -> list:
+        return [_floats(list(map(itemgetter(field), rows))) for field in fields]
+
+    def _decode_binance(self, payload: list) -> list:
+        ### Binance: [open time (ms), open, high, low, close, volume, ...] (strings)
+        columns = self._decode_rows(payload, fields=range(6))
+        columns[0] /= 1000
+        return columns
+
+    def _decode_coinbase(self, payload: list) -> list:
+        ### Coinbase: [time, low, high, open, close, volume], newest first
+        return self._decode_rows(payload, fields=COINBASE_FIELDS)
+
+    def _decode_bingx(self, payload: dict) -> list:
+        ### BingX: {"data": [{"time" (ms), "open", "high", ...}]}
+        rows = payload.get("data") if isinstance(payload, dict) else None
+        if not rows:
+            return []
+        columns = self._decode_rows(rows, fields=BINGX_KEYS)
+        columns[0] /= 1000
+        return columns
+
+    def _finalize(self, columns: list) -> dict:
+        """
+        Drops incomplete candles, sorts by TimeStamp and drops duplicates (last kept).
+        """
+        if not columns or len(columns[0]) == 0:
+            return self.empty()
+        values = np.vstack(columns)
+
+        complete = ~np.isnan(values).any(axis=0)
+        if not complete.all():
+            values = values[:, complete]
+        time_stamps = values[0]
+        if len(time_stamps) > 1 and not (time_stamps[1:] > time_stamps[:-1]).all():
+            order = np.argsort(time_stamps, kind="stable")
+            values = values[:, order]
+            last_of_run = np.r_[values[0, 1:] != values[0, :-1], True]
+            values = values[:, last_of_run]
+        return dict(zip(CANDLE_COLUMNS, values))
+
+    def merge(self, chunks: list) -> dict:
+        """
+        Merges the decoded responses of several chunks (like HistoryOHLCV._merge_payloads).
+        """
+        chunks = [chunk for chunk in chunks if self.num_candles(chunk)]
+        if not chunks:
+            return self.empty()
+        if len(chunks) == 1:
+            return chunks[0]
+        columns = [
+            np.concatenate([chunk[column] for chunk in chunks]) for column in CANDLE_COLUMNS
+        ]
+        return self._finalize(columns)
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    import time
+
+    from TF_Generator.ManagerLogger import LoggerManager
+    from TF_Generator.OrganizerDataFrame import DataFrameOrg
+    from ManageBenchmark.FixtureHistoryClass import FixtureHistoryClient
+
+    # Decode the fixtures and compare with the DataFrame path of DataFrameOrg
+    history_client = FixtureHistoryClient()
+    decoder = OHLCVDecoder()
+    df_organizer = DataFrameOrg(logger=LoggerManager(log_file_name="Decoder.log"))
+
+    for exchange in decoder.EXCHANGE_FUNCTIONS:
+        fixture = history_client.load(exchange)
+        content = json.dumps(fixture["payload"]).encode()
+
+        start = time.perf_counter()
+        ohlcv_arrays = decoder.decode(exchange, content)
+        decode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ohlcv_df = df_organizer._regularize_dataframe(
+            exchange=exchange, ohlcv_dataframe=pd.DataFrame(json.loads(content))
+        )
+        dataframe_time = time.perf_counter() - start
+
+        num_candles = decoder.num_candles(ohlcv_arrays)
+        ohlcv_df = ohlcv_df.sort_values("TimeStamp")
+        assert np.array_equal(ohlcv_arrays["TimeStamp"], ohlcv_df["TimeStamp"])
+        print(
+            f"{exchange:8}: {num_candles} candles, decode {decode_time * 1e3:6.1f} ms "
+            f"({num_candles / decode_time / 1e6:.2f} M candles/s), "
+            f"DataFrame {dataframe_time * 1e3:6.1f} ms"
+        )
@@ -1,5 +1,6 @@
 import pandas as pd
 import logging
+import asyncio
 import time
 import sys
 import re
@@ -17,9 +18,14 @@ from TF_Generator.OrganizerTimeFrame import TimeFrameOrg
 from TF_Generator.ManagerInputs import InputsManager
 from TF_Generator.ManagerLogger import LoggerManager
 from TF_Generator.HistoryFetch import HistoryOHLCV
+from TF_Generator.HistoryFetchAsync import AsyncHistoryOHLCV
+from TF_Generator.DecoderOHLCV import OHLCVDecoder
 from TF_Generator.ManagerTime import TimeManager
-from TF_Generator.ManagerFile import FileManager
+from TF_Generator.ManagerFile import FileManager, DEFAULT_FILE_FORMAT
+from TF_Generator.ManagerJournal import JournalManager
+from TF_Generator.TimeIndex import present_dataframe
 from datetime import datetime
+from ManageMetrics.LatencyTracerClass import traced
 
 APP_DIRECTORY = app_directory
 
@@ -35,17 +41,36 @@ class GenerateOHLCV:
         - num_candles (int): Number of candles to fetch.
         - data_directory (str): Directory path to store the OHLCV DataFrame files.
         - enable_logging (bool): Flag to enable or disable logging.
+        - file_format (str): Storage format of the OHLCV DataFrame files ("npy", "feather" or "csv").
+        - enable_journal (bool): Flag to persist new candles in an append-only journal.
+        - compact_records (int): Number of journaled candles that triggers a snapshot of the OHLCV DataFrame.
+        - gap_report (dict): Report of the last gap fill (missing ranges and candles, requests, fetched and unfilled candles).
+        - unfilled_gaps (list): Holes the exchange returned no candles for, not requested again.
 
     Methods:
-        - __init__(symbol: str, timeframe: str, exchange: str, num_candles: int, data_directory: str, enable_logging: bool): Initializes the GenerateOHLCV instance.
+        - __init__(symbol: str, timeframe: str, exchange: str, num_candles: int, data_directory: str, enable_logging: bool, file_format: str, enable_journal: bool, compact_records: int, shared_instances: dict): Initializes the GenerateOHLCV instance.
         - __enter__(): Enter method for context management.
         - __exit__(exc_type, exc_value, traceback): Exit method for context management.
         - __del__(): Destructor, logs a message when the instance is deleted.
-        - _fetch_market_history(symbol: str, interval: int, startTime: int, endTime: int) -> pd.DataFrame: Fetches market data from an external API.
+        - _save_files(): Saves the OHLCV DataFrame files (only a snapshot of new candles when journaling).
+        - _recover_journal(): Replays the journal on top of the stored OHLCV DataFrame.
+        - _journal_candles(new_ohlcv_data: pd.DataFrame): Appends new candles to the journal, compacts it when needed.
+        - _compact_journal(): Saves a snapshot of the OHLCV DataFrame and empties the journal.
+        - _fetch_market_arrays(symbol: str, interval: int, startTime: int, endTime: int) -> dict: Fetches market data from an external API, decoded into column arrays.
+        - _fetch_new_data(start_timestamp: int = None, end_timestamp: int = None) -> dict: Fetches the new OHLCV data of a time range.
         - _create_new_data(start_timestamp: int = None, end_timestamp: int = None) -> pd.DataFrame: Creates new OHLCV data.
+        - _update_window(existing_ohlcv_df: pd.DataFrame, end_timestamp: int) -> list: Gets the time ranges missing in the existing OHLCV data.
+        - _fetch_gap_data(missing_ranges: list) -> dict: Fetches the OHLCV data of the missing time ranges.
+        - _fill_gaps(existing_ohlcv_df: pd.DataFrame, missing_ranges: list, new_ohlcv_arrays: dict, end_timestamp: int) -> pd.DataFrame: Stitches the fetched candles into the existing OHLCV data and reports the gaps.
         - _update_existing_data(existing_ohlcv_df: pd.DataFrame) -> pd.DataFrame: Updates existing OHLCV data.
         - dataframe_release(existing_ohlcv_df: pd.DataFrame = None) -> pd.DataFrame: Releases OHLCV DataFrame, either by updating or creating new data.
         - timeframe_release(ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None) -> pd.DataFrame: Releases OHLCV DataFrame with a specified timeframe.
+        - timeframes_release(new_timeframes: list, ohlcv_dataframe: pd.DataFrame = None) -> dict: Releases OHLCV DataFrames with several timeframes from one base DataFrame.
+        - dataframe_release_async(history_client=None, existing_ohlcv_df=None) -> pd.DataFrame: dataframe_release, the market data is fetched with asyncio.
+        - timeframe_release_async(history_client=None, ohlcv_dataframe=None, new_timeframe=None) -> pd.DataFrame: timeframe_release, the market data is fetched with asyncio.
+
+    Functions:
+        - timeframe_release_all(ohlcv_objects: list, max_concurrency: int = 8) -> list: Refreshes many GenerateOHLCV instances concurrently.
     """
 
     DEFAULT_APP_DIRECTORY = APP_DIRECTORY
@@ -58,6 +83,10 @@ class GenerateOHLCV:
         num_candles: int,
         data_directory=DEFAULT_APP_DIRECTORY,
         enable_logging=True,
+        file_format=DEFAULT_FILE_FORMAT,
+        enable_journal=True,
+        compact_records=1440,
+        shared_instances: dict = None,
     ):
         """
         Initialize GenerateOHLCV class.
@@ -69,6 +98,10 @@ class GenerateOHLCV:
             - num_candles (int): Number of candles to fetch.
             - data_directory (str): Directory path to store the OHLCV DataFrame files.
             - enable_logging (bool): Flag to enable or disable logging.
+            - file_format (str): Storage format of the OHLCV DataFrame files ("npy", "feather" or "csv").
+            - enable_journal (bool): Flag to persist new candles in an append-only journal.
+            - compact_records (int): Number of journaled candles that triggers a snapshot of the OHLCV DataFrame.
+            - shared_instances (dict): Helper instances shared with other feeds ("logger", "file_manager", "inputs_manager", "time_manager", "history_client", "async_history_client").
         """
         self.symbol = symbol
         self.timeframe = timeframe
@@ -76,8 +109,14 @@ class GenerateOHLCV:
         self.num_candles = num_candles
         self.data_directory = data_directory
         self.enable_logging = enable_logging
-
-        if self.enable_logging:
+        self.file_format = file_format
+        self.enable_journal = enable_journal
+        self.compact_records = compact_records
+        self.shared_instances = shared_instances or {}
+
+        if "logger" in self.shared_instances:
+            self.logger = self.shared_instances["logger"]
+        elif self.enable_logging:
             self.logger = LoggerManager()
         self.logger.logger.warning(f"--- Start : Class {self.__class__.__name__} ---")
 
@@ -95,6 +134,9 @@ class GenerateOHLCV:
         self.ohlcv_tf = None
         self.file_name_df = None
         self.file_name_tf = None
+        self.gap_report = None
+        self.unfilled_gaps = []
+        self.history_rewrites = 0
 
     def _define_instance(self):
         """
@@ -105,28 +147,38 @@ class GenerateOHLCV:
         self.file_manager_instance = None
         self.df_organizer_instance = None
         self.tf_organizer_instance = None
+        self.journal_manager_instance = None
+        self.history_client_instance = None
+        self.async_history_client_instance = None
 
     def _setup_instance(self):
-        self.file_manager_instance = FileManager(
+        ### The stateless helpers can be shared by the feeds of the same exchange/timeframe
+        shared = self.shared_instances
+        self.file_manager_instance = shared.get("file_manager") or FileManager(
             data_directory=os.path.join(self.data_directory, self.exchange),
             logger=self.logger,
+            file_format=self.file_format,
         )
-        self.reg_input_values_instance = InputsManager(
+        self.reg_input_values_instance = shared.get("inputs_manager") or InputsManager(
             timeframe=self.timeframe,
             exchange=self.exchange,
             num_candles=self.num_candles,
             logger=self.logger,
         )
-        self.time_manager_instance = TimeManager(
+        self.time_manager_instance = shared.get("time_manager") or TimeManager(
             timeframe=self.timeframe,
             exchange=self.exchange,
             num_candles=self.num_candles,
             logger=self.logger,
         )
+        ### The organizers keep the state of this feed (candle store, resampled bars)
         self.df_organizer_instance = DataFrameOrg(logger=self.logger)
         self.tf_organizer_instance = TimeFrameOrg(
             exchange=self.exchange, logger=self.logger
         )
+        ### One client for all fetches, its connections are kept alive in the shared pool
+        self.history_client_instance = shared.get("history_client") or HistoryOHLCV()
+        self.async_history_client_instance = shared.get("async_history_client")
 
     def _setupCreatorOHLCV(self):
         self._define_variables()
@@ -137,6 +189,13 @@ class GenerateOHLCV:
         self.ohlcv_df = self.file_manager_instance._read_df_ohlcv(
             file_name=self.file_name_df
         )
+        if self.enable_journal:
+            self.journal_manager_instance = JournalManager(
+                data_directory=self.file_manager_instance.data_directory,
+                file_name=self.file_name_df,
+                logger=self.logger,
+            )
+            self._recover_journal()
 
     def __enter__(self):
         """
@@ -151,13 +210,7 @@ class GenerateOHLCV:
         """
         self.exit_flag = True
         if self.ohlcv_df is not None:
-            self.file_manager_instance._save_df_ohlcv(
-                file_name=self.file_name_df, ohlcv_dataframe=self.ohlcv_df
-            )
-            if self.ohlcv_tf is not None:
-                self.file_manager_instance._save_df_ohlcv(
-                    file_name=self.file_name_tf, ohlcv_dataframe=self.ohlcv_tf
-                )
+            self._save_files()
             self.logger.log_debug("File saved & Exit class")
             self.logger.logger.info(
                 f"Call __exit__ (Class : {self.__class__.__name__})"
@@ -169,36 +222,103 @@ class GenerateOHLCV:
         """
         if self.exit_flag is None:
             if self.ohlcv_df is not None:
-                self.file_manager_instance._save_df_ohlcv(
-                    file_name=self.file_name_df, ohlcv_dataframe=self.ohlcv_df
-                )
-                if self.ohlcv_tf is not None:
-                    self.file_manager_instance._save_df_ohlcv(
-                        file_name=self.file_name_tf, ohlcv_dataframe=self.ohlcv_tf
-                    )
+                self._save_files()
                 self.logger.log_debug("File saved & Exit class")
                 self.logger.logger.info(
                     f"Call __del__ (Class : {self.__class__.__name__})"
                 )
 
-    def _fetch_market_history(
+    def _save_files(self):
+        """
+        Saves the OHLCV DataFrame files, the OHLCV DataFrame is only rewritten when the journal holds new candles.
+        """
+        if self.journal_manager_instance is None:
+            self.file_manager_instance._save_df_ohlcv(
+                file_name=self.file_name_df, ohlcv_dataframe=self.ohlcv_df
+            )
+        else:
+            if self.journal_manager_instance.num_records > 0:
+                self._compact_journal()
+            self.journal_manager_instance.close()
+
+        if self.ohlcv_tf is not None:
+            self.file_manager_instance._save_df_ohlcv(
+                file_name=self.file_name_tf, ohlcv_dataframe=self.ohlcv_tf
+            )
+
+    def _recover_journal(self):
+        """
+        Replays the journal on top of the stored OHLCV DataFrame.
+        """
+        self.logger.logger.info("_recover_journal (function)")
+
+        journal_ohlcv_df = self.journal_manager_instance.replay()
+        if journal_ohlcv_df is None:
+            if self.ohlcv_df is not None:
+                self.journal_manager_instance.last_timestamp = int(
+                    self.ohlcv_df["TimeStamp"].iloc[-1]
+                )
+            return
+
+        journal_ohlcv_df = self.df_organizer_instance._index_dataframe(
+            ohlcv_dataframe=journal_ohlcv_df
+        )
+        actual_candles = self.reg_input_values_instance._actual_candles()
+        if self.ohlcv_df is None:
+            self.ohlcv_df = journal_ohlcv_df.iloc[-actual_candles:]
+        else:
+            self.ohlcv_df = self.df_organizer_instance._concatenate_dataframe(
+                existing_ohlcv_df=self.ohlcv_df,
+                new_ohlcv_data=journal_ohlcv_df,
+                actual_candles=actual_candles,
+            )
+
+    def _journal_candles(self, new_ohlcv_data: pd.DataFrame | dict):
+        """
+        Appends new candles to the journal, compacts it when needed.
+
+        Parameters:
+            - new_ohlcv_data (pd.DataFrame | dict): New OHLCV data (DataFrame or column arrays).
+        """
+        if self.journal_manager_instance is None:
+            return
+
+        self.journal_manager_instance.append(ohlcv_dataframe=new_ohlcv_data)
+        if self.journal_manager_instance.num_records >= self.compact_records:
+            self._compact_journal()
+
+    def _compact_journal(self):
+        """
+        Saves a snapshot of the OHLCV DataFrame and empties the journal.
+        """
+        if self.journal_manager_instance is None or self.ohlcv_df is None:
+            return
+
+        self.logger.logger.info("_compact_journal (function)")
+        self.file_manager_instance._save_df_ohlcv(
+            file_name=self.file_name_df, ohlcv_dataframe=self.ohlcv_df
+        )
+        self.journal_manager_instance.truncate(
+            last_timestamp=self.ohlcv_df["TimeStamp"].iloc[-1]
+        )
+
+    def _fetch_market_arrays(
         self,
         symbol: str,
         interval: int,
         startTime: int,
         endTime: int,
-    ) -> pd.DataFrame:
+    ) -> dict:
         """
-        Fetches market data from Wallex Market Info API.
+        Fetches market data from the exchange API, decoded into column arrays.
 
         Returns:
-        - pd.DataFrame: Market data.
+        - dict: {column: np.ndarray} of the candles (see OHLCVDecoder), None if the fetch failed.
         """
-        self.logger.logger.info("_fetch_market_history (function)")
+        self.logger.logger.info("_fetch_market_arrays (function)")
 
-        client = HistoryOHLCV()
         try:
-            market_history = client.get_ohlcv_history(
+            ohlcv_arrays = self.history_client_instance.get_ohlcv_arrays(
                 exchange=self.exchange,
                 symbol=symbol,
                 interval=interval,
@@ -206,27 +326,54 @@ class GenerateOHLCV:
                 endTime=endTime,
             )
             self.logger.log_debug(
-                f"Market history in DataFrame: \n{pd.DataFrame(market_history)}"
+                "Market history: %s candles", OHLCVDecoder.num_candles(ohlcv_arrays)
             )
-            ohlcv_df = pd.DataFrame(data=market_history)
-            if ohlcv_df is not None:
-                return ohlcv_df
+            return ohlcv_arrays
         except Exception as e:
-            self.logger.logger.error(f"Error in make_df_ohlcv: {str(e)}")
+            self.logger.logger.error(f"Error in _fetch_market_arrays: {str(e)}")
 
-    def _create_new_data(
-        self, start_timestamp: int = None, end_timestamp: int = None
-    ) -> pd.DataFrame:
+    async def _fetch_market_arrays_async(
+        self,
+        history_client: AsyncHistoryOHLCV,
+        symbol: str,
+        interval: int,
+        startTime: int,
+        endTime: int,
+    ) -> dict:
         """
-        Creates new OHLCV data.
+        Fetches market data with an asyncio exchange client, decoded into column arrays.
 
         Returns:
-        - pd.DataFrame: New OHLCV data.
+        - dict: {column: np.ndarray} of the candles (see OHLCVDecoder), None if the fetch failed.
         """
-        self.logger.logger.info("_create_new_data (function)")
+        self.logger.logger.info("_fetch_market_arrays_async (function)")
+
+        try:
+            ohlcv_arrays = await history_client.get_ohlcv_arrays(
+                exchange=self.exchange,
+                symbol=symbol,
+                interval=interval,
+                startTime=startTime,
+                endTime=endTime,
+            )
+            self.logger.log_debug(
+                "Market history: %s candles", OHLCVDecoder.num_candles(ohlcv_arrays)
+            )
+            return ohlcv_arrays
+        except Exception as e:
+            self.logger.logger.error(f"Error in _fetch_market_arrays_async: {str(e)}")
+
+    def _new_data_window(
+        self, start_timestamp: int = None, end_timestamp: int = None
+    ) -> tuple:
+        """
+        Gets the interval and time range of the new OHLCV data to fetch.
 
+        Returns:
+        - tuple: (interval, start_timestamp, end_timestamp)
+        """
         interval = self.reg_input_values_instance._time_interval()
-        self.logger.log_debug(f"interval: {interval}")
+        self.logger.log_debug("interval: %s", interval)
 
         if start_timestamp is None:
             start_timestamp = self.time_manager_instance._start_time_new()
@@ -234,56 +381,307 @@ class GenerateOHLCV:
         if end_timestamp is None:
             end_timestamp = self.time_manager_instance._end_time_now()
 
-        new_ohlcv_df = self._fetch_market_history(
+        return interval, start_timestamp, end_timestamp
+
+    def _fetch_new_data(
+        self, start_timestamp: int = None, end_timestamp: int = None
+    ) -> dict:
+        """
+        Fetches the new OHLCV data of a time range (default: the whole OHLCV data).
+
+        Returns:
+        - dict: {column: np.ndarray} of the new candles, None if the fetch failed.
+        """
+        interval, start_timestamp, end_timestamp = self._new_data_window(
+            start_timestamp=start_timestamp, end_timestamp=end_timestamp
+        )
+        return self._fetch_market_arrays(
             symbol=self.symbol,
             interval=interval,
             startTime=start_timestamp,
             endTime=end_timestamp,
         )
-        new_ohlcv_df = self.df_organizer_instance._regularize_dataframe(
-            exchange=self.exchange, ohlcv_dataframe=new_ohlcv_df
+
+    async def _fetch_new_data_async(
+        self,
+        history_client: AsyncHistoryOHLCV,
+        start_timestamp: int = None,
+        end_timestamp: int = None,
+    ) -> dict:
+        """
+        Fetches the new OHLCV data of a time range with an asyncio exchange client.
+
+        Returns:
+        - dict: {column: np.ndarray} of the new candles, None if the fetch failed.
+        """
+        interval, start_timestamp, end_timestamp = self._new_data_window(
+            start_timestamp=start_timestamp, end_timestamp=end_timestamp
         )
-        new_ohlcv_df = self.df_organizer_instance._index_dataframe(
-            ohlcv_dataframe=new_ohlcv_df
+        return await self._fetch_market_arrays_async(
+            history_client=history_client,
+            symbol=self.symbol,
+            interval=interval,
+            startTime=start_timestamp,
+            endTime=end_timestamp,
         )
 
-        self.ohlcv_df = new_ohlcv_df
+    def _organize_new_data(self, new_ohlcv_arrays: dict) -> pd.DataFrame:
+        """
+        Loads the fetched market data in the CandleStore of the DataFrame organizer,
+        the next updates only append their new candles to it.
+
+        Returns:
+        - pd.DataFrame: New OHLCV data.
+        """
+        if new_ohlcv_arrays is None:
+            self.logger.logger.error("_organize_new_data: no market history")
+            return self.ohlcv_df
+
+        self.ohlcv_df = self.df_organizer_instance._load_arrays(
+            ohlcv_arrays=new_ohlcv_arrays,
+            actual_candles=self.reg_input_values_instance._actual_candles(),
+        )
+        return self.ohlcv_df
+
+    def _create_new_data(
+        self, start_timestamp: int = None, end_timestamp: int = None
+    ) -> pd.DataFrame:
+        """
+        Creates new OHLCV data.
+
+        Returns:
+        - pd.DataFrame: New OHLCV data.
+        """
+        self.logger.logger.info("_create_new_data (function)")
+
+        new_ohlcv_arrays = self._fetch_new_data(
+            start_timestamp=start_timestamp, end_timestamp=end_timestamp
+        )
+        return self._organize_new_data(new_ohlcv_arrays=new_ohlcv_arrays)
+
+    async def _create_new_data_async(
+        self,
+        history_client: AsyncHistoryOHLCV,
+        start_timestamp: int = None,
+        end_timestamp: int = None,
+    ) -> pd.DataFrame:
+        """
+        Creates new OHLCV data with an asyncio exchange client.
+
+        Returns:
+        - pd.DataFrame: New OHLCV data.
+        """
+        self.logger.logger.info("_create_new_data_async (function)")
+
+        new_ohlcv_arrays = await self._fetch_new_data_async(
+            history_client=history_client,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+        )
+        return self._organize_new_data(new_ohlcv_arrays=new_ohlcv_arrays)
+
+    def _update_window(
+        self, existing_ohlcv_df: pd.DataFrame, end_timestamp: int
+    ) -> list:
+        """
+        Gets the time ranges missing in the existing OHLCV data: the candles after the last one,
+        and the head and the holes (exchange outages, downtime) of the window.
+
+        Returns:
+        - list: (start_timestamp, end_timestamp) of every missing range, [] if the data is up to date.
+        """
+        missing_ranges = self.time_manager_instance._missing_ranges(
+            existing_ohlcv_df=existing_ohlcv_df,
+            end_timestamp=end_timestamp,
+            known_gaps=self.unfilled_gaps,
+        )
+        if missing_ranges:
+            return missing_ranges
+
+        self.logger.log_debug(
+            lambda: "ohlcv_dataframe is up to date and does not need to be updated: "
+            + datetime.now().isoformat(sep=" ", timespec="seconds")
+        )
+        return []
+
+    def _fetch_gap_data(self, missing_ranges: list) -> dict:
+        """
+        Fetches the OHLCV data of the missing time ranges, packed into the fewest requests.
+
+        Returns:
+        - dict: {column: np.ndarray} of the fetched candles, None if the fetch failed.
+        """
+        self.logger.logger.info("_fetch_gap_data (function)")
+
+        try:
+            return self.history_client_instance.get_ohlcv_ranges(
+                exchange=self.exchange,
+                symbol=self.symbol,
+                interval=self.reg_input_values_instance._time_interval(),
+                ranges=missing_ranges,
+            )
+        except Exception as e:
+            self.logger.logger.error(f"Error in _fetch_gap_data: {str(e)}")
+
+    async def _fetch_gap_data_async(
+        self, history_client: AsyncHistoryOHLCV, missing_ranges: list
+    ) -> dict:
+        """
+        Fetches the OHLCV data of the missing time ranges with an asyncio exchange client.
+
+        Returns:
+        - dict: {column: np.ndarray} of the fetched candles, None if the fetch failed.
+        """
+        self.logger.logger.info("_fetch_gap_data_async (function)")
+
+        try:
+            return await history_client.get_ohlcv_ranges(
+                exchange=self.exchange,
+                symbol=self.symbol,
+                interval=self.reg_input_values_instance._time_interval(),
+                ranges=missing_ranges,
+            )
+        except Exception as e:
+            self.logger.logger.error(f"Error in _fetch_gap_data_async: {str(e)}")
+
+    def _fill_gaps(
+        self,
+        existing_ohlcv_df: pd.DataFrame,
+        missing_ranges: list,
+        new_ohlcv_arrays: dict,
+        end_timestamp: int,
+    ) -> pd.DataFrame:
+        """
+        Stitches the fetched candles into the existing OHLCV data and reports the gaps.
+
+        The holes still missing after the fetch (the exchange has no candles for them) are kept in
+        unfilled_gaps and not requested again. When a hole or the head was filled, the candles are
+        older than the journaled ones, so a snapshot is saved instead, and the bars kept by the
+        incremental timeframe conversion are reset (they do not have these candles).
+
+        Returns:
+        - pd.DataFrame: Updated OHLCV data.
+        """
+        time_manager = self.time_manager_instance
+        self._merge_new_data(
+            existing_ohlcv_df=existing_ohlcv_df, new_ohlcv_data=new_ohlcv_arrays
+        )
+
+        missing_candles = time_manager._gap_candles(missing_ranges)
+        fetched_candles = OHLCVDecoder.num_candles(new_ohlcv_arrays)
+        backfilled = missing_ranges[0][1] < end_timestamp
+        unfilled_ranges = []
+        if backfilled and new_ohlcv_arrays is not None:
+            if fetched_candles:
+                ### Candles older than the last converted bar: convert the window again
+                self.tf_organizer_instance.reset_resample_state()
+                self.history_rewrites += 1
+            ### Holes followed by a stored candle: the exchange has no candles for them
+            window_start = end_timestamp - time_manager.totaltime_seconds
+            unfilled_ranges = [
+                (start, end)
+                for start, end in time_manager._missing_ranges(
+                    existing_ohlcv_df=self.ohlcv_df, end_timestamp=end_timestamp
+                )
+                if end < end_timestamp
+            ]
+            self.unfilled_gaps = [
+                gap for gap in self.unfilled_gaps if gap[1] >= window_start
+            ] + unfilled_ranges
+            self._compact_journal()
+
+        self.gap_report = {
+            "missing_ranges": len(missing_ranges),
+            "missing_candles": missing_candles,
+            "requests": len(
+                self.history_client_instance._plan_range_chunks(
+                    exchange=self.exchange,
+                    interval=self.reg_input_values_instance._time_interval(),
+                    ranges=missing_ranges,
+                )
+            ),
+            "fetched_candles": fetched_candles,
+            "unfilled_ranges": unfilled_ranges,
+            "unfilled_candles": time_manager._gap_candles(unfilled_ranges),
+        }
+        if backfilled:
+            self.logger.logger.info(f"Gap fill {self.symbol}: {self.gap_report}")
+        else:
+            self.logger.log_debug("Gap fill %s: %s", self.symbol, self.gap_report)
+        return self.ohlcv_df
+
+    def _merge_new_data(
+        self, existing_ohlcv_df: pd.DataFrame, new_ohlcv_data: pd.DataFrame | dict
+    ) -> pd.DataFrame:
+        """
+        Concatenates the new OHLCV data to the existing one and journals the new candles.
+
+        Returns:
+        - pd.DataFrame: Updated OHLCV data.
+        """
+        actual_candles = self.reg_input_values_instance._actual_candles()
+        concatenated_dataframe = self.df_organizer_instance._concatenate_dataframe(
+            existing_ohlcv_df=existing_ohlcv_df,
+            new_ohlcv_data=new_ohlcv_data,
+            actual_candles=actual_candles,
+        )
+        self.ohlcv_df = concatenated_dataframe
+        self._journal_candles(new_ohlcv_data=new_ohlcv_data)
         return self.ohlcv_df
 
     def _update_existing_data(self, existing_ohlcv_df: pd.DataFrame) -> pd.DataFrame:
         """
-        Updates existing OHLCV data.
+        Updates existing OHLCV data, only the missing candles are fetched.
 
         Returns:
         - pd.DataFrame: Updated OHLCV data.
         """
         self.logger.logger.info("_update_existing_data (function)")
 
-        start_timestamp = self.time_manager_instance._start_time_exists(
-            existing_ohlcv_df=existing_ohlcv_df
-        )
         end_timestamp = self.time_manager_instance._end_time_now()
-        seconds_time_unit = self.time_manager_instance._seconds_time_unit()
-
-        new_candles_needed = (end_timestamp - start_timestamp) / seconds_time_unit
+        missing_ranges = self._update_window(
+            existing_ohlcv_df=existing_ohlcv_df, end_timestamp=end_timestamp
+        )
 
-        if new_candles_needed > 0:
-            new_ohlcv_data = self._create_new_data(
-                start_timestamp=start_timestamp, end_timestamp=end_timestamp
+        if missing_ranges:
+            new_ohlcv_arrays = self._fetch_gap_data(missing_ranges=missing_ranges)
+            return self._fill_gaps(
+                existing_ohlcv_df=existing_ohlcv_df,
+                missing_ranges=missing_ranges,
+                new_ohlcv_arrays=new_ohlcv_arrays,
+                end_timestamp=end_timestamp,
             )
+        else:
+            self.ohlcv_df = existing_ohlcv_df
+            return self.ohlcv_df
 
-            actual_candles = self.reg_input_values_instance._actual_candles()
-            concatenated_dataframe = self.df_organizer_instance._concatenate_dataframe(
+    async def _update_existing_data_async(
+        self, history_client: AsyncHistoryOHLCV, existing_ohlcv_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Updates existing OHLCV data with an asyncio exchange client.
+
+        Returns:
+        - pd.DataFrame: Updated OHLCV data.
+        """
+        self.logger.logger.info("_update_existing_data_async (function)")
+
+        end_timestamp = self.time_manager_instance._end_time_now()
+        missing_ranges = self._update_window(
+            existing_ohlcv_df=existing_ohlcv_df, end_timestamp=end_timestamp
+        )
+
+        if missing_ranges:
+            new_ohlcv_arrays = await self._fetch_gap_data_async(
+                history_client=history_client, missing_ranges=missing_ranges
+            )
+            return self._fill_gaps(
                 existing_ohlcv_df=existing_ohlcv_df,
-                new_ohlcv_data=new_ohlcv_data,
-                actual_candles=actual_candles,
+                missing_ranges=missing_ranges,
+                new_ohlcv_arrays=new_ohlcv_arrays,
+                end_timestamp=end_timestamp,
             )
-            self.ohlcv_df = concatenated_dataframe
-            return self.ohlcv_df
         else:
-            self.logger.log_debug(
-                f"ohlcv_dataframe is up to date and does not need to be updated: {datetime.now().isoformat(sep=' ', timespec='seconds')}"
-            )
             self.ohlcv_df = existing_ohlcv_df
             return self.ohlcv_df
 
@@ -307,11 +705,69 @@ class GenerateOHLCV:
             self._update_existing_data(existing_ohlcv_df=existing_ohlcv_df)
         else:
             # Existing data not found, create it
-            self.logger.logger.info("The CSV DataFrame file does not exists.")
+            self.logger.logger.info("The DataFrame file does not exists.")
             self._create_new_data()
+            self._compact_journal()
 
         return self.ohlcv_df
 
+    async def dataframe_release_async(
+        self,
+        history_client: AsyncHistoryOHLCV = None,
+        existing_ohlcv_df: pd.DataFrame = None,
+    ) -> pd.DataFrame:
+        """
+        Releases OHLCV DataFrame like dataframe_release, the market data is fetched with asyncio.
+
+        Parameters:
+            - history_client (AsyncHistoryOHLCV): Asyncio exchange client (default: one per instance).
+            - existing_ohlcv_df (pd.DataFrame): Existing OHLCV DataFrame.
+
+        Returns:
+            - pd.DataFrame: Released OHLCV DataFrame.
+        """
+        self.logger.logger.info("dataframe_release_async (function)")
+
+        if history_client is None:
+            if self.async_history_client_instance is None:
+                self.async_history_client_instance = AsyncHistoryOHLCV()
+            history_client = self.async_history_client_instance
+
+        if existing_ohlcv_df is None:
+            existing_ohlcv_df = self.ohlcv_df
+
+        if isinstance(existing_ohlcv_df, pd.DataFrame):
+            # Existing data found, update it
+            await self._update_existing_data_async(
+                history_client=history_client, existing_ohlcv_df=existing_ohlcv_df
+            )
+        else:
+            # Existing data not found, create it
+            self.logger.logger.info("The DataFrame file does not exists.")
+            await self._create_new_data_async(history_client=history_client)
+            self._compact_journal()
+
+        return self.ohlcv_df
+
+    def _release_timeframe(
+        self, ohlcv_dataframe: pd.DataFrame, new_timeframe: str = None
+    ) -> pd.DataFrame:
+        """
+        Converts the OHLCV DataFrame to the specified timeframe.
+        """
+        if new_timeframe is None:
+            new_timeframe = self.timeframe
+
+        ### Only the buckets changed since the last release are aggregated again
+        self.ohlcv_tf = self.tf_organizer_instance.convert_timeframe_incremental(
+            ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+        )
+
+        self.file_name_tf = f"{self.symbol}-{new_timeframe}_tf"
+
+        return self.ohlcv_tf
+
+    @traced("release.timeframe")
     def timeframe_release(
         self, ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None
     ) -> pd.DataFrame:
@@ -330,16 +786,91 @@ class GenerateOHLCV:
         if ohlcv_dataframe is None:
             ohlcv_dataframe = self.dataframe_release()
 
-        if new_timeframe is None:
-            new_timeframe = self.timeframe
+        return self._release_timeframe(
+            ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+        )
+
+    def timeframes_release(
+        self, new_timeframes: list, ohlcv_dataframe: pd.DataFrame = None
+    ) -> dict:
+        """
+        Releases OHLCV DataFrames with several timeframes from the same base OHLCV DataFrame.
+
+        Parameters:
+            - new_timeframes (list): Timeframes for the released DataFrames (e.g. ["5min", "15min", "1H", "4H"]).
+            - ohlcv_dataframe (pd.DataFrame): OHLCV DataFrame.
+
+        Returns:
+            - dict: {timeframe: released OHLCV DataFrame}
+        """
+        self.logger.logger.info("timeframes_release (function)")
 
-        self.ohlcv_tf = self.tf_organizer_instance.convert_timeframe(
+        if ohlcv_dataframe is None:
+            ohlcv_dataframe = self.dataframe_release()
+
+        return self.tf_organizer_instance.convert_timeframes(
+            ohlcv_dataframe=ohlcv_dataframe, new_timeframes=new_timeframes
+        )
+
+    @traced("release.timeframe")
+    async def timeframe_release_async(
+        self,
+        history_client: AsyncHistoryOHLCV = None,
+        ohlcv_dataframe: pd.DataFrame = None,
+        new_timeframe: str = None,
+    ) -> pd.DataFrame:
+        """
+        Releases OHLCV DataFrame with a specified timeframe, the market data is fetched with asyncio.
+
+        Parameters:
+            - history_client (AsyncHistoryOHLCV): Asyncio exchange client (default: one per instance).
+            - ohlcv_dataframe (pd.DataFrame): OHLCV DataFrame.
+            - new_timeframe (str): New timeframe for the released DataFrame.
+
+        Returns:
+            - pd.DataFrame: Released OHLCV DataFrame with the specified timeframe.
+        """
+        self.logger.logger.info("timeframe_release_async (function)")
+
+        if ohlcv_dataframe is None:
+            ohlcv_dataframe = await self.dataframe_release_async(
+                history_client=history_client
+            )
+
+        return self._release_timeframe(
             ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
         )
 
-        self.file_name_tf = f"{self.symbol}-{new_timeframe}_tf"
 
-        return self.ohlcv_tf
+async def timeframe_release_all(
+    ohlcv_objects: list,
+    max_concurrency: int = 8,
+    history_client: AsyncHistoryOHLCV = None,
+    new_timeframe: str = None,
+) -> list:
+    """
+    Refreshes many GenerateOHLCV instances concurrently.
+
+    Parameters:
+        - ohlcv_objects (list): GenerateOHLCV instances (one per symbol/exchange).
+        - max_concurrency (int): Maximum number of market history requests in flight.
+        - history_client (AsyncHistoryOHLCV): Asyncio exchange client shared by all instances.
+        - new_timeframe (str): New timeframe for the released DataFrames (default: timeframe of each instance).
+
+    Returns:
+        - list: Released OHLCV DataFrames, in the order of ohlcv_objects.
+    """
+    if history_client is None:
+        history_client = AsyncHistoryOHLCV()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def release(ohlcv_object: GenerateOHLCV) -> pd.DataFrame:
+        async with semaphore:
+            return await ohlcv_object.timeframe_release_async(
+                history_client=history_client, new_timeframe=new_timeframe
+            )
+
+    return await asyncio.gather(*(release(obj) for obj in ohlcv_objects))
 
 
 if __name__ == "__main__":
@@ -364,7 +895,7 @@ if __name__ == "__main__":
         for i in range(x):
             print("Exchange:", exchange, "\n")
             print("Number of Cycle: ", i + 1)
-            print(ohlcv_object.timeframe_release())
+            print(present_dataframe(ohlcv_object.timeframe_release()))
 
             print("------------ end ------------\n")
             if i + 1 < x:
@@ -1,9 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import requests
+import sys
+import re
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import SessionPool, get_session_pool
+from ManageMetrics.LatencyTracerClass import traced
+from TF_Generator.DecoderOHLCV import OHLCVDecoder
 
 
 class ExchangeAPI:
     """
     A class for interacting with Exchange APIs to retrieve market history data.
+
+    Requests are sent through a SessionPool (keep-alive connections shared by all clients).
     """
 
     BASE_URL = {
@@ -22,27 +38,39 @@ class ExchangeAPI:
         "Coinbase": "/products",
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, session_pool: SessionPool = None, base_urls: dict = None):
+        """
+        Args:
+            session_pool (SessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
+            base_urls (dict, optional): Base URLs replacing the default ones (e.g. a local stand-in server).
+        """
+        self.session_pool = session_pool or get_session_pool()
+        if base_urls:
+            self.BASE_URL = {**self.BASE_URL, **base_urls}
 
-    def make_request(self, url: str, params: dict = None) -> dict:
+    def make_request(
+        self, url: str, params: dict = None, exchange: str = None, loads=None
+    ) -> dict:
         """
         Sends an HTTP GET request to the specified endpoint.
 
         Args:
             url (str): The URL of the API endpoint.
             params (dict, optional): Query parameters to include in the request. Defaults to None.
+            exchange (str, optional): The name of the exchange, used for its market data rate limit.
+            loads (callable, optional): Decoder of the response body (bytes), replaces response.json().
 
         Returns:
-            dict: The JSON response from the API.
+            dict: The JSON response from the API (or the result of `loads`).
 
         Raises:
             requests.exceptions.RequestException: If a network-related error occurs.
             requests.exceptions.HTTPError: If an HTTP error (4xx or 5xx) occurs.
         """
         try:
-            response = requests.get(url, params=params)
-            return response.json()
+            rate_key = None if exchange is None else (exchange, "market")
+            response = self.session_pool.get(url, params=params, rate_key=rate_key)
+            return response.json() if loads is None else loads(response.content)
         except requests.exceptions.RequestException as e:
             raise requests.exceptions.RequestException(f"(Request) error: {e}")
         except requests.exceptions.HTTPError as e:
@@ -52,27 +80,60 @@ class ExchangeAPI:
 class HistoryOHLCV(ExchangeAPI):
     """
     A class for retrieving market history data from Exchange APIs.
+
+    A time range longer than one request of the exchange allows (MAX_CANDLES_REQUEST)
+    is split into chunks, fetched concurrently (at most BACKFILL_WORKERS requests in flight
+    per exchange) and merged into one contiguous, deduplicated market history.
+
+    get_ohlcv_arrays decodes every response body straight into typed column arrays
+    (OHLCVDecoder), get_ohlcv_history returns the JSON of the exchange, get_ohlcv_ranges
+    fetches only some time ranges (the gaps of a stored history) with the fewest requests.
     """
 
-    def __init__(self):
-        super().__init__()
+    ### MAX_CANDLES_REQUEST (dict): Maximum number of candles returned by one request.
+    MAX_CANDLES_REQUEST = {
+        "Wallex": 1000,
+        "Nobitex": 500,
+        "BingX": 1440,
+        "Binance": 1000,
+        "Coinbase": 300,
+    }
 
-    def get_ohlcv_history(
+    ### BACKFILL_WORKERS (dict): Maximum number of chunk requests in flight per exchange.
+    BACKFILL_WORKERS = {
+        "Wallex": 2,
+        "Nobitex": 2,
+        "BingX": 4,
+        "Binance": 4,
+        "Coinbase": 3,
+    }
+
+    ### INTERVAL_UNIT_SECONDS (dict): Seconds of the interval units ("1m", "1h", "1D", ...).
+    INTERVAL_UNIT_SECONDS = {
+        "m": 60,
+        "h": 3600,
+        "H": 3600,
+        "d": 86400,
+        "D": 86400,
+        "w": 604800,
+        "W": 604800,
+        "M": 2592000,
+    }
+
+    ### decoder (OHLCVDecoder): Decoder of the responses of get_ohlcv_arrays (stateless, shared).
+    decoder = OHLCVDecoder()
+
+    def __init__(self, session_pool: SessionPool = None, base_urls: dict = None):
+        super().__init__(session_pool=session_pool, base_urls=base_urls)
+
+    def _build_request(
         self, exchange: str, symbol: str, interval: str, startTime: int, endTime: int
-    ):
+    ) -> tuple:
         """
-        Retrieves market history data for a specific symbol and time range from the specified exchange API.
-        Exchange: "Wallex", "Nobitex", "Binance", "Coinbase", "BingX"
-
-        Args:
-            exchange (str): The name of the exchange from which to retrieve data.
-            symbol (str): The symbol for which to retrieve market history data.
-            interval (str): The time interval for data, specified in minutes for most exchanges.
-            startTime (int): The start time for data retrieval (Unix timestamp in seconds).
-            endTime (int): The end time for data retrieval (Unix timestamp in seconds).
+        Builds the URL and query parameters of a market history request.
 
         Returns:
-            dict: A dictionary containing market history data.
+            tuple: (url, params)
         """
         api_url = self.BASE_URL.get(exchange)
         api_path = self.PATH_URL.get(exchange)
@@ -98,15 +159,15 @@ class HistoryOHLCV(ExchangeAPI):
                     "symbol": symbol,
                     "interval": interval,
                     "limit": "1000",
-                    # "startTime": startTime * 1000,
-                    # "endTime": endTime * 1000,
+                    "startTime": startTime * 1000,
+                    "endTime": endTime * 1000,
                 }
             case "Coinbase":
                 url = url + f"/{symbol}/candles"
                 params = {
                     "granularity": interval,
-                    "startTime": startTime * 1,
-                    "endTime": endTime * 1,
+                    "start": startTime * 1,
+                    "end": endTime * 1,
                 }
             case "BingX":
                 params = {
@@ -117,12 +178,257 @@ class HistoryOHLCV(ExchangeAPI):
                     "endTime": endTime * 1000,
                 }
 
-        ### Send request to the exchange API and return the market history data
-        ohlcv_history = self.make_request(url, params=params)
+        return url, params
+
+    def _interval_seconds(self, exchange: str, interval: str) -> int:
+        """
+        Gets the length of one candle in seconds.
+
+        Args:
+            exchange (str): The name of the exchange.
+            interval (str): The time interval in the format of the exchange ("1", "60", "1D", "1m", "3600", ...).
+
+        Returns:
+            int: Seconds of one candle.
+        """
+        match = re.fullmatch(r"(\d+)([a-zA-Z]?)", str(interval))
+        if not match:
+            raise ValueError(f"Interval '{interval}' not supported")
+
+        value, unit = int(match.group(1)), match.group(2)
+        if unit:
+            return value * self.INTERVAL_UNIT_SECONDS[unit]
+        if exchange == "Coinbase":
+            return value
+        ### Wallex and Nobitex (resolution in minutes)
+        return value * 60
+
+    def _plan_chunks(
+        self, exchange: str, interval: str, startTime: int, endTime: int
+    ) -> list:
+        """
+        Splits a time range into chunks that fit in one request of the exchange.
+
+        Returns:
+            list: (startTime, endTime) of every chunk, both inclusive.
+        """
+        step = self._interval_seconds(exchange=exchange, interval=interval)
+        chunk_seconds = self.MAX_CANDLES_REQUEST.get(exchange, 1000) * step
+
+        chunks = []
+        chunk_start = startTime
+        while chunk_start <= endTime:
+            chunk_end = min(chunk_start + chunk_seconds - step, endTime)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start += chunk_seconds
+        return chunks or [(startTime, endTime)]
+
+    def _plan_range_chunks(self, exchange: str, interval: str, ranges: list) -> list:
+        """
+        Covers several time ranges (e.g. the gaps of a stored history) with the fewest
+        requests: a request covers every range starting in the `MAX_CANDLES_REQUEST` candles
+        after its start, the stored candles between two ranges are fetched again and replaced.
+
+        Args:
+            exchange (str): The name of the exchange.
+            interval (str): The time interval in the format of the exchange.
+            ranges (list): (startTime, endTime) of every range, both inclusive.
+
+        Returns:
+            list: (startTime, endTime) of every chunk, both inclusive.
+        """
+        step = self._interval_seconds(exchange=exchange, interval=interval)
+        chunk_seconds = self.MAX_CANDLES_REQUEST.get(exchange, 1000) * step
+
+        chunks = []
+        for range_start, range_end in sorted(ranges):
+            while range_start <= range_end:
+                if chunks and range_start < chunks[-1][0] + chunk_seconds:
+                    ### The range starts in the last request, which is extended
+                    chunk_start, last_end = chunks.pop()
+                else:
+                    chunk_start, last_end = range_start, range_start
+                chunk_end = max(min(chunk_start + chunk_seconds - step, range_end), last_end)
+                chunks.append((chunk_start, chunk_end))
+                range_start = chunk_end + step
+        return chunks
+
+    def _merge_payloads(self, exchange: str, payloads: list):
+        """
+        Merges the market history of several chunks, drops duplicate candles and sorts them by time.
+
+        Args:
+            exchange (str): The name of the exchange.
+            payloads (list): JSON responses of the chunks.
+
+        Returns:
+            dict | list: Market history in the format of the exchange.
+        """
+        payloads = [payload for payload in payloads if payload]
+
+        match exchange:
+            case "Wallex" | "Nobitex":
+                columns = ["t", "o", "h", "l", "c", "v"]
+                rows = {}
+                for payload in payloads:
+                    if "t" not in payload:
+                        continue
+                    for row in zip(*(payload[column] for column in columns)):
+                        rows[row[0]] = row
+                if not rows:
+                    return payloads[0] if payloads else None
+                ordered_rows = [rows[key] for key in sorted(rows)]
+                merged = {"s": "ok"}
+                for i, column in enumerate(columns):
+                    merged[column] = [row[i] for row in ordered_rows]
+                return merged
+            case "BingX":
+                rows = {}
+                for payload in payloads:
+                    for row in payload.get("data") or []:
+                        rows[row["time"]] = row
+                if not payloads:
+                    return None
+                merged = dict(payloads[0])
+                merged["data"] = [rows[key] for key in sorted(rows)]
+                return merged
+            case _:
+                ### Binance and Coinbase (list of candles, time in the first field)
+                rows = {}
+                for payload in payloads:
+                    for row in payload:
+                        rows[row[0]] = row
+                return [rows[key] for key in sorted(rows)]
+
+    def _fetch_chunks(
+        self,
+        exchange: str,
+        symbol: str,
+        interval: str,
+        startTime: int,
+        endTime: int,
+        loads=None,
+        ranges: list = None,
+    ) -> list:
+        """
+        Fetches the chunks of a time range (or of several `ranges`), concurrently if there are several.
+
+        Returns:
+            list: Responses of the chunks (decoded by `loads` if given).
+        """
+        if ranges is None:
+            chunks = self._plan_chunks(
+                exchange=exchange, interval=interval, startTime=startTime, endTime=endTime
+            )
+        else:
+            chunks = self._plan_range_chunks(
+                exchange=exchange, interval=interval, ranges=ranges
+            )
+        if not chunks:
+            return []
+
+        def fetch_chunk(chunk: tuple):
+            url, params = self._build_request(
+                exchange=exchange,
+                symbol=symbol,
+                interval=interval,
+                startTime=chunk[0],
+                endTime=chunk[1],
+            )
+            ### Send request to the exchange API and return the market history data
+            return self.make_request(url, params=params, exchange=exchange, loads=loads)
+
+        if len(chunks) == 1:
+            return [fetch_chunk(chunks[0])]
+        max_workers = min(self.BACKFILL_WORKERS.get(exchange, 1), len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch_chunk, chunks))
+
+    @traced("fetch.history")
+    def get_ohlcv_history(
+        self, exchange: str, symbol: str, interval: str, startTime: int, endTime: int
+    ):
+        """
+        Retrieves market history data for a specific symbol and time range from the specified exchange API.
+        Exchange: "Wallex", "Nobitex", "Binance", "Coinbase", "BingX"
+
+        Args:
+            exchange (str): The name of the exchange from which to retrieve data.
+            symbol (str): The symbol for which to retrieve market history data.
+            interval (str): The time interval for data, specified in minutes for most exchanges.
+            startTime (int): The start time for data retrieval (Unix timestamp in seconds).
+            endTime (int): The end time for data retrieval (Unix timestamp in seconds).
+
+        Returns:
+            dict: A dictionary containing market history data.
+        """
+        payloads = self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=startTime,
+            endTime=endTime,
+        )
+        if len(payloads) == 1:
+            ohlcv_history = payloads[0]
+        else:
+            ohlcv_history = self._merge_payloads(exchange=exchange, payloads=payloads)
+
         if bool(ohlcv_history):
             return ohlcv_history
         print("Error to fetch market history!, please check input values.")
 
+    @traced("fetch.history")
+    def get_ohlcv_arrays(
+        self, exchange: str, symbol: str, interval: str, startTime: int, endTime: int
+    ) -> dict:
+        """
+        Retrieves market history data like get_ohlcv_history, every response body is decoded
+        straight into typed column arrays (see OHLCVDecoder).
+
+        Returns:
+            dict: {column: float64 array} of the CANDLE_COLUMNS, None if no candle was returned.
+        """
+        chunks = self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=startTime,
+            endTime=endTime,
+            loads=functools.partial(self.decoder.decode, exchange),
+        )
+        ohlcv_arrays = self.decoder.merge(chunks)
+
+        if self.decoder.num_candles(ohlcv_arrays):
+            return ohlcv_arrays
+        print("Error to fetch market history!, please check input values.")
+
+    @traced("fetch.ranges")
+    def get_ohlcv_ranges(
+        self, exchange: str, symbol: str, interval: str, ranges: list
+    ) -> dict:
+        """
+        Retrieves the market history of several time ranges (e.g. the gaps of a stored history)
+        like get_ohlcv_arrays. The ranges are packed into the fewest requests, fetched concurrently
+        and merged into one set of column arrays.
+
+        Args:
+            ranges (list): (startTime, endTime) of every range in seconds, both inclusive.
+
+        Returns:
+            dict: {column: float64 array} of the CANDLE_COLUMNS (no candle if the exchange has none).
+        """
+        chunks = self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=None,
+            endTime=None,
+            loads=functools.partial(self.decoder.decode, exchange),
+            ranges=ranges,
+        )
+        return self.decoder.merge(chunks)
+
 
 if __name__ == "__main__":
     import pandas as pd
@@ -0,0 +1,212 @@
+import functools
+import asyncio
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import (
+    AsyncSessionPool,
+    get_async_session_pool,
+    aiohttp,
+)
+from TF_Generator.HistoryFetch import HistoryOHLCV
+from ManageMetrics.LatencyTracerClass import traced
+
+
+class AsyncHistoryOHLCV(HistoryOHLCV):
+    """
+    The asyncio version of HistoryOHLCV, with the same methods as coroutines.
+
+    All instances created without a session_pool share one AsyncSessionPool,
+    so concurrent fetches of many symbols reuse the same keep-alive connections.
+    """
+
+    def __init__(self, session_pool: AsyncSessionPool = None, base_urls: dict = None):
+        """
+        Args:
+            session_pool (AsyncSessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
+            base_urls (dict, optional): Base URLs replacing the default ones (e.g. a local stand-in server).
+        """
+        self.session_pool = session_pool or get_async_session_pool()
+        if base_urls:
+            self.BASE_URL = {**self.BASE_URL, **base_urls}
+
+    async def make_request(
+        self, url: str, params: dict = None, exchange: str = None, loads=None
+    ) -> dict:
+        """
+        Sends an HTTP GET request to the specified endpoint.
+
+        Args:
+            url (str): The URL of the API endpoint.
+            params (dict, optional): Query parameters to include in the request. Defaults to None.
+            exchange (str, optional): The name of the exchange, used for its market data rate limit.
+            loads (callable, optional): Decoder of the response body (bytes), replaces the JSON decoding.
+
+        Returns:
+            dict: The JSON response from the API (or the result of `loads`).
+
+        Raises:
+            aiohttp.ClientError: If a network-related or HTTP error occurs.
+        """
+        try:
+            rate_key = None if exchange is None else (exchange, "market")
+            return await self.session_pool.get_json(
+                url, params=params, rate_key=rate_key, loads=loads
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise aiohttp.ClientError(f"(Request) error: {e}")
+
+    async def _fetch_chunks(
+        self,
+        exchange: str,
+        symbol: str,
+        interval: str,
+        startTime: int,
+        endTime: int,
+        loads=None,
+        ranges: list = None,
+    ) -> list:
+        """
+        Fetches the chunks of a time range (or of several `ranges`), concurrently if there are several.
+
+        Returns:
+            list: Responses of the chunks (decoded by `loads` if given).
+        """
+        if ranges is None:
+            chunks = self._plan_chunks(
+                exchange=exchange, interval=interval, startTime=startTime, endTime=endTime
+            )
+        else:
+            chunks = self._plan_range_chunks(
+                exchange=exchange, interval=interval, ranges=ranges
+            )
+        if not chunks:
+            return []
+        semaphore = asyncio.Semaphore(self.BACKFILL_WORKERS.get(exchange, 1))
+
+        async def fetch_chunk(chunk: tuple):
+            url, params = self._build_request(
+                exchange=exchange,
+                symbol=symbol,
+                interval=interval,
+                startTime=chunk[0],
+                endTime=chunk[1],
+            )
+            ### Send request to the exchange API and return the market history data
+            async with semaphore:
+                return await self.make_request(
+                    url, params=params, exchange=exchange, loads=loads
+                )
+
+        if len(chunks) == 1:
+            return [await fetch_chunk(chunks[0])]
+        return await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+
+    @traced("fetch.history")
+    async def get_ohlcv_history(
+        self, exchange: str, symbol: str, interval: str, startTime: int, endTime: int
+    ):
+        """
+        Retrieves market history data for a specific symbol and time range from the specified exchange API.
+        Exchange: "Wallex", "Nobitex", "Binance", "Coinbase", "BingX"
+
+        Returns:
+            dict: A dictionary containing market history data.
+        """
+        payloads = await self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=startTime,
+            endTime=endTime,
+        )
+        if len(payloads) == 1:
+            ohlcv_history = payloads[0]
+        else:
+            ohlcv_history = self._merge_payloads(exchange=exchange, payloads=payloads)
+
+        if bool(ohlcv_history):
+            return ohlcv_history
+        print("Error to fetch market history!, please check input values.")
+
+    @traced("fetch.history")
+    async def get_ohlcv_arrays(
+        self, exchange: str, symbol: str, interval: str, startTime: int, endTime: int
+    ) -> dict:
+        """
+        Retrieves market history data like get_ohlcv_history, every response body is decoded
+        straight into typed column arrays (see OHLCVDecoder).
+
+        Returns:
+            dict: {column: float64 array} of the CANDLE_COLUMNS, None if no candle was returned.
+        """
+        chunks = await self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=startTime,
+            endTime=endTime,
+            loads=functools.partial(self.decoder.decode, exchange),
+        )
+        ohlcv_arrays = self.decoder.merge(chunks)
+
+        if self.decoder.num_candles(ohlcv_arrays):
+            return ohlcv_arrays
+        print("Error to fetch market history!, please check input values.")
+
+    @traced("fetch.ranges")
+    async def get_ohlcv_ranges(
+        self, exchange: str, symbol: str, interval: str, ranges: list
+    ) -> dict:
+        """
+        Retrieves the market history of several time ranges like HistoryOHLCV.get_ohlcv_ranges.
+
+        Returns:
+            dict: {column: float64 array} of the CANDLE_COLUMNS (no candle if the exchange has none).
+        """
+        chunks = await self._fetch_chunks(
+            exchange=exchange,
+            symbol=symbol,
+            interval=interval,
+            startTime=None,
+            endTime=None,
+            loads=functools.partial(self.decoder.decode, exchange),
+            ranges=ranges,
+        )
+        return self.decoder.merge(chunks)
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    import time
+
+    async def main():
+        api = AsyncHistoryOHLCV()
+        time_now = int(time.time())
+        time_now = time_now - (time_now % 60)
+
+        symbols = ["BTCUSDT", "ETHUSDT", "SHIBUSDT"]
+        results = await asyncio.gather(
+            *(
+                api.get_ohlcv_history(
+                    exchange="Binance",
+                    symbol=symbol,
+                    interval="1m",
+                    startTime=time_now - 60 * 60,
+                    endTime=time_now,
+                )
+                for symbol in symbols
+            )
+        )
+        for symbol, market_history in zip(symbols, results):
+            print("Market History Result: (", symbol, ")")
+            print(pd.DataFrame(market_history))
+        print("Counters:", api.session_pool.get_counters())
+        await api.session_pool.close()
+
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.TimeIndex import epoch_index
+
+### CANDLE_COLUMNS (tuple): Columns of the candle store (same order as the OHLCV DataFrame).
+CANDLE_COLUMNS = ("TimeStamp", "Open", "High", "Low", "Close", "Volume")
+
+
+class CandleStore:
+    """
+    Fixed-capacity candle store backed by preallocated NumPy arrays.
+
+    The candles live in one float64 block (one contiguous row per column) and an int64 array of
+    epoch-second timestamps (the time index), both `2 * capacity` long. New candles are written after the last one,
+    and only when the end of the arrays is reached the last `capacity` candles are moved back to
+    the start, so an append costs O(k) for k new candles (amortized) and the window is always a
+    contiguous slice: the NumPy views and the DataFrame view do not copy the candles.
+
+    Memory per store is fixed: `2 * capacity * (len(CANDLE_COLUMNS) + 1) * 8` bytes.
+
+    The candles are given as a DataFrame or as a dict of column arrays (see OHLCVDecoder),
+    the arrays are copied once into the store.
+
+    Methods:
+        - __init__(capacity: int): Preallocates the arrays.
+        - load(ohlcv_dataframe: pd.DataFrame | dict): Replaces the content with the last candles of a DataFrame.
+        - append(ohlcv_dataframe: pd.DataFrame | dict) -> int: Adds new candles (older ones fill the gaps), a candle with an existing TimeStamp replaces it.
+        - column(name: str) -> np.ndarray: Zero-copy view of one column.
+        - index_seconds() -> np.ndarray: Zero-copy view of the epoch-second timestamps.
+        - to_dataframe() -> pd.DataFrame: DataFrame view of the window, epoch-second index (built once per change).
+        - __len__() -> int: Number of stored candles.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize CandleStore class.
+
+        Parameters:
+            capacity (int): Maximum number of candles kept (the oldest are dropped).
+        """
+        self.capacity = int(capacity)
+        self.values = np.full((len(CANDLE_COLUMNS), 2 * self.capacity), np.nan)
+        self.time_s = np.zeros(2 * self.capacity, dtype=np.int64)
+        self.start = 0
+        self.end = 0
+        self.version = 0
+        self._dataframe = None
+        self._dataframe_version = -1
+        self.nbytes = self.values.nbytes + self.time_s.nbytes
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    # ------- Functions: Input -------
+    def _frame_arrays(self, ohlcv_dataframe: pd.DataFrame | dict) -> tuple:
+        """
+        Returns (time_s, values) of a DataFrame, sorted by TimeStamp and without duplicates (last kept).
+        """
+        values = np.vstack(
+            [np.asarray(ohlcv_dataframe[column], dtype=np.float64) for column in CANDLE_COLUMNS]
+        )
+        time_s = np.rint(values[0]).astype(np.int64)
+        if (time_s[1:] > time_s[:-1]).all():
+            return time_s, values
+        order = np.argsort(time_s, kind="stable")
+        time_s, values = time_s[order], values[:, order]
+        last_of_run = np.r_[time_s[1:] != time_s[:-1], True]
+        return time_s[last_of_run], values[:, last_of_run]
+
+    def _write(self, time_s: np.ndarray, values: np.ndarray):
+        """
+        Writes candles newer than the last stored one after it, moving the window back if needed.
+        """
+        count = len(time_s)
+        if count >= self.capacity:
+            time_s, values = time_s[-self.capacity :], values[:, -self.capacity :]
+            self.start, self.end = 0, 0
+            count = self.capacity
+        elif self.end + count > len(self.time_s):
+            keep = min(len(self), self.capacity - count)
+            self.values[:, :keep] = self.values[:, self.end - keep : self.end]
+            self.time_s[:keep] = self.time_s[self.end - keep : self.end]
+            self.start, self.end = 0, keep
+
+        self.values[:, self.end : self.end + count] = values
+        self.time_s[self.end : self.end + count] = time_s
+        self.end += count
+        self.start = max(self.start, self.end - self.capacity)
+
+    def load(self, ohlcv_dataframe: pd.DataFrame | dict):
+        """
+        Replaces the content with the last `capacity` candles of a DataFrame.
+        """
+        time_s, values = self._frame_arrays(ohlcv_dataframe)
+        self.start, self.end = 0, 0
+        self._write(time_s, values)
+        self.version += 1
+
+    def append(self, ohlcv_dataframe: pd.DataFrame | dict) -> int:
+        """
+        Adds new candles. A candle with a TimeStamp already stored replaces the stored one
+        (the open candle that was fetched again), like drop_duplicates(keep="last").
+
+        Parameters:
+            ohlcv_dataframe (pd.DataFrame | dict): New candles with the CANDLE_COLUMNS.
+
+        Returns:
+            int: Number of candles added after the last stored candle.
+        """
+        if ohlcv_dataframe is None or "TimeStamp" not in ohlcv_dataframe:
+            return 0
+        if len(ohlcv_dataframe["TimeStamp"]) == 0:
+            return 0
+        time_s, values = self._frame_arrays(ohlcv_dataframe)
+
+        window_s = self.time_s[self.start : self.end]
+        last_s = window_s[-1] if len(window_s) else np.iinfo(np.int64).min
+        newer = time_s > last_s
+
+        if not newer.all():
+            ### Older candles: replace the stored ones, a candle missing in the window needs a merge
+            old_s, old_values = time_s[~newer], values[:, ~newer]
+            positions = np.searchsorted(window_s, old_s)
+            found = positions < len(window_s)
+            found[found] = window_s[positions[found]] == old_s[found]
+            if not found.all():
+                ### Stitched into the window (gap fill), the new candles replace the stored ones
+                merged = np.hstack([self.values[:, self.start : self.end], values])
+                self.load(dict(zip(CANDLE_COLUMNS, merged)))
+                return int(newer.sum())
+            self.values[:, self.start + positions] = old_values
+
+        self._write(time_s[newer], values[:, newer])
+        self.version += 1
+        return int(newer.sum())
+
+    # ------- Functions: Output -------
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy view of one column of the window (valid until the next append).
+        """
+        return self.values[CANDLE_COLUMNS.index(name), self.start : self.end]
+
+    def index_seconds(self) -> np.ndarray:
+        """
+        Zero-copy view of the epoch-second (UTC) timestamps of the window.
+        """
+        return self.time_s[self.start : self.end]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame view of the window, built once per change. The columns and the epoch-second
+        index share the memory of the store, so the DataFrame is only valid until the next
+        append or load.
+        """
+        if self._dataframe_version != self.version:
+            index = epoch_index(self.index_seconds())
+            self._dataframe = pd.DataFrame(
+                self.values[:, self.start : self.end].T,
+                index=index,
+                columns=list(CANDLE_COLUMNS),
+                copy=False,
+            )
+            self._dataframe_version = self.version
+        return self._dataframe
+
+
+if __name__ == "__main__":
+    # Comparison with the pd.concat path of DataFrameOrg._concatenate_dataframe
+    import time
+
+    capacity, num_updates = 50000, 500
+    rng = np.random.default_rng(5)
+    start_ts = 1_700_000_000
+
+    def candles(first: int, count: int) -> pd.DataFrame:
+        time_stamps = np.arange(first, first + count * 60, 60).astype(float)
+        frame = pd.DataFrame(
+            {"TimeStamp": time_stamps}
+            | {column: rng.random(count) for column in CANDLE_COLUMNS[1:]}
+        )
+        frame.index = epoch_index(frame["TimeStamp"])
+        return frame
+
+    base = candles(start_ts, capacity)
+    store = CandleStore(capacity=capacity)
+    store.load(base)
+    frame = base
+
+    concat_time, store_time = 0.0, 0.0
+    for update in range(num_updates):
+        ### Every minute: the open candle again and one new candle
+        new = candles(start_ts + (capacity + update - 1) * 60, 2)
+
+        begin = time.perf_counter()
+        frame = pd.concat([frame, new])
+        frame.drop_duplicates(subset=["TimeStamp"], keep="last", inplace=True)
+        frame = frame.iloc[-capacity:].sort_index()
+        concat_time += time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        store.append(new)
+        view = store.to_dataframe()
+        store_time += time.perf_counter() - begin
+
+    pd.testing.assert_frame_equal(view, frame, check_exact=True, check_freq=False)
+    print(f"pd.concat  : {concat_time / num_updates * 1e3:.2f} ms / update")
+    print(f"CandleStore: {store_time / num_updates * 1e3:.2f} ms / update")
+    print(f"memory     : {store.nbytes / 1e6:.1f} MB for {capacity} candles")
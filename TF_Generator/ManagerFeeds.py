@@ -0,0 +1,277 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.GenerateTimeFrame import GenerateOHLCV, timeframe_release_all
+from TF_Generator.ManagerInputs import InputsManager
+from TF_Generator.ManagerLogger import LoggerManager
+from TF_Generator.HistoryFetch import HistoryOHLCV
+from TF_Generator.HistoryFetchAsync import AsyncHistoryOHLCV
+from TF_Generator.ManagerTime import TimeManager
+from TF_Generator.ManagerFile import FileManager, DEFAULT_FILE_FORMAT
+from ManageSession.SessionPoolClass import aiohttp
+
+APP_DIRECTORY = app_directory
+### CANDLE_CLOSE_DELAY (float): Seconds waited after a candle boundary before the refresh (exchange lag).
+CANDLE_CLOSE_DELAY = 2.0
+
+
+class FeedManager:
+    """
+    Class for managing many GenerateOHLCV feeds (symbols / exchanges / timeframes) together.
+
+    The stateless helpers are created once and shared: one LoggerManager and one history client
+    for all feeds, one FileManager per exchange, and one InputsManager and TimeManager per
+    (exchange, timeframe, num_candles). Only the state of a feed (its candles, journal and
+    resampled bars) is created per symbol. All feeds are refreshed together at every candle
+    boundary, with asyncio when `aiohttp` is installed and a thread pool otherwise.
+
+    Methods:
+        - __init__(num_candles: int, data_directory: str, file_format: str, enable_journal: bool, max_concurrency: int): Initializes the FeedManager.
+        - add_feed(symbol: str, exchange: str, timeframe: str, num_candles: int = None) -> GenerateOHLCV: Adds a feed.
+        - refresh(keys: list = None) -> dict: Refreshes the feeds, returns {(exchange, symbol, timeframe): DataFrame}.
+        - refresh_async(keys: list = None) -> dict: refresh, in the running event loop.
+        - get_frame(symbol: str, exchange: str, timeframe: str) -> pd.DataFrame: Last released DataFrame of a feed.
+        - seconds_to_boundary(seconds_time_unit: int = 60) -> float: Seconds until the next candle boundary.
+        - run(callback, cycles: int = None): Refreshes all feeds at every candle boundary and calls callback(frames).
+        - close(): Saves the files of all feeds.
+        - close_async(): close, in the running event loop.
+
+    Example:
+        with FeedManager(num_candles=400) as feed_manager:
+            for symbol in ["BTCUSDT", "ETHUSDT"]:
+                feed_manager.add_feed(symbol=symbol, exchange="Binance", timeframe="5min")
+            feed_manager.run(callback=lambda frames: print(len(frames)))
+    """
+
+    def __init__(
+        self,
+        num_candles: int,
+        data_directory: str = APP_DIRECTORY,
+        file_format: str = DEFAULT_FILE_FORMAT,
+        enable_journal: bool = True,
+        max_concurrency: int = 8,
+    ):
+        """
+        Initialize FeedManager class.
+
+        Parameters:
+            num_candles (int): Default number of candles of a feed.
+            data_directory (str): Directory path to store the OHLCV DataFrame files.
+            file_format (str): Storage format of the OHLCV DataFrame files.
+            enable_journal (bool): Flag to persist new candles in an append-only journal.
+            max_concurrency (int): Maximum number of market history requests in flight.
+        """
+        self.num_candles = num_candles
+        self.data_directory = data_directory
+        self.file_format = file_format
+        self.enable_journal = enable_journal
+        self.max_concurrency = max_concurrency
+
+        self.logger = LoggerManager(log_file_name="FeedManager.log")
+        self.logger.logger.warning(f"--- Start : Class {self.__class__.__name__} ---")
+
+        self.feeds = {}
+        self.frames = {}
+        self.file_managers = {}
+        self.time_helpers = {}
+        self.history_client = HistoryOHLCV()
+        self.async_history_client = None
+        self.loop = None
+        if aiohttp is not None:
+            self.async_history_client = AsyncHistoryOHLCV()
+            ### One event loop for all refreshes, so the aiohttp connections stay alive
+            self.loop = asyncio.new_event_loop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # ------- Functions: Shared instances -------
+    def _shared_instances(self, exchange: str, timeframe: str, num_candles: int) -> dict:
+        """
+        Returns the helper instances shared by the feeds of the same exchange/timeframe.
+        """
+        if exchange not in self.file_managers:
+            self.file_managers[exchange] = FileManager(
+                data_directory=os.path.join(self.data_directory, exchange),
+                logger=self.logger,
+                file_format=self.file_format,
+            )
+
+        key = (exchange, timeframe, num_candles)
+        if key not in self.time_helpers:
+            self.time_helpers[key] = {
+                "inputs_manager": InputsManager(
+                    timeframe=timeframe,
+                    exchange=exchange,
+                    num_candles=num_candles,
+                    logger=self.logger,
+                ),
+                "time_manager": TimeManager(
+                    timeframe=timeframe,
+                    exchange=exchange,
+                    num_candles=num_candles,
+                    logger=self.logger,
+                ),
+            }
+
+        return {
+            "logger": self.logger,
+            "file_manager": self.file_managers[exchange],
+            "history_client": self.history_client,
+            "async_history_client": self.async_history_client,
+            **self.time_helpers[key],
+        }
+
+    # -------------------------------
+    def add_feed(
+        self, symbol: str, exchange: str, timeframe: str, num_candles: int = None
+    ) -> GenerateOHLCV:
+        """
+        Adds a feed (the stored candles and journal of the symbol are read).
+
+        Returns:
+            GenerateOHLCV: The feed instance.
+        """
+        key = (exchange, symbol, timeframe)
+        if key not in self.feeds:
+            num_candles = num_candles or self.num_candles
+            self.feeds[key] = GenerateOHLCV(
+                symbol=symbol,
+                timeframe=timeframe,
+                exchange=exchange,
+                num_candles=num_candles,
+                data_directory=self.data_directory,
+                file_format=self.file_format,
+                enable_journal=self.enable_journal,
+                shared_instances=self._shared_instances(
+                    exchange=exchange, timeframe=timeframe, num_candles=num_candles
+                ),
+            )
+        return self.feeds[key]
+
+    def _refresh_threads(self, keys: list) -> list:
+        feeds = [self.feeds[key] for key in keys]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(lambda feed: feed.timeframe_release(), feeds))
+
+    async def refresh_async(self, keys: list = None) -> dict:
+        """
+        Refreshes the feeds together, in the running event loop.
+
+        Parameters:
+            keys (list): (exchange, symbol, timeframe) of the feeds to refresh (all feeds if None).
+
+        Returns:
+            dict: {(exchange, symbol, timeframe): released OHLCV DataFrame}
+        """
+        keys = list(self.feeds) if keys is None else list(keys)
+
+        if self.async_history_client is not None:
+            frames = await timeframe_release_all(
+                [self.feeds[key] for key in keys],
+                max_concurrency=self.max_concurrency,
+                history_client=self.async_history_client,
+            )
+        else:
+            frames = await asyncio.to_thread(self._refresh_threads, keys)
+
+        frames = dict(zip(keys, frames))
+        self.frames.update(frames)
+        return frames
+
+    def refresh(self, keys: list = None) -> dict:
+        """
+        Refreshes the feeds together.
+
+        Parameters:
+            keys (list): (exchange, symbol, timeframe) of the feeds to refresh (all feeds if None).
+
+        Returns:
+            dict: {(exchange, symbol, timeframe): released OHLCV DataFrame}
+        """
+        if self.loop is not None:
+            return self.loop.run_until_complete(self.refresh_async(keys=keys))
+
+        keys = list(self.feeds) if keys is None else list(keys)
+        frames = dict(zip(keys, self._refresh_threads(keys)))
+        self.frames.update(frames)
+        return frames
+
+    def get_frame(self, symbol: str, exchange: str, timeframe: str):
+        """
+        Returns the last released DataFrame of a feed (None before the first refresh).
+        """
+        return self.frames.get((exchange, symbol, timeframe))
+
+    def seconds_to_boundary(self, seconds_time_unit: int = 60) -> float:
+        """
+        Seconds until the next candle boundary (plus CANDLE_CLOSE_DELAY).
+        """
+        time_now = time.time()
+        return seconds_time_unit - (time_now % seconds_time_unit) + CANDLE_CLOSE_DELAY
+
+    def run(self, callback, cycles: int = None, seconds_time_unit: int = 60):
+        """
+        Refreshes all feeds at every candle boundary and calls callback(frames).
+
+        Parameters:
+            callback: Function called with the dict of released DataFrames.
+            cycles (int): Number of refreshes (forever if None).
+            seconds_time_unit (int): Seconds of the base candle.
+        """
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            callback(self.refresh())
+            cycle += 1
+            if cycles is None or cycle < cycles:
+                time.sleep(self.seconds_to_boundary(seconds_time_unit))
+
+    async def close_async(self):
+        """
+        Saves the files of all feeds and closes the connections, in the running event loop.
+        """
+        for feed in self.feeds.values():
+            await asyncio.to_thread(feed.__exit__, None, None, None)
+        if self.async_history_client is not None:
+            await self.async_history_client.session_pool.close()
+        if self.loop is not None and not self.loop.is_running():
+            ### The own loop of refresh() is not needed when the feeds run in another loop
+            self.loop.close()
+
+    def close(self):
+        """
+        Saves the files of all feeds.
+        """
+        if self.loop is None:
+            for feed in self.feeds.values():
+                feed.__exit__(None, None, None)
+        elif not self.loop.is_closed():
+            self.loop.run_until_complete(self.close_async())
+            self.loop.close()
+
+
+if __name__ == "__main__":
+    # Example usage of the FeedManager class
+    symbols = ["BTCUSDT", "ETHUSDT", "BNBUSDT"]
+
+    start = time.perf_counter()
+    with FeedManager(num_candles=400) as feed_manager:
+        for symbol in symbols:
+            feed_manager.add_feed(symbol=symbol, exchange="Binance", timeframe="5min")
+        print(f"setup: {time.perf_counter() - start:.2f} s")
+
+        feed_manager.run(
+            callback=lambda frames: print({key[1]: len(df) for key, df in frames.items()}),
+            cycles=2,
+        )
@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+import glob
 import sys
 import os
 
@@ -10,30 +12,68 @@ app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
 
 sys.path.append(app_directory)
 from TF_Generator.OrganizerDataFrame import DataFrameOrg
+from TF_Generator.TimeIndex import (
+    DEFAULT_TIMEZONE,
+    epoch_index,
+    epoch_seconds,
+    present_dataframe,
+)
+
+
+### FILE_EXTENSIONS (dict): Mapping of storage formats to file extensions.
+FILE_EXTENSIONS = {"csv": "csv", "npy": "npz", "feather": "feather"}
+### DEFAULT_FILE_FORMAT (str): Storage format used when none is given.
+DEFAULT_FILE_FORMAT = "npy"
 
 
 class FileManager:
     """
     Class for managing OHLCV (Open, High, Low, Close, Volume) DataFrame files, including saving and reading.
 
+    Storage formats:
+        - "csv": Text file, the index is exported as local dates (DEFAULT_TIMEZONE) and parsed again on every read.
+        - "npy": Uncompressed NumPy column file (.npz), index stored as int64 epoch seconds.
+        - "feather": Arrow/Feather file, requires the optional package `pyarrow`.
+
+    The read DataFrames are indexed by epoch seconds (see TF_Generator.TimeIndex), files written
+    with a DatetimeIndex by older versions are converted when they are read.
+
     Methods:
-        - __init__(data_directory: str, logger=None): Initializes the FileManager instance.
+        - __init__(data_directory: str, logger=None, file_format: str = DEFAULT_FILE_FORMAT): Initializes the FileManager instance.
         - _setup_file_manager(): Sets up the FileManager by initializing necessary instances.
-        - _save_df_ohlcv(file_name: str, ohlcv_dataframe: pd.DataFrame) -> None: Saves the OHLCV DataFrame to a CSV file.
-        - _read_df_ohlcv(file_name: str) -> pd.DataFrame | None: Reads the existing OHLCV DataFrame from a CSV file.
+        - _file_path(file_name: str, file_format: str = None) -> str: Builds the file path for a storage format.
+        - _save_df_ohlcv(file_name: str, ohlcv_dataframe: pd.DataFrame) -> None: Saves the OHLCV DataFrame in the storage format.
+        - _read_df_ohlcv(file_name: str) -> pd.DataFrame | None: Reads the existing OHLCV DataFrame (falls back to a legacy CSV file).
+        - migrate_csv_files(delete_csv: bool = False) -> list: Converts every CSV file of the data directory to the storage format.
         - __del__(): Destructor, performs cleanup tasks when the instance is deleted.
     """
 
-    def __init__(self, data_directory: str, logger=None):
+    SAVE_FUNCTIONS = {
+        "csv": "_save_csv",
+        "npy": "_save_npy",
+        "feather": "_save_feather",
+    }
+
+    READ_FUNCTIONS = {
+        "csv": "_read_csv",
+        "npy": "_read_npy",
+        "feather": "_read_feather",
+    }
+
+    def __init__(
+        self, data_directory: str, logger=None, file_format: str = DEFAULT_FILE_FORMAT
+    ):
         """
         Initialize FileManager class.
 
         Parameters:
             data_directory (str): The directory path where OHLCV DataFrame files will be stored.
             logger: Optional logger instance for logging messages.
+            file_format (str): Storage format ("csv", "npy" or "feather").
         """
         self.data_directory = data_directory
         self.logger = logger
+        self.file_format = file_format
 
         if self.logger is None:
             pass
@@ -48,9 +88,39 @@ class FileManager:
         # Initialize DataFrame Organizer
         self.df_organizer_instance = DataFrameOrg(logger=self.logger)
 
+        if self.file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"File format '{self.file_format}' not supported")
+
+        if self.file_format == "feather":
+            try:
+                import pyarrow
+            except ImportError:
+                if self.logger:
+                    self.logger.log_error(
+                        "The 'feather' format requires pyarrow, using 'npy' instead."
+                    )
+                self.file_format = "npy"
+
+    def _file_path(self, file_name: str, file_format: str = None) -> str:
+        """
+        Builds the file path of a DataFrame file for the specified storage format.
+
+        Parameters:
+            file_name (str): The name of the file (without extension).
+            file_format (str): Storage format (default: the FileManager format).
+
+        Returns:
+            str: The file path.
+        """
+        if file_format is None:
+            file_format = self.file_format
+        return os.path.join(
+            self.data_directory, f"{file_name}.{FILE_EXTENSIONS[file_format]}"
+        )
+
     def _save_df_ohlcv(self, file_name: str, ohlcv_dataframe: pd.DataFrame) -> None:
         """
-        Saves the OHLCV DataFrame to a CSV file.
+        Saves the OHLCV DataFrame in the storage format of the FileManager.
 
         Parameters:
             file_name (str): The name of the file to be saved.
@@ -62,13 +132,16 @@ class FileManager:
         # Ensure the data directory exists
         os.makedirs(self.data_directory, exist_ok=True)
         # Construct the file path
-        file_path = os.path.join(self.data_directory, f"{file_name}.csv")
-        # Save the DataFrame to a CSV file
-        ohlcv_dataframe.to_csv(file_path)
+        file_path = self._file_path(file_name=file_name)
+        # Write to a temporary file and replace, so a crash never leaves a broken file
+        temp_file_path = f"{file_path}.tmp"
+        save_func = getattr(self, self.SAVE_FUNCTIONS[self.file_format])
+        save_func(file_path=temp_file_path, ohlcv_dataframe=ohlcv_dataframe)
+        os.replace(temp_file_path, file_path)
 
     def _read_df_ohlcv(self, file_name: str) -> pd.DataFrame | None:
         """
-        Reads the existing OHLCV DataFrame from a CSV file.
+        Reads the existing OHLCV DataFrame, in the storage format or from a legacy CSV file.
 
         Parameters:
             file_name (str): The name of the file to be read.
@@ -79,30 +152,129 @@ class FileManager:
         if self.logger:
             self.logger.logger.info("read_df_ohlcv (function)")
 
-        # Construct the file path
-        file_path = os.path.join(self.data_directory, f"{file_name}.csv")
+        for file_format in dict.fromkeys([self.file_format, "csv"]):
+            # Construct the file path
+            file_path = self._file_path(file_name=file_name, file_format=file_format)
+
+            # Check if the file exists
+            if os.path.exists(file_path):
+                if self.logger:
+                    self.logger.logger.info(
+                        f"The {file_format} DataFrame file exists and is being read."
+                    )
+                read_func = getattr(self, self.READ_FUNCTIONS[file_format])
+                existing_ohlcv_df = read_func(file_path=file_path)
+                if isinstance(existing_ohlcv_df.index, pd.DatetimeIndex):
+                    existing_ohlcv_df.index = epoch_index(
+                        epoch_seconds(existing_ohlcv_df.index)
+                    )
+
+                if self.logger:
+                    self.logger.log_debug(
+                        "existing_ohlcv_df: True \n%s\n", existing_ohlcv_df
+                    )
+                return existing_ohlcv_df
+        if self.logger:
+            self.logger.logger.info("existing_ohlcv_df does not exists (return: None)")
+        return
+
+    def migrate_csv_files(self, delete_csv: bool = False) -> list:
+        """
+        Converts every CSV DataFrame file of the data directory to the storage format.
+
+        Parameters:
+            delete_csv (bool): Remove the CSV file after it has been converted.
+
+        Returns:
+            list: Names of the converted files.
+        """
+        if self.logger:
+            self.logger.logger.info("migrate_csv_files (function)")
+
+        migrated_files = []
+        if self.file_format == "csv":
+            return migrated_files
+
+        for csv_file_path in sorted(
+            glob.glob(os.path.join(self.data_directory, "*.csv"))
+        ):
+            file_name = os.path.splitext(os.path.basename(csv_file_path))[0]
+            ohlcv_dataframe = self._read_csv(file_path=csv_file_path)
+            self._save_df_ohlcv(file_name=file_name, ohlcv_dataframe=ohlcv_dataframe)
+            if delete_csv:
+                os.remove(csv_file_path)
+            migrated_files.append(file_name)
 
-        # Check if the file exists
-        if os.path.exists(file_path):
             if self.logger:
                 self.logger.logger.info(
-                    "The CSV DataFrame file exists and is being read."
+                    f"Migrated {file_name}.csv to {self.file_format} ({len(ohlcv_dataframe)} rows)"
                 )
-            # Read the DataFrame from the CSV file
-            existing_ohlcv_df = pd.read_csv(file_path)
+        return migrated_files
+
+    # ------- Functions: Storage formats -------
+    def _save_csv(self, file_path: str, ohlcv_dataframe: pd.DataFrame) -> None:
+        present_dataframe(ohlcv_dataframe, timezone=DEFAULT_TIMEZONE).to_csv(file_path)
+
+    def _read_csv(self, file_path: str) -> pd.DataFrame:
+        # The first column is the exported (local dates) index
+        existing_ohlcv_df = pd.read_csv(file_path, index_col=0)
 
+        if "TimeStamp" in existing_ohlcv_df.columns:
             # Index the DataFrame
-            existing_ohlcv_df = self.df_organizer_instance._index_dataframe(
+            return self.df_organizer_instance._index_dataframe(
                 ohlcv_dataframe=existing_ohlcv_df
             )
-            if self.logger:
-                self.logger.log_debug(
-                    f"existing_ohlcv_df: True \n{existing_ohlcv_df}\n"
-                )
-            return existing_ohlcv_df
-        if self.logger:
-            self.logger.logger.info("existing_ohlcv_df does not exists (return: None)")
-        return
+
+        # Timeframe files are saved without the TimeStamp column
+        existing_ohlcv_df.index = epoch_index(
+            epoch_seconds(pd.to_datetime(existing_ohlcv_df.index, utc=True))
+        )
+        return existing_ohlcv_df
+
+    def _save_npy(self, file_path: str, ohlcv_dataframe: pd.DataFrame) -> None:
+        index = ohlcv_dataframe.index
+        if isinstance(index, pd.DatetimeIndex):
+            index_kind = "datetime"
+            index_tz = "" if index.tz is None else str(index.tz)
+            index_values = index.as_unit("ns").asi8
+        else:
+            index_kind, index_tz = "values", ""
+            index_values = index.to_numpy()
+
+        arrays = {
+            "__index__": index_values,
+            "__meta__": np.array([index_kind, index_tz, index.name or ""]),
+        }
+        for column in ohlcv_dataframe.columns:
+            arrays[column] = ohlcv_dataframe[column].to_numpy()
+
+        with open(file_path, "wb") as file:
+            np.savez(file, **arrays)
+
+    def _read_npy(self, file_path: str) -> pd.DataFrame:
+        with np.load(file_path, allow_pickle=False) as arrays:
+            index_kind, index_tz, index_name = arrays["__meta__"].tolist()
+            index_values = arrays["__index__"]
+            columns = {
+                key: arrays[key] for key in arrays.files if not key.startswith("__")
+            }
+
+        if index_kind == "datetime":
+            index = pd.DatetimeIndex(index_values.view("datetime64[ns]"))
+            if index_tz:
+                index = index.tz_localize("UTC").tz_convert(index_tz)
+        else:
+            index = pd.Index(index_values)
+        index.name = index_name or None
+
+        return pd.DataFrame(columns, index=index)
+
+    def _save_feather(self, file_path: str, ohlcv_dataframe: pd.DataFrame) -> None:
+        ohlcv_dataframe.reset_index().to_feather(file_path)
+
+    def _read_feather(self, file_path: str) -> pd.DataFrame:
+        existing_ohlcv_df = pd.read_feather(file_path)
+        return existing_ohlcv_df.set_index(existing_ohlcv_df.columns[0])
 
     def __del__(self):
         """
@@ -110,3 +282,60 @@ class FileManager:
         """
         if self.logger:
             self.logger.logger.info(f"Call __del__ (Class : {self.__class__.__name__})")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from TF_Generator.ManagerLogger import LoggerManager
+
+    ### Example usage: one-shot migration of the stored CSV files
+    # for exchange in ["Wallex", "Nobitex", "Binance", "Coinbase", "BingX"]:
+    #     file_manager = FileManager(
+    #         data_directory=os.path.join(app_directory, exchange),
+    #         logger=LoggerManager(),
+    #         file_format="npy",
+    #     )
+    #     print(exchange, file_manager.migrate_csv_files(delete_csv=False))
+
+    ### Benchmark: load and save times for 50000 minute candles
+    num_candles = 50000
+    time_stamps = 1700000000 + 60 * np.arange(num_candles)
+    close = 0.5 + np.cumsum(np.random.normal(0, 0.001, num_candles))
+    ohlcv_dataframe = pd.DataFrame(
+        {
+            "TimeStamp": time_stamps.astype(float),
+            "Open": close,
+            "High": close + 0.002,
+            "Low": close - 0.002,
+            "Close": close,
+            "Volume": np.random.uniform(0, 1e6, num_candles),
+        }
+    )
+    logger = LoggerManager()
+    ohlcv_dataframe = DataFrameOrg(logger=logger)._index_dataframe(ohlcv_dataframe)
+
+    with tempfile.TemporaryDirectory() as data_directory:
+        for file_format in FILE_EXTENSIONS:
+            file_manager = FileManager(
+                data_directory=data_directory, logger=logger, file_format=file_format
+            )
+            if file_manager.file_format != file_format:
+                continue
+
+            start = time.perf_counter()
+            file_manager._save_df_ohlcv("bench-1min_df", ohlcv_dataframe)
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded_dataframe = file_manager._read_df_ohlcv("bench-1min_df")
+            load_time = time.perf_counter() - start
+
+            pd.testing.assert_frame_equal(
+                loaded_dataframe, ohlcv_dataframe, check_freq=False
+            )
+            file_size = os.path.getsize(file_manager._file_path("bench-1min_df"))
+            print(
+                f"{file_format:>8} | save: {save_time * 1000:8.1f} ms | "
+                f"load: {load_time * 1000:8.1f} ms | size: {file_size / 1e6:6.2f} MB"
+            )
@@ -0,0 +1,232 @@
+import pandas as pd
+import numpy as np
+import os
+
+### JOURNAL_MAGIC (bytes): Header written at the start of every journal file.
+JOURNAL_MAGIC = b"MZOHLCV1"
+### JOURNAL_RECORD (np.dtype): Fixed-size record of one candle (48 bytes).
+JOURNAL_RECORD = np.dtype(
+    [
+        ("TimeStamp", "<i8"),
+        ("Open", "<f8"),
+        ("High", "<f8"),
+        ("Low", "<f8"),
+        ("Close", "<f8"),
+        ("Volume", "<f8"),
+    ]
+)
+
+
+class JournalManager:
+    """
+    Class for managing an append-only journal of OHLCV candles, one fixed-size binary record per candle.
+
+    The journal holds the candles added since the last snapshot saved by FileManager.
+    Appending costs the same whatever the size of the DataFrame, and the candles survive a crash
+    because they are on disk as soon as they arrive.
+
+    Methods:
+        - __init__(data_directory: str, file_name: str, logger=None, fsync: bool = True): Initializes the JournalManager instance.
+        - _open_journal(): Opens the journal file, drops a torn record left by a crash.
+        - append(ohlcv_dataframe: pd.DataFrame | dict) -> int: Appends the candles newer than the last journaled candle.
+        - replay() -> pd.DataFrame | None: Reads all journaled candles.
+        - truncate(last_timestamp: int = None, up_to: int = None): Empties the journal (or drops the candles up to a time) after a snapshot has been saved.
+        - _replace_journal(records: np.ndarray): Replaces the journal by the records (temporary file, fsync, os.replace).
+        - close(): Closes the journal file.
+        - __del__(): Destructor, closes the journal file.
+    """
+
+    def __init__(self, data_directory: str, file_name: str, logger=None, fsync=True):
+        """
+        Initialize JournalManager class.
+
+        Parameters:
+            data_directory (str): The directory path where the journal file will be stored.
+            file_name (str): The name of the journal file (without extension).
+            logger: Optional logger instance for logging messages.
+            fsync (bool): Force every append to disk.
+        """
+        self.data_directory = data_directory
+        self.file_name = file_name
+        self.logger = logger
+        self.fsync = fsync
+
+        self.file_path = os.path.join(self.data_directory, f"{self.file_name}.journal")
+        self.file = None
+        self.num_records = 0
+        self.last_timestamp = None
+
+        self._open_journal()
+
+    def _open_journal(self):
+        """
+        Opens the journal file, drops a torn record left by a crash.
+        """
+        os.makedirs(self.data_directory, exist_ok=True)
+        self.file = open(self.file_path, "a+b")
+        self.file.seek(0, os.SEEK_END)
+        file_size = self.file.tell()
+
+        if file_size < len(JOURNAL_MAGIC):
+            self.file.truncate(0)
+            self.file.write(JOURNAL_MAGIC)
+            self.file.flush()
+            file_size = len(JOURNAL_MAGIC)
+
+        data_size = file_size - len(JOURNAL_MAGIC)
+        self.num_records = data_size // JOURNAL_RECORD.itemsize
+        torn_size = data_size % JOURNAL_RECORD.itemsize
+        if torn_size:
+            if self.logger:
+                self.logger.logger.warning(
+                    f"Journal {self.file_name}: dropped a torn record ({torn_size} bytes)"
+                )
+            self.file.truncate(file_size - torn_size)
+
+        if self.num_records:
+            self.file.seek(
+                len(JOURNAL_MAGIC) + (self.num_records - 1) * JOURNAL_RECORD.itemsize
+            )
+            last_record = np.frombuffer(
+                self.file.read(JOURNAL_RECORD.itemsize), dtype=JOURNAL_RECORD
+            )
+            self.last_timestamp = int(last_record["TimeStamp"][0])
+        self.file.seek(0, os.SEEK_END)
+
+    def append(self, ohlcv_dataframe: pd.DataFrame | dict) -> int:
+        """
+        Appends the candles newer than the last journaled candle.
+
+        Parameters:
+            ohlcv_dataframe (pd.DataFrame | dict): OHLCV DataFrame (or column arrays) with a 'TimeStamp' column.
+
+        Returns:
+            int: Number of appended candles.
+        """
+        if ohlcv_dataframe is None or "TimeStamp" not in ohlcv_dataframe:
+            return 0
+
+        time_stamps = np.asarray(ohlcv_dataframe["TimeStamp"]).astype(np.int64)
+        new_rows = (
+            np.ones(len(time_stamps), dtype=bool)
+            if self.last_timestamp is None
+            else time_stamps > self.last_timestamp
+        )
+        num_new = int(new_rows.sum())
+        if num_new == 0:
+            return 0
+
+        records = np.empty(num_new, dtype=JOURNAL_RECORD)
+        records["TimeStamp"] = time_stamps[new_rows]
+        for column in JOURNAL_RECORD.names[1:]:
+            records[column] = np.asarray(ohlcv_dataframe[column], dtype=float)[new_rows]
+
+        self.file.write(records.tobytes())
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+        self.num_records += num_new
+        self.last_timestamp = int(records["TimeStamp"].max())
+
+        if self.logger:
+            self.logger.log_debug(
+                "Journal %s: appended %s candles (%s records)",
+                self.file_name,
+                num_new,
+                self.num_records,
+            )
+        return num_new
+
+    def replay(self) -> pd.DataFrame | None:
+        """
+        Reads all journaled candles.
+
+        Returns:
+            pd.DataFrame | None: Candles with a 'TimeStamp' column (not indexed) or None if the journal is empty.
+        """
+        if self.num_records == 0:
+            return None
+
+        self.file.flush()
+        records = np.fromfile(
+            self.file_path,
+            dtype=JOURNAL_RECORD,
+            count=self.num_records,
+            offset=len(JOURNAL_MAGIC),
+        )
+        if self.logger:
+            self.logger.logger.info(
+                f"Journal {self.file_name}: replay {len(records)} candles"
+            )
+        return pd.DataFrame(records)
+
+    def truncate(self, last_timestamp: int = None, up_to: int = None):
+        """
+        Empties the journal after a snapshot has been saved.
+
+        Parameters:
+            last_timestamp (int): TimeStamp of the last candle in the snapshot.
+            up_to (int): Only drop the candles with a TimeStamp <= up_to, the newer ones (journaled
+                while the snapshot was written) are kept.
+        """
+        kept = None
+        if up_to is not None and self.num_records:
+            records = np.fromfile(
+                self.file_path,
+                dtype=JOURNAL_RECORD,
+                count=self.num_records,
+                offset=len(JOURNAL_MAGIC),
+            )
+            kept = records[records["TimeStamp"] > int(up_to)]
+
+        if kept is not None and len(kept):
+            ### The kept candles are not in the snapshot yet: the journal is replaced by a
+            ### complete copy, never rewritten in place, so a crash can not lose them
+            self._replace_journal(kept)
+        else:
+            self.file.truncate(len(JOURNAL_MAGIC))
+            self.file.seek(0, os.SEEK_END)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+        self.num_records = 0 if kept is None else len(kept)
+        if last_timestamp is not None and self.num_records == 0:
+            self.last_timestamp = int(last_timestamp)
+
+    def _replace_journal(self, records: np.ndarray):
+        """
+        Writes the records in a temporary file and moves it over the journal.
+        """
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(JOURNAL_MAGIC)
+            temp_file.write(records.tobytes())
+            temp_file.flush()
+            if self.fsync:
+                os.fsync(temp_file.fileno())
+
+        self.file.close()
+        os.replace(temp_path, self.file_path)
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            ### Makes the rename durable
+            directory_fd = os.open(self.data_directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+        self.file = open(self.file_path, "a+b")
+        self.file.seek(0, os.SEEK_END)
+
+    def close(self):
+        """
+        Closes the journal file.
+        """
+        if self.file is not None and not self.file.closed:
+            self.file.close()
+
+    def __del__(self):
+        """
+        Destructor, closes the journal file.
+        """
+        self.close()
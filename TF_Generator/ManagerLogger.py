@@ -1,5 +1,7 @@
+import logging.handlers
 import logging
-import sys
+import atexit
+import queue
 import os
 
 file_path = os.path.abspath(__file__)
@@ -9,12 +11,66 @@ app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
 # print(app_directory)
 
 APP_DIRECTORY = app_directory
+### LOG_LEVEL_ENV (str): Environment variable of the default log level ("DEBUG", "INFO", "WARNING", ...).
+LOG_LEVEL_ENV = "ROBOT_LOG_LEVEL"
+### DEFAULT_LOG_LEVEL (int): Default log level, DEBUG writes whole DataFrames on every cycle.
+DEFAULT_LOG_LEVEL = logging.getLevelName(os.environ.get(LOG_LEVEL_ENV, "INFO").upper())
+if not isinstance(DEFAULT_LOG_LEVEL, int):
+    DEFAULT_LOG_LEVEL = logging.INFO
+
+### The file handlers run in one QueueListener thread per log file
+_queue_listeners = {}
+### Open LoggerManager instances of every log file, the listener stops with the last one
+_listener_users = {}
+
+
+def _stop_queue_listeners():
+    """
+    Writes the queued records and stops the listeners (at exit). The records logged later
+    (e.g. by the __del__ of the instances) are written directly by the file handlers.
+    """
+    file_handlers = {}
+    for listener in list(_queue_listeners.values()):
+        listener.stop()
+        file_handlers[id(listener.queue)] = listener.handlers
+    _queue_listeners.clear()
+    _listener_users.clear()
+
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        for handler in list(getattr(logger, "handlers", ())):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                if id(handler.queue) in file_handlers:
+                    logger.removeHandler(handler)
+                    for file_handler in file_handlers[id(handler.queue)]:
+                        logger.addHandler(file_handler)
+
+
+def _restart_queue_listeners():
+    """
+    The listener threads do not survive a fork, the child gets new ones on the same queues.
+    """
+    for log_file_path, listener in list(_queue_listeners.items()):
+        new_listener = logging.handlers.QueueListener(
+            listener.queue, *listener.handlers
+        )
+        new_listener.start()
+        _queue_listeners[log_file_path] = new_listener
+
+
+atexit.register(_stop_queue_listeners)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listeners)
 
 
 class LoggerManager:
     """
     Class for managing logging operations.
 
+    The records are put in a queue by the calling thread and written to the file by a
+    QueueListener thread, so a log call never waits for the disk. Debug messages are lazy:
+    `log_debug` returns at once when DEBUG is disabled, and the message is built only when it is
+    enabled (%-style arguments, or a callable returning the message).
+
     Attributes:
         log_directory (str): Path to the directory where log files will be stored.
         log_file_name (str): Name of the log file.
@@ -24,7 +80,7 @@ class LoggerManager:
     Methods:
         __init__(log_directory: str = LOG_DIRECTORY,
                  log_file_name: str = LOG_FILE_NAME,
-                 log_level: int = logging.DEBUG):
+                 log_level: int = DEFAULT_LOG_LEVEL):
             Initializes the LoggerManager instance.
 
         _setup_logger():
@@ -33,8 +89,14 @@ class LoggerManager:
         log_error(message: str):
             Log an error message.
 
-        log_debug(message: str, *args, **kwargs):
-            Log a debug message.
+        log_debug(message: str | callable, *args, **kwargs):
+            Log a debug message (lazy).
+
+        debug_enabled() -> bool:
+            True if the DEBUG level is enabled (hoists the check out of a block of debug logs).
+
+        close():
+            Releases the log file, the last LoggerManager of the file writes the queued records and closes it.
     """
 
     DEFAULT_APP_DIRECTORY = APP_DIRECTORY
@@ -45,12 +107,13 @@ class LoggerManager:
         self,
         log_directory=LOG_DIRECTORY,
         log_file_name=LOG_FILE_NAME,
-        log_level=logging.DEBUG,
+        log_level=DEFAULT_LOG_LEVEL,
     ):
         self.log_directory = log_directory
         self.log_file_name = log_file_name
         self.log_file_path = os.path.join(log_directory, log_file_name)
         self.log_level = log_level
+        self.closed = False
 
         self._setup_logger()
         """
@@ -64,20 +127,30 @@ class LoggerManager:
 
     def _setup_logger(self):
         """
-        Set up the logger with a file handler.
+        Set up the logger with a queue handler, the file handler runs in a listener thread.
         """
         os.makedirs(self.log_directory, exist_ok=True)
         self.logger = logging.getLogger(self.log_file_name)
         self.logger.setLevel(self.log_level)
-        log_formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s]: %(message)s", "%Y-%m-%d %H:%M:%S"
+
+        # One listener per log file, shared by the LoggerManager instances of the file
+        listener = _queue_listeners.get(self.log_file_path)
+        if listener is None:
+            log_formatter = logging.Formatter(
+                "%(asctime)s [%(levelname)s]: %(message)s", "%Y-%m-%d %H:%M:%S"
+            )
+            file_handler = logging.FileHandler(self.log_file_path)
+            file_handler.setFormatter(log_formatter)
+            listener = logging.handlers.QueueListener(queue.SimpleQueue(), file_handler)
+            listener.start()
+            _queue_listeners[self.log_file_path] = listener
+        _listener_users[self.log_file_path] = (
+            _listener_users.get(self.log_file_path, 0) + 1
         )
-        file_handler = logging.FileHandler(self.log_file_path)
-        file_handler.setFormatter(log_formatter)
 
         # Clear existing handlers to avoid duplicate logs
         self.logger.handlers.clear()
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(logging.handlers.QueueHandler(listener.queue))
 
     def log_error(self, message):
         """
@@ -91,11 +164,38 @@ class LoggerManager:
 
     def log_debug(self, message, *args, **kwargs):
         """
-        Log a debug message.
+        Log a debug message, nothing is formatted when the DEBUG level is disabled.
 
         Parameters:
-            message (str): Debug message.
-            *args: Additional positional arguments.
+            message (str | callable): Debug message (%-style format of args), or a callable returning it.
+            *args: Arguments of the %-style format (e.g. a DataFrame for "%s").
             **kwargs: Additional keyword arguments.
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         self.logger.debug(message, *args, **kwargs)
+
+    def debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def close(self):
+        """
+        Releases the log file. The listener is shared by the LoggerManager instances of the file,
+        the last one to close writes the queued records and closes the file.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        users = _listener_users.get(self.log_file_path, 0) - 1
+        if users > 0:
+            _listener_users[self.log_file_path] = users
+            return
+        _listener_users.pop(self.log_file_path, None)
+        listener = _queue_listeners.pop(self.log_file_path, None)
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        self.logger.handlers.clear()
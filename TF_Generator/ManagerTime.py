@@ -1,5 +1,6 @@
 from datetime import datetime
 import pandas as pd
+import numpy as np
 import sys
 import os
 
@@ -11,6 +12,7 @@ app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
 
 sys.path.append(app_directory)
 from TF_Generator.ManagerInputs import InputsManager
+from TF_Generator.TimeIndex import epoch_seconds
 
 
 class TimeManager:
@@ -29,6 +31,8 @@ class TimeManager:
         - _start_time_new() -> int: Calculates the new start time in timestamp and datetime formats.
         - _start_time_exists(existing_ohlcv_df: pd.DataFrame) -> int: Calculates the existing start time after the last timestamp in the provided DataFrame.
         - _time_exists_info(existing_ohlcv_df: pd.DataFrame) -> Tuple[int, int]: Gets the first and last timestamps from the existing DataFrame.
+        - _missing_ranges(existing_ohlcv_df: pd.DataFrame, start_timestamp: int = None, end_timestamp: int = None, known_gaps: list = ()) -> list: Finds the time ranges missing in the existing DataFrame (head, holes and tail).
+        - _gap_candles(ranges: list) -> int: Number of candles of time ranges.
         ### - __del__(): Destructor, logs a message when the instance is deleted.
     """
 
@@ -108,7 +112,7 @@ class TimeManager:
         self.totaltime_seconds = actual_candles * self.seconds_time_unit
 
         if self.logger:
-            self.logger.log_debug(f"totaltime_seconds: {self.totaltime_seconds}")
+            self.logger.log_debug("totaltime_seconds: %s", self.totaltime_seconds)
 
         return self.totaltime_seconds
 
@@ -129,12 +133,12 @@ class TimeManager:
         )
 
         if self.logger:
-            self.logger.log_debug(f"_end_time_now (TimeStamp): {end_timestamp_now}")
+            self.logger.log_debug("_end_time_now (TimeStamp): %s", end_timestamp_now)
 
         end_datetime_now = datetime.fromtimestamp(end_timestamp_now)
 
         if self.logger:
-            self.logger.log_debug(f"_end_time_now (Datetime): {end_datetime_now}")
+            self.logger.log_debug("_end_time_now (Datetime): %s", end_datetime_now)
 
         return end_timestamp_now
 
@@ -152,12 +156,12 @@ class TimeManager:
         start_timestamp_new = end_timestamp_now - self.totaltime_seconds
 
         if self.logger:
-            self.logger.log_debug(f"_start_time_new (TimeStamp): {start_timestamp_new}")
+            self.logger.log_debug("_start_time_new (TimeStamp): %s", start_timestamp_new)
 
         start_datetime_new = datetime.fromtimestamp(start_timestamp_new)
 
         if self.logger:
-            self.logger.log_debug(f"_start_time_new (Datetime): {start_datetime_new}")
+            self.logger.log_debug("_start_time_new (Datetime): %s", start_datetime_new)
 
         candles_start_time_new = int(
             (end_timestamp_now - start_timestamp_new) / self.seconds_time_unit
@@ -165,7 +169,8 @@ class TimeManager:
 
         if self.logger:
             self.logger.log_debug(
-                f"The number of candles to receive for _start_time_new: {candles_start_time_new}"
+                "The number of candles to receive for _start_time_new: %s",
+                candles_start_time_new,
             )
 
         return start_timestamp_new
@@ -196,7 +201,9 @@ class TimeManager:
 
         if self.logger:
             self.logger.log_debug(
-                f"time_difference : {time_difference} {self.time_unit}"
+                "time_difference : %s %s",
+                time_difference,
+                self.time_unit,
             )
 
         if start_timestamp_new + self.seconds_time_unit < first_timestamp_exists:
@@ -206,14 +213,16 @@ class TimeManager:
 
             if self.logger:
                 self.logger.log_debug(
-                    f"start_timestamp_exists (TimeStamp): {start_timestamp_exists}"
+                    "start_timestamp_exists (TimeStamp): %s",
+                    start_timestamp_exists,
                 )
 
             start_datetime_exists = datetime.fromtimestamp(start_timestamp_exists)
 
             if self.logger:
                 self.logger.log_debug(
-                    f"start_timestamp_exists (Datetime): {start_datetime_exists}"
+                    "start_timestamp_exists (Datetime): %s",
+                    start_datetime_exists,
                 )
 
             candle_start_time_exists = int(
@@ -222,7 +231,8 @@ class TimeManager:
 
             if self.logger:
                 self.logger.log_debug(
-                    f"The number of candles to be made after the existing candles: {candle_start_time_exists}"
+                    "The number of candles to be made after the existing candles: %s",
+                    candle_start_time_exists,
                 )
 
             return start_timestamp_exists
@@ -240,22 +250,87 @@ class TimeManager:
         if self.logger:
             self.logger.logger.info("_time_exists_info (function)")
 
-        first_timestamp_exists = int(
-            pd.to_datetime(existing_ohlcv_df.index[0]).timestamp()
+        ### The index is in epoch seconds, no conversion (a DatetimeIndex is accepted too)
+        first_timestamp_exists, last_timestamp_exists = (
+            int(time_stamp) for time_stamp in epoch_seconds(existing_ohlcv_df.index[[0, -1]])
         )
 
         if self.logger:
-            self.logger.log_debug(f"FirstTimeExist: {first_timestamp_exists}")
-
-        last_timestamp_exists = int(
-            pd.to_datetime(existing_ohlcv_df.index[-1]).timestamp()
-        )
+            self.logger.log_debug("FirstTimeExist: %s", first_timestamp_exists)
 
         if self.logger:
-            self.logger.log_debug(f"LastTimeExist: {last_timestamp_exists}")
+            self.logger.log_debug("LastTimeExist: %s", last_timestamp_exists)
 
         return first_timestamp_exists, last_timestamp_exists
 
+    def _missing_ranges(
+        self,
+        existing_ohlcv_df: pd.DataFrame,
+        start_timestamp: int = None,
+        end_timestamp: int = None,
+        known_gaps: list = (),
+    ) -> list:
+        """
+        Finds the time ranges missing in the existing DataFrame between the start of the window
+        and now: the head (the stored candles start too late), the holes left by exchange
+        outages or downtime, and the tail (the candles after the last stored one).
+
+        The scan is vectorized over the time index: the candle after every stored candle and the
+        candle before the next one bound a missing range when they do not cross.
+
+        Parameters:
+            existing_ohlcv_df (pd.DataFrame): Existing OHLCV DataFrame (sorted time index).
+            start_timestamp (int): Start of the window (default: the first candle kept by the store).
+            end_timestamp (int): End of the window (default: _end_time_now).
+            known_gaps (list): Ranges the exchange has no candles for, skipped if a range is inside one.
+
+        Returns:
+            list: (start_timestamp, end_timestamp) of every missing range, both inclusive, in time order.
+        """
+        if self.logger:
+            self.logger.logger.info("_missing_ranges (function)")
+
+        if end_timestamp is None:
+            end_timestamp = self._end_time_now()
+        if start_timestamp is None:
+            ### The window of the candle store: the last actual candles up to end_timestamp
+            start_timestamp = end_timestamp - self.totaltime_seconds + self.seconds_time_unit
+
+        time_stamps = epoch_seconds(existing_ohlcv_df.index)
+        first = np.searchsorted(time_stamps, start_timestamp)
+        last = np.searchsorted(time_stamps, end_timestamp, side="right")
+        time_stamps = time_stamps[first:last]
+
+        ### Range i: from the candle after stored candle i-1 to the candle before stored candle i
+        range_starts = np.r_[start_timestamp, time_stamps + self.seconds_time_unit]
+        range_ends = np.r_[time_stamps - self.seconds_time_unit, end_timestamp]
+        ### The open candle alone is not fetched again (like _start_time_exists)
+        missing = (range_starts <= range_ends) & (range_starts < end_timestamp)
+
+        if len(known_gaps):
+            ### A range is skipped if a known gap starting before it ends after it
+            gaps = np.array(sorted(known_gaps), dtype=np.int64).reshape(-1, 2)
+            gap_ends = np.maximum.accumulate(gaps[:, 1])
+            position = np.searchsorted(gaps[:, 0], range_starts, side="right") - 1
+            known = (position >= 0) & (gap_ends[np.maximum(position, 0)] >= range_ends)
+            missing &= ~known
+
+        ranges = list(zip(range_starts[missing].tolist(), range_ends[missing].tolist()))
+
+        if self.logger:
+            self.logger.log_debug(
+                "missing ranges: %s (%s candles)", ranges, self._gap_candles(ranges)
+            )
+        return ranges
+
+    def _gap_candles(self, ranges: list) -> int:
+        """
+        Number of candles of time ranges (both ends inclusive).
+        """
+        return sum(
+            (end - start) // self.seconds_time_unit + 1 for start, end in ranges
+        )
+
     # def __del__(self):
     #     """
     #     Destructor, logs a message when the instance is deleted.
@@ -1,4 +1,15 @@
 import pandas as pd
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TF_Generator.ManagerCandleStore import CandleStore, CANDLE_COLUMNS
+from TF_Generator.TimeIndex import epoch_index
+from ManageMetrics.LatencyTracerClass import traced
 
 
 class DataFrameOrg:
@@ -8,8 +19,9 @@ class DataFrameOrg:
     Methods:
         - __init__(logger=None): Initializes the DataFrameOrg instance.
         - _regularize_dataframe(ohlcv_dataframe: pd.DataFrame) -> pd.DataFrame: Regularizes the OHLCV DataFrame by dropping NaN values, changing column order, and renaming columns.
-        - _index_dataframe(ohlcv_dataframe: pd.DataFrame) -> pd.DataFrame: Indexes the OHLCV DataFrame based on the 'TimeStamp' column, converts 'TimeStamp' to Datetime, and sets it as the index.
-        - _concatenate_dataframe(existing_ohlcv_df: pd.DataFrame, new_ohlcv_data: pd.DataFrame, actual_candles: int) -> pd.DataFrame: Concatenates existing and new OHLCV DataFrames, drops duplicates, and trims the DataFrame to the specified number of actual candles.
+        - _index_dataframe(ohlcv_dataframe: pd.DataFrame) -> pd.DataFrame: Indexes the OHLCV DataFrame by the 'TimeStamp' column (int64 epoch seconds).
+        - _load_arrays(ohlcv_arrays: dict, actual_candles: int) -> pd.DataFrame: Loads decoded column arrays (OHLCVDecoder) in a new CandleStore, without intermediate DataFrames.
+        - _concatenate_dataframe(existing_ohlcv_df: pd.DataFrame, new_ohlcv_data: pd.DataFrame, actual_candles: int) -> pd.DataFrame: Concatenates existing and new OHLCV DataFrames in a CandleStore, drops duplicates, and trims the DataFrame to the specified number of actual candles.
         - __del__(): Destructor, logs a message when the instance is deleted.
     """
 
@@ -30,9 +42,11 @@ class DataFrameOrg:
         """
 
         self.logger = logger
+        self.candle_store = None
 
         self.logger.logger.warning(f"--- Start : Class {self.__class__.__name__} ---")
 
+    @traced("dataframe.regularize")
     def _regularize_dataframe(
         self, exchange: str, ohlcv_dataframe: pd.DataFrame
     ) -> pd.DataFrame:
@@ -66,10 +80,11 @@ class DataFrameOrg:
                 "Volume": float,
             }
         )
-        self.logger.log_debug(f"Regularized ohlcv_dataframe: \n{ohlcv_dataframe}")
-        self.logger.log_debug(
-            f"Regularized ohlcv_dataframe length: {len(ohlcv_dataframe)}\n"
-        )
+        if self.logger.debug_enabled():
+            self.logger.log_debug("Regularized ohlcv_dataframe: \n%s", ohlcv_dataframe)
+            self.logger.log_debug(
+                "Regularized ohlcv_dataframe length: %s\n", len(ohlcv_dataframe)
+            )
         return ohlcv_dataframe
 
     def _reg_df_wallex_nobitex(self, ohlcv_dataframe: pd.DataFrame) -> pd.DataFrame:
@@ -163,14 +178,14 @@ class DataFrameOrg:
             KeyError: If required columns are not found in the input DataFrame.
         """
         try:
-            # change the order of columns
-            ohlcv_dataframe = ohlcv_dataframe[ohlcv_dataframe.columns[:6]]
+            # Coinbase candles: [time, low, high, open, close, volume]
+            ohlcv_dataframe = ohlcv_dataframe[[0, 3, 2, 1, 4, 5]]
             ohlcv_dataframe = ohlcv_dataframe.rename(
                 columns={
                     0: "TimeStamp",
-                    1: "Open",
+                    3: "Open",
                     2: "High",
-                    3: "Low",
+                    1: "Low",
                     4: "Close",
                     5: "Volume",
                 }
@@ -215,43 +230,61 @@ class DataFrameOrg:
         except Exception as e:
             self.logger.logger.error(f"regularize_dataframe: {str(e)}")
 
+    @traced("dataframe.index")
     def _index_dataframe(self, ohlcv_dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Indexes the OHLCV DataFrame based on the timestamp column.
 
+        The index is the open time in int64 epoch seconds (UTC), a tz-aware index is only built
+        for the presentation (see TF_Generator.TimeIndex.present_dataframe).
+
         Parameters:
             ohlcv_dataframe (pd.DataFrame): The input OHLCV DataFrame.
 
         Returns:
-            pd.DataFrame: The indexed OHLCV DataFrame with the timestamp converted to datetime and set as the index.
+            pd.DataFrame: The OHLCV DataFrame indexed and sorted by its epoch-second timestamps.
         """
         self.logger.logger.info("_index_dataframe (function)")
 
         try:
-            # Convert TimeStamp to Datetime and set as index
-            ohlcv_dataframe["Datetime"] = pd.to_datetime(
-                ohlcv_dataframe["TimeStamp"], unit="s", utc=True
-            )
+            ohlcv_dataframe.index = epoch_index(ohlcv_dataframe["TimeStamp"])
+            if not ohlcv_dataframe.index.is_monotonic_increasing:
+                ohlcv_dataframe = ohlcv_dataframe.sort_index(kind="stable")
 
-            # # Convert the Datetime to local time zone
-            # ohlcv_dataframe["Datetime"] = ohlcv_dataframe["Datetime"].dt.tz_localize("UTC")
-            # ohlcv_dataframe["Datetime"] = ohlcv_dataframe["Datetime"].dt.tz_convert("Asia/Tehran")
-
-            ohlcv_dataframe = ohlcv_dataframe.set_index("Datetime").sort_index()
-
-            # Convert the index to local time zone
-            # ohlcv_dataframe.index = ohlcv_dataframe.index.tz_localize("UTC")
-            ohlcv_dataframe.index = ohlcv_dataframe.index.tz_convert("Asia/Tehran")
-
-            self.logger.log_debug(f"ohlcv_dataframe indexed: \n{ohlcv_dataframe}")
-            self.logger.log_debug(
-                f"Len ohlcv_dataframe indexed: {len(ohlcv_dataframe)}\n"
-            )
+            if self.logger.debug_enabled():
+                self.logger.log_debug("ohlcv_dataframe indexed: \n%s", ohlcv_dataframe)
+                self.logger.log_debug(
+                    "Len ohlcv_dataframe indexed: %s\n", len(ohlcv_dataframe)
+                )
 
             return ohlcv_dataframe
         except Exception as e:
             self.logger.logger.error(f"index_dataframe: {str(e)}")
 
+    def _load_arrays(self, ohlcv_arrays: dict, actual_candles: int) -> pd.DataFrame:
+        """
+        Loads the column arrays of OHLCVDecoder in a new CandleStore of `actual_candles` capacity.
+
+        The arrays replace _regularize_dataframe and _index_dataframe: they are copied once
+        into the store and the returned DataFrame is its view, so the next
+        _concatenate_dataframe only appends the new candles.
+
+        Parameters:
+            ohlcv_arrays (dict): {column: np.ndarray} of the CANDLE_COLUMNS.
+            actual_candles (int): The number of candles kept.
+
+        Returns:
+            pd.DataFrame: The indexed OHLCV DataFrame (valid until the next call).
+        """
+        self.logger.logger.info("_load_arrays (function)")
+
+        self.candle_store = CandleStore(capacity=actual_candles)
+        self.candle_store.load(ohlcv_arrays)
+        ohlcv_dataframe = self.candle_store.to_dataframe()
+
+        self.logger.log_debug("ohlcv_dataframe loaded: \n%s", ohlcv_dataframe)
+        return ohlcv_dataframe
+
     def _concatenate_dataframe(
         self,
         existing_ohlcv_df: pd.DataFrame,
@@ -261,6 +294,10 @@ class DataFrameOrg:
         """
         Concatenates existing and new OHLCV DataFrames, drops duplicates, and trims the DataFrame to the specified number of actual candles.
 
+        The candles are kept in a CandleStore of `actual_candles` capacity: when `existing_ohlcv_df`
+        is the DataFrame returned by the previous call, only the new candles are written.
+        The returned DataFrame shares the memory of the store, it is valid until the next call.
+
         Parameters:
             existing_ohlcv_df (pd.DataFrame): The existing OHLCV DataFrame.
             new_ohlcv_data (pd.DataFrame): The new OHLCV DataFrame to be concatenated.
@@ -271,15 +308,20 @@ class DataFrameOrg:
         """
         self.logger.logger.info("_concatenate_detaframe_ohlcv (function)")
 
-        # Concatenate dataframes and drop duplicates based on TimeStamp
-        concatenated_df = pd.concat([existing_ohlcv_df, new_ohlcv_data])
-        concatenated_df.drop_duplicates(subset=["TimeStamp"], keep="last", inplace=True)
+        if (
+            self.candle_store is None
+            or self.candle_store.capacity != actual_candles
+            or existing_ohlcv_df is not self.candle_store.to_dataframe()
+        ):
+            self.candle_store = CandleStore(capacity=actual_candles)
+            self.candle_store.load(existing_ohlcv_df[list(CANDLE_COLUMNS)])
 
-        if len(concatenated_df) > actual_candles:
-            concatenated_df = concatenated_df.iloc[-actual_candles:].sort_index()
+        # Append the new candles, a candle with an existing TimeStamp replaces it
+        self.candle_store.append(new_ohlcv_data)
+        concatenated_df = self.candle_store.to_dataframe()
 
         self.logger.log_debug(
-            f"concatenated_dataframe length (fix): {len(concatenated_df)}\n"
+            "concatenated_dataframe length (fix): %s\n", len(concatenated_df)
         )
         ### Return the concatenated DataFrame regardless of trimming
         return concatenated_df
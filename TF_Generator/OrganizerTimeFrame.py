@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import sys
 import os
 
@@ -11,17 +12,42 @@ app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
 
 sys.path.append(app_directory)
 from TF_Generator.ManagerInputs import InputsManager
-
+from TF_Generator.TimeIndex import (
+    DEFAULT_TIMEZONE,
+    day_start,
+    epoch_index,
+    epoch_seconds,
+    to_datetime_index,
+)
+
+### TIME_UNIT_ORDER (tuple): Time units from the finest to the coarsest.
+TIME_UNIT_ORDER = ("min", "H", "D", "W", "M")
+### RESAMPLE_AGGREGATION (dict): Aggregation of every OHLCV column when converting the timeframe.
+RESAMPLE_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
 
 class TimeFrameOrg:
     """
     Class for organizing and converting OHLCV (Open, High, Low, Close, Volume) DataFrame to a new timeframe.
 
+    The DataFrames are indexed by epoch seconds (see TF_Generator.TimeIndex), the buckets start
+    at midnight of `timezone` like a resample of a tz-aware index. A DataFrame with a
+    DatetimeIndex is converted too and keeps its DatetimeIndex.
+
     Methods:
-        - __init__(ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None, logger=None): Initializes the TimeFrameOrganizer instance.
+        - __init__(exchange: str, ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None, logger=None, timezone: str = DEFAULT_TIMEZONE): Initializes the TimeFrameOrganizer instance.
         - _calculate_time_unit(ohlcv_dataframe: pd.DataFrame) -> str: Calculates the time unit based on the time difference between consecutive timestamps in the DataFrame.
         - _can_converted(ohlcv_dataframe: pd.DataFrame, new_timeframe: str) -> bool: Checks if conversion is possible between the initial and new timeframes.
         - convert_timeframe(ohlcv_dataframe: pd.DataFrame = None, new_timeframe: str = None) -> pd.DataFrame: Converts the OHLCV DataFrame to the desired time frame.
+        - _aggregate_rows(time_s: np.ndarray, values: np.ndarray, origin_s: int, period_s: int) -> tuple: Aggregates rows into buckets with the arithmetic of resample.
+        - convert_timeframe_incremental(ohlcv_dataframe: pd.DataFrame, new_timeframe: str) -> pd.DataFrame: convert_timeframe, only the changed buckets are aggregated again.
+        - convert_timeframes(ohlcv_dataframe: pd.DataFrame, new_timeframes: list) -> dict: Incremental conversion to several timeframes from one base DataFrame.
+        - reset_resample_state(timeframe: str = None): Forgets the bars kept by the incremental conversion (after history was rewritten).
         - __del__(): Destructor, logs a message when the instance is deleted.
     """
 
@@ -31,6 +57,7 @@ class TimeFrameOrg:
         ohlcv_dataframe: pd.DataFrame = None,
         new_timeframe: str = None,
         logger=None,
+        timezone: str = DEFAULT_TIMEZONE,
     ):
         """
         Initialize TimeFrameOrganizer class.
@@ -39,11 +66,15 @@ class TimeFrameOrg:
             ohlcv_dataframe (pd.DataFrame): OHLCV DataFrame with the initial time frame.
             new_timeframe (str): Desired time frame for conversion.
             logger: LoggerManager instance.
+            timezone (str): Time zone of the day start of the buckets (epoch-second index).
         """
         self.exchange = exchange
+        self.timezone = timezone
         self.ohlcv_dataframe = ohlcv_dataframe
         self.new_timeframe = new_timeframe
         self.logger = logger
+        ### Finished bars of every timeframe converted incrementally
+        self.resample_state = {}
 
         # Log class initialization
         if self.logger is not None:
@@ -68,11 +99,11 @@ class TimeFrameOrg:
         if ohlcv_dataframe.empty or len(ohlcv_dataframe) < 2:
             return "min"
 
-        # Calculate the time difference between consecutive timestamps
-        time_diff = ohlcv_dataframe.index.to_series().diff()
+        # Calculate the time difference between consecutive timestamps (seconds)
+        time_diff = np.diff(epoch_seconds(ohlcv_dataframe.index))
 
         # Convert the time difference to minutes
-        time_diff_minutes = time_diff.max().total_seconds() / 60
+        time_diff_minutes = time_diff.max() / 60
 
         time_unit_mapping = {
             time_diff_minutes < 60: "min",
@@ -107,8 +138,8 @@ class TimeFrameOrg:
         )
         new_time_unit = new_inputs._time_unit()
 
-        ### Check if the time units match
-        if init_time_unit != new_time_unit:
+        ### Check if the new time unit is the same or coarser (e.g. "1min" -> "4H")
+        if TIME_UNIT_ORDER.index(new_time_unit) < TIME_UNIT_ORDER.index(init_time_unit):
             if self.logger is not None:
                 self.logger.log_error("----- Error: mismatch (time unit) ! ------\n")
             return False
@@ -162,22 +193,193 @@ class TimeFrameOrg:
         if self.logger is not None:
             self.logger.logger.info("convert_timeframe (function)")
 
-        # Resample the data to the desired time frame
+        # Resample the data to the desired time frame (on a tz-aware index for the day start)
+        epoch_indexed = not isinstance(ohlcv_dataframe.index, pd.DatetimeIndex)
+        if epoch_indexed:
+            ohlcv_dataframe = ohlcv_dataframe.set_axis(
+                to_datetime_index(ohlcv_dataframe.index, timezone=self.timezone),
+                copy=False,
+            )
         converted_dataframe = ohlcv_dataframe.resample(f"{new_timeframe}").agg(
-            {
-                "Open": "first",
-                "High": "max",
-                "Low": "min",
-                "Close": "last",
-                "Volume": "sum",
-            }
+            RESAMPLE_AGGREGATION
         )
 
         # Drop rows with NaN values (introduced by resampling)
         converted_dataframe = converted_dataframe.dropna()
 
+        if epoch_indexed:
+            converted_dataframe.index = epoch_index(
+                epoch_seconds(converted_dataframe.index)
+            )
+        return converted_dataframe
+
+    def _aggregate_rows(
+        self, time_s: np.ndarray, values: np.ndarray, origin_s: int, period_s: int
+    ) -> tuple:
+        """
+        Aggregates rows (epoch seconds, OHLCV values) into buckets of `period_s` from `origin_s`,
+        with the same arithmetic as resample().agg(RESAMPLE_AGGREGATION).
+
+        Returns:
+            tuple: (bucket labels in epoch seconds, aggregated values)
+        """
+        if len(time_s) == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, values.shape[1]))
+        buckets = (time_s - origin_s) // period_s
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)]
+
+        aggregated = np.empty((len(starts), values.shape[1]))
+        aggregated[:, 0] = values[starts, 0]
+        aggregated[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+        aggregated[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+        aggregated[:, 3] = values[ends - 1, 3]
+        for position, (start, end) in enumerate(zip(starts, ends)):
+            ### Compensated (Kahan) sum, like the groupby sum of pandas
+            total, compensation = 0.0, 0.0
+            for value in values[start:end, 4].tolist():
+                y = value - compensation
+                t = total + y
+                compensation = t - total - y
+                if compensation != compensation:
+                    compensation = 0.0
+                total = t
+            aggregated[position, 4] = total
+        return origin_s + buckets[starts] * period_s, aggregated
+
+    def convert_timeframe_incremental(
+        self, ohlcv_dataframe: pd.DataFrame, new_timeframe: str
+    ) -> pd.DataFrame:
+        """
+        Converts the OHLCV DataFrame to the desired time frame, like convert_timeframe, but keeps
+        the finished bars of the previous call and only aggregates again the first bucket of the
+        window, the bucket that was open and the newer ones. The candles older than the last
+        candle of the previous call are expected to be unchanged (closed candles): a caller that
+        rewrites history (e.g. fills a hole in the middle of the window) must call
+        reset_resample_state() first, otherwise the kept bars miss the new candles.
+
+        Parameters:
+            ohlcv_dataframe (pd.DataFrame): OHLCV dataframe with the initial time frame.
+            new_timeframe (str): Desired time frame for conversion.
+
+        Returns:
+            pd.DataFrame: OHLCV dataframe with aggregated data for the desired time frame.
+        """
+        if ohlcv_dataframe is None or len(ohlcv_dataframe) < 2:
+            return self.convert_timeframe(
+                ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+            )
+
+        columns = list(RESAMPLE_AGGREGATION)
+        index = ohlcv_dataframe.index
+        epoch_indexed = not isinstance(index, pd.DatetimeIndex)
+        time_s = epoch_seconds(index)
+        values = ohlcv_dataframe[columns].to_numpy()
+        ### Bucket edges of resample (origin="start_day"): midnight of the first candle + k * period
+        if epoch_indexed:
+            origin_s = day_start(time_s[0], timezone=self.timezone)
+        else:
+            origin_s = index[0].normalize().value // 10**9
+        try:
+            offset = pd.tseries.frequencies.to_offset(new_timeframe)
+            period_s = pd.Timedelta(offset).value // 10**9
+        except ValueError:
+            offset, period_s = None, None
+
+        state = self.resample_state.get(new_timeframe)
+        if (
+            period_s is None
+            or state is None
+            or values.dtype != np.float64
+            or (origin_s - state["origin_s"]) % period_s != 0
+            or not time_s[0] <= state["last_base_s"] <= time_s[-1]
+        ):
+            state = None
+        else:
+            first_bucket = origin_s + ((time_s[0] - origin_s) // period_s) * period_s
+            open_bucket = max(state["open_bucket_s"], first_bucket)
+            head = (time_s < first_bucket + period_s) & (first_bucket < open_bucket)
+            tail = time_s >= open_bucket
+            if np.isnan(values[head | tail]).any():
+                state = None
+
+        if state is None:
+            converted_dataframe = self.convert_timeframe(
+                ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+            )
+            if converted_dataframe is None or period_s is None:
+                return converted_dataframe
+            labels = epoch_seconds(converted_dataframe.index)
+            bars = converted_dataframe.to_numpy(dtype=np.float64)
+        else:
+            kept = (state["labels"] > first_bucket) & (state["labels"] < open_bucket)
+            head_labels, head_bars = self._aggregate_rows(
+                time_s=time_s[head],
+                values=values[head],
+                origin_s=origin_s,
+                period_s=period_s,
+            )
+            tail_labels, tail_bars = self._aggregate_rows(
+                time_s=time_s[tail],
+                values=values[tail],
+                origin_s=origin_s,
+                period_s=period_s,
+            )
+            labels = np.concatenate([head_labels, state["labels"][kept], tail_labels])
+            bars = np.concatenate([head_bars, state["bars"][kept], tail_bars])
+
+            if epoch_indexed:
+                bar_index = epoch_index(labels)
+            else:
+                bar_index = pd.DatetimeIndex(
+                    labels.astype("datetime64[s]").astype("datetime64[ns]"),
+                    name=index.name,
+                )
+                if index.tz is not None:
+                    bar_index = bar_index.tz_localize("UTC").tz_convert(index.tz)
+                ### Like resample + dropna: the index keeps its freq when no bucket is empty
+                if len(labels) and np.all(np.diff(labels) == period_s):
+                    bar_index.freq = offset
+            converted_dataframe = pd.DataFrame(bars, index=bar_index, columns=columns)
+
+        self.resample_state[new_timeframe] = {
+            "origin_s": origin_s,
+            "labels": labels,
+            "bars": bars,
+            "last_base_s": time_s[-1],
+            "open_bucket_s": origin_s + ((time_s[-1] - origin_s) // period_s) * period_s,
+        }
         return converted_dataframe
 
+    def reset_resample_state(self, timeframe: str = None):
+        """
+        Forgets the bars kept by convert_timeframe_incremental, the next call aggregates the
+        whole DataFrame again.
+
+        Parameters:
+            timeframe (str): Timeframe to forget (all timeframes if None).
+        """
+        if timeframe is None:
+            self.resample_state.clear()
+        else:
+            self.resample_state.pop(timeframe, None)
+
+    def convert_timeframes(
+        self, ohlcv_dataframe: pd.DataFrame, new_timeframes: list
+    ) -> dict:
+        """
+        Converts one base OHLCV DataFrame to several timeframes (e.g. ["5min", "15min", "1H", "4H"]).
+
+        Returns:
+            dict: {new_timeframe: converted DataFrame}
+        """
+        return {
+            new_timeframe: self.convert_timeframe_incremental(
+                ohlcv_dataframe=ohlcv_dataframe, new_timeframe=new_timeframe
+            )
+            for new_timeframe in new_timeframes
+        }
+
     def __del__(self):
         """
         Destructor, logs a message when the instance is deleted.
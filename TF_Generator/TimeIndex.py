@@ -0,0 +1,96 @@
+"""
+Time index of the OHLCV DataFrames.
+
+The data path (CandleStore, DataFrameOrg, TimeFrameOrg, FileManager, TimeManager) indexes the
+candles by their open time in int64 epoch seconds (UTC), so no time zone conversion runs in the
+per-minute loop. A tz-aware DatetimeIndex is only built on demand at the edges (printing,
+CSV export) with present_dataframe / format_time.
+
+Functions:
+    - epoch_index(time_stamps) -> pd.Index: int64 epoch-second index of timestamps in seconds.
+    - epoch_seconds(index) -> np.ndarray: int64 epoch seconds of an epoch-second index or a DatetimeIndex.
+    - to_datetime_index(index, timezone: str = DEFAULT_TIMEZONE) -> pd.DatetimeIndex: tz-aware index.
+    - present_dataframe(ohlcv_dataframe, timezone: str = DEFAULT_TIMEZONE) -> pd.DataFrame: Copy with a tz-aware index.
+    - format_time(time_stamp, timezone: str = DEFAULT_TIMEZONE) -> pd.Timestamp: One timestamp for printing.
+    - day_start(time_stamp: int, timezone: str = DEFAULT_TIMEZONE) -> int: Local midnight of a timestamp.
+"""
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+import pandas as pd
+import numpy as np
+
+### TIME_INDEX_NAME (str): Name of the time index of the OHLCV DataFrames (int64 epoch seconds, UTC).
+TIME_INDEX_NAME = "Time"
+### DATETIME_INDEX_NAME (str): Name of the tz-aware index of a presented DataFrame.
+DATETIME_INDEX_NAME = "Datetime"
+### DEFAULT_TIMEZONE (str): Time zone of the presentation (printing, CSV export, resample day start).
+DEFAULT_TIMEZONE = "Asia/Tehran"
+SECONDS_DAY = 86400
+
+
+@lru_cache(maxsize=None)
+def _zone(timezone: str) -> ZoneInfo:
+    return ZoneInfo(timezone)
+
+
+def epoch_index(time_stamps) -> pd.Index:
+    """
+    int64 epoch-second index of timestamps in seconds (floats are rounded), no copy for int64.
+    """
+    time_stamps = np.asarray(time_stamps)
+    if time_stamps.dtype != np.int64:
+        time_stamps = np.rint(time_stamps).astype(np.int64)
+    return pd.Index(time_stamps, name=TIME_INDEX_NAME, copy=False)
+
+
+def epoch_seconds(index) -> np.ndarray:
+    """
+    int64 epoch seconds of a time index (epoch-second index or DatetimeIndex).
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit("s").asi8
+    return np.asarray(index, dtype=np.int64)
+
+
+def to_datetime_index(index, timezone: str = DEFAULT_TIMEZONE) -> pd.DatetimeIndex:
+    """
+    tz-aware DatetimeIndex of a time index (a DatetimeIndex is returned as is).
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        return index
+    datetime_index = pd.DatetimeIndex(
+        epoch_seconds(index).astype("datetime64[s]"), name=DATETIME_INDEX_NAME
+    ).tz_localize("UTC")
+    return datetime_index.tz_convert(timezone) if timezone else datetime_index
+
+
+def present_dataframe(
+    ohlcv_dataframe: pd.DataFrame, timezone: str = DEFAULT_TIMEZONE
+) -> pd.DataFrame:
+    """
+    Copy of an OHLCV DataFrame with a tz-aware DatetimeIndex (for printing and CSV export).
+    """
+    presented = ohlcv_dataframe.copy(deep=False)
+    presented.index = to_datetime_index(ohlcv_dataframe.index, timezone=timezone)
+    return presented
+
+
+def format_time(time_stamp, timezone: str = DEFAULT_TIMEZONE) -> pd.Timestamp:
+    """
+    tz-aware Timestamp of an epoch-second timestamp (a Timestamp is returned as is).
+    """
+    if time_stamp is None or isinstance(time_stamp, (pd.Timestamp, datetime)):
+        return time_stamp
+    return pd.Timestamp(int(time_stamp), unit="s", tz="UTC").tz_convert(timezone)
+
+
+def day_start(time_stamp: int, timezone: str = DEFAULT_TIMEZONE) -> int:
+    """
+    Local midnight (epoch seconds) of the day of a timestamp, like Timestamp.normalize().
+    """
+    if not timezone:
+        return int(time_stamp) - int(time_stamp) % SECONDS_DAY
+    local_time = datetime.fromtimestamp(int(time_stamp), _zone(timezone))
+    midnight = local_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    return int(midnight.timestamp())
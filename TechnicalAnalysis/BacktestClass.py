@@ -0,0 +1,358 @@
+from numpy.lib.stride_tricks import sliding_window_view
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TechnicalAnalysis.TechnicalClass import TradingStrategy
+from TF_Generator.OrganizerTimeFrame import TimeFrameOrg
+from TF_Generator.ManagerLogger import LoggerManager
+from TF_Generator.ManagerFile import FileManager, DEFAULT_FILE_FORMAT
+
+APP_DIRECTORY = app_directory
+
+### SIDE_CODES (dict): Signal labels as integers (1: buy, -1: sell, 0: no signal).
+SIDE_CODES: dict = {"BUY": 1, "SELL": -1}
+### EXIT_REASONS (tuple): Exit reason of a trade by code.
+EXIT_REASONS: tuple = ("timeout", "stop_loss", "take_profit")
+
+
+class Backtest:
+    """
+    Vectorized backtest of the TradingStrategy + CalculatePrices pipeline.
+
+    The signals and the candle arrays are computed once in `__init__`, every `run` only
+    evaluates the prices, the fills and the exits with NumPy, so many settings
+    (e.g. `min_reward_to_risk`, `allow_pip_sl`) can be tested on the same history.
+
+    Trade model (one position at a time, like the live robot):
+        - The signal window starts at the last `signal_1st` of the same side (idx_signal_1st)
+          and ends at the signal candle (idx_signal_side).
+        - Prices follow CalculatePrices: stop loss beyond the window Low/High plus
+          `add_to_stop_loss`, take profit at the window max bb_high / min bb_low, and
+          order price `allow_pip_sl` from the stop loss, capped by the signal close.
+        - Signals with a reward to risk below `min_reward_to_risk` are skipped.
+        - The LIMIT order fills on the first candle (within `entry_timeout`) that trades
+          through the order price. The exit is the first candle after the fill that hits
+          the stop loss (checked first) or the take profit, otherwise the close after `max_hold` candles.
+
+    Methods:
+        - __init__(data: pd.DataFrame, strategy: TradingStrategy = None, signal_name: str = "signal_side"): Computes the signals of the history.
+        - from_file(symbol: str, exchange: str, ...) -> Backtest: Builds a backtest from the stored OHLCV file.
+        - run(allow_pip_sl: float, add_to_stop_loss: float, min_reward_to_risk: float, ...) -> dict: Runs the backtest for one setting.
+
+    Example:
+        backtest = Backtest.from_file(symbol="SHIBTMN", exchange="Wallex")
+        result = backtest.run(allow_pip_sl=0.002, add_to_stop_loss=0.001, min_reward_to_risk=2)
+        print(result["stats"])
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        strategy: TradingStrategy = None,
+        signal_name: str = "signal_side",
+    ):
+        """
+        Initializes a new instance of the Backtest class.
+
+        Args:
+            data (pd.DataFrame): OHLCV DataFrame with a time index (epoch seconds or DatetimeIndex).
+            strategy (TradingStrategy, optional): Strategy with the indicator settings. Defaults to TradingStrategy().
+            signal_name (str, optional): Signal that opens a trade ("signal_side" or "signal_1st").
+        """
+        self.strategy = strategy or TradingStrategy()
+        self.signal_name = signal_name
+
+        self.data = data.copy()
+        signals = self.strategy.get_signals_batch(data=self.data, streaming=False)
+        self.index = self.data.index
+
+        self.open = self.data["Open"].to_numpy(dtype=float)
+        self.high = self.data["High"].to_numpy(dtype=float)
+        self.low = self.data["Low"].to_numpy(dtype=float)
+        self.close = self.data["Close"].to_numpy(dtype=float)
+        self.bb_high = self.data["bb_high"].to_numpy(dtype=float)
+        self.bb_low = self.data["bb_low"].to_numpy(dtype=float)
+
+        self.side = self._side_codes(signals[signal_name])
+        self.side_1st = self._side_codes(signals["signal_1st"])
+        self.window_start = self._window_start()
+
+    @classmethod
+    def from_file(
+        cls,
+        symbol: str,
+        exchange: str,
+        timeframe: str = None,
+        time_unit: str = "min",
+        data_directory: str = APP_DIRECTORY,
+        file_format: str = DEFAULT_FILE_FORMAT,
+        **kwargs,
+    ):
+        """
+        Builds a backtest from the OHLCV file stored by GenerateOHLCV.
+
+        Args:
+            symbol (str): Market symbol.
+            exchange (str): Exchange name (sub-directory of the data directory).
+            timeframe (str, optional): Timeframe to convert the stored candles to (e.g. "5min").
+            time_unit (str, optional): Time unit of the stored base file (see InputsManager._time_unit).
+            data_directory (str, optional): Directory of the OHLCV DataFrame files.
+            file_format (str, optional): Storage format of the files.
+            **kwargs: Arguments of Backtest.__init__.
+
+        Returns:
+            Backtest: The backtest of the stored history.
+        """
+        logger = LoggerManager(log_file_name="Backtest.log")
+        file_manager = FileManager(
+            data_directory=os.path.join(data_directory, exchange),
+            logger=logger,
+            file_format=file_format,
+        )
+        data = file_manager._read_df_ohlcv(file_name=f"{symbol}-1{time_unit}_df")
+        if data is None:
+            raise FileNotFoundError(f"No stored OHLCV data for {exchange}/{symbol}")
+
+        if timeframe is not None:
+            data = TimeFrameOrg(exchange=exchange, logger=logger).convert_timeframe(
+                ohlcv_dataframe=data, new_timeframe=timeframe
+            )
+        return cls(data=data, **kwargs)
+
+    # ------- Functions: Signal arrays -------
+    def _side_codes(self, signal: np.ndarray) -> np.ndarray:
+        side = np.zeros(len(signal), dtype=np.int8)
+        for label, code in SIDE_CODES.items():
+            side[signal == label] = code
+        return side
+
+    def _window_start(self) -> np.ndarray:
+        """
+        Position of the last signal_1st of the same side at or before every candle.
+        """
+        positions = np.arange(len(self.side))
+        window_start = positions.copy()
+        for code in SIDE_CODES.values():
+            last_1st = np.maximum.accumulate(
+                np.where(self.side_1st == code, positions, -1)
+            )
+            selected = (self.side == code) & (last_1st >= 0)
+            window_start[selected] = last_1st[selected]
+        return window_start
+
+    def _window_reduce(self, ufunc, values, starts, ends) -> np.ndarray:
+        """
+        Reduces values[starts[k] : ends[k] + 1] for every k in one ufunc call.
+        """
+        padded = np.append(values, np.nan)
+        bounds = np.empty(2 * len(starts), dtype=np.int64)
+        bounds[0::2] = starts
+        bounds[1::2] = ends + 1
+        return ufunc.reduceat(padded, bounds)[0::2]
+
+    def _first_hit(self, condition: np.ndarray) -> tuple:
+        """
+        Returns (hit, offset) of the first True of every row.
+        """
+        hit = condition.any(axis=1)
+        return hit, np.where(hit, condition.argmax(axis=1), -1)
+
+    def _windows(self, values: np.ndarray, starts: np.ndarray, length: int) -> np.ndarray:
+        ### Rows of `length` candles starting at `starts`, padded with NaN past the end
+        padded = np.concatenate([values, np.full(length, np.nan)])
+        return sliding_window_view(padded, length)[starts]
+
+    # -------------------------------
+    def run(
+        self,
+        allow_pip_sl: float,
+        add_to_stop_loss: float,
+        min_reward_to_risk: float,
+        fee: float = 0.0,
+        entry_timeout: int = 5,
+        max_hold: int = 720,
+        initial_equity: float = 1.0,
+    ) -> dict:
+        """
+        Runs the backtest for one setting.
+
+        Args:
+            allow_pip_sl (float): Distance of the order price from the stop loss (var.allow_pip_sl).
+            add_to_stop_loss (float): Distance of the stop loss beyond the signal window (var.add_stop_loss).
+            min_reward_to_risk (float): Minimum reward to risk of a trade (var.min_reward_to_risk).
+            fee (float, optional): Fee per fill, as a fraction of the price.
+            entry_timeout (int, optional): Number of candles the LIMIT order waits for a fill.
+            max_hold (int, optional): Number of candles after which an open trade is closed.
+            initial_equity (float, optional): Equity at the start of the history.
+
+        Returns:
+            dict: {"trades": pd.DataFrame, "equity": pd.Series, "stats": dict}
+        """
+        num_candles = len(self.close)
+        signal_idx = np.flatnonzero(self.side)
+        side = self.side[signal_idx].astype(float)
+        starts = self.window_start[signal_idx]
+        is_buy = side > 0
+
+        ### Prices of CalculatePrices
+        window_low = self._window_reduce(np.fmin, self.low, starts, signal_idx)
+        window_high = self._window_reduce(np.fmax, self.high, starts, signal_idx)
+        window_bb_high = self._window_reduce(np.fmax, self.bb_high, starts, signal_idx)
+        window_bb_low = self._window_reduce(np.fmin, self.bb_low, starts, signal_idx)
+
+        signal_close = self.close[signal_idx]
+        stop_loss = np.where(
+            is_buy, window_low - add_to_stop_loss, window_high + add_to_stop_loss
+        )
+        take_profit = np.where(is_buy, window_bb_high, window_bb_low)
+        order_price = np.where(
+            is_buy,
+            np.minimum(stop_loss + allow_pip_sl, signal_close),
+            np.maximum(stop_loss - allow_pip_sl, signal_close),
+        )
+
+        ### Same rule as RiskManageClass.get_reward_to_risk
+        pip_sl = np.abs(order_price - stop_loss)
+        pip_sl = np.where(pip_sl == 0, 1000000, pip_sl)
+        reward_to_risk = np.abs(take_profit - order_price) / pip_sl
+        valid = (reward_to_risk >= min_reward_to_risk) & np.isfinite(take_profit)
+        valid &= side * (take_profit - order_price) > 0
+
+        selected = np.flatnonzero(valid)
+        signal_idx, side, is_buy = signal_idx[selected], side[selected], is_buy[selected]
+        stop_loss, take_profit = stop_loss[selected], take_profit[selected]
+        order_price = order_price[selected]
+        reward_to_risk = reward_to_risk[selected]
+
+        ### Fill of the LIMIT order
+        low_rows = self._windows(self.low, signal_idx + 1, entry_timeout)
+        high_rows = self._windows(self.high, signal_idx + 1, entry_timeout)
+        filled, fill_offset = self._first_hit(
+            np.where(
+                is_buy[:, None],
+                low_rows <= order_price[:, None],
+                high_rows >= order_price[:, None],
+            )
+        )
+        fill_idx = signal_idx + 1 + fill_offset
+
+        selected = np.flatnonzero(filled)
+        signal_idx, side, is_buy = signal_idx[selected], side[selected], is_buy[selected]
+        stop_loss, take_profit = stop_loss[selected], take_profit[selected]
+        order_price, fill_idx = order_price[selected], fill_idx[selected]
+        reward_to_risk = reward_to_risk[selected]
+
+        ### Exit: stop loss first, then take profit, then timeout
+        low_rows = self._windows(self.low, fill_idx + 1, max_hold)
+        high_rows = self._windows(self.high, fill_idx + 1, max_hold)
+        stop_rows = np.where(
+            is_buy[:, None],
+            low_rows <= stop_loss[:, None],
+            high_rows >= stop_loss[:, None],
+        )
+        profit_rows = np.where(
+            is_buy[:, None],
+            high_rows >= take_profit[:, None],
+            low_rows <= take_profit[:, None],
+        )
+        stop_hit, stop_offset = self._first_hit(stop_rows)
+        profit_hit, profit_offset = self._first_hit(profit_rows)
+        stop_offset = np.where(stop_hit, stop_offset, max_hold)
+        profit_offset = np.where(profit_hit, profit_offset, max_hold)
+
+        exit_reason = np.zeros(len(fill_idx), dtype=np.int8)
+        exit_reason[profit_offset < stop_offset] = 2
+        exit_reason[(stop_offset <= profit_offset) & stop_hit] = 1
+        exit_offset = np.minimum(stop_offset, profit_offset)
+        exit_idx = np.minimum(fill_idx + 1 + exit_offset, num_candles - 1)
+        exit_price = np.select(
+            [exit_reason == 1, exit_reason == 2],
+            [stop_loss, take_profit],
+            default=self.close[exit_idx],
+        )
+
+        ### One position at a time: skip the signals of a candle before the last exit
+        taken = np.zeros(len(signal_idx), dtype=bool)
+        last_exit = -1
+        for position, (signal, exit_) in enumerate(zip(signal_idx, exit_idx)):
+            if signal >= last_exit:
+                taken[position] = True
+                last_exit = exit_
+
+        trade_return = side * (exit_price - order_price) / order_price - 2 * fee
+        trade_return = trade_return[taken]
+
+        trades = pd.DataFrame(
+            {
+                "signal_time": self.index[signal_idx[taken]],
+                "entry_time": self.index[fill_idx[taken]],
+                "exit_time": self.index[exit_idx[taken]],
+                "side": np.where(is_buy[taken], "BUY", "SELL"),
+                "order_price": order_price[taken],
+                "stop_loss_price": stop_loss[taken],
+                "take_profit_price": take_profit[taken],
+                "exit_price": exit_price[taken],
+                "exit_reason": np.asarray(EXIT_REASONS)[exit_reason[taken]],
+                "reward_to_risk": reward_to_risk[taken],
+                "return": trade_return,
+            }
+        )
+
+        log_return = np.zeros(num_candles)
+        np.add.at(log_return, exit_idx[taken], np.log1p(trade_return))
+        equity = pd.Series(
+            initial_equity * np.exp(np.cumsum(log_return)),
+            index=self.index,
+            name="equity",
+        )
+
+        drawdown = 1 - equity / equity.cummax()
+        stats = {
+            "num_trades": len(trades),
+            "win_rate": float((trade_return > 0).mean()) if len(trades) else 0.0,
+            "total_return": float(equity.iloc[-1] / initial_equity - 1),
+            "max_drawdown": float(drawdown.max()),
+        }
+        return {"trades": trades, "equity": equity, "stats": stats}
+
+
+if __name__ == "__main__":
+    # Example usage: one year of synthetic minute candles
+    import time
+
+    rng = np.random.default_rng(11)
+    num_candles = 365 * 1440
+    close = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.0015, num_candles)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, num_candles)) * close
+    data = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": rng.uniform(1, 10, num_candles),
+        },
+        index=pd.date_range("2023-01-01", periods=num_candles, freq="1min", tz="UTC"),
+    )
+
+    start = time.perf_counter()
+    backtest = Backtest(data=data, signal_name="signal_1st")
+    prepare_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = backtest.run(
+        allow_pip_sl=0.002, add_to_stop_loss=0.001, min_reward_to_risk=2, fee=0.001
+    )
+    run_time = time.perf_counter() - start
+
+    print(result["trades"].tail())
+    print(result["stats"])
+    print(f"signals: {prepare_time * 1e3:.0f} ms, run: {run_time * 1e3:.0f} ms")
@@ -1,3 +1,14 @@
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageMetrics.LatencyTracerClass import traced
+
+
 class CalculatePrices:
     def __init__(self, allow_pip_sl, add_to_stop_loss, min_reward_to_risk):
         self.allow_pip_sl = allow_pip_sl
@@ -57,6 +68,7 @@ class CalculatePrices:
 
         return self.order_price
 
+    @traced("strategy.prices")
     def get_prices_dict(self, idx, signals_dict) -> dict:
         if signals_dict is not None:
             data_signal = signals_dict["data_signal"]
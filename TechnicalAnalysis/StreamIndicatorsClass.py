@@ -0,0 +1,309 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators that are updated candle by candle instead of being
+    recomputed over the whole DataFrame.
+
+    Every call to `update` commits only the candles that are new since the last call.
+    The last row of the frame is treated as provisional (the candle may still be open):
+    it is evaluated from the committed state but only committed once a newer candle
+    arrives, so a live candle that changes between calls is always handled correctly.
+
+    Like `ta`, the first `warm_up` rows of every frame are NaN: they lack a full period
+    of candles in that frame, even when the state carried from earlier calls has one.
+
+    The time and the input of every committed candle are kept with its output: a frame is
+    resumed only if its rows before the new candles are the committed ones. When older
+    candles were inserted or changed (e.g. a gap fill), the indicator is recomputed.
+    """
+
+    COLUMNS = ()
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self.last_committed = None
+        self.history = np.full((2 * self.capacity, len(self.COLUMNS)), np.nan)
+        self.history_time = np.zeros(2 * self.capacity, dtype=np.int64)
+        self.history_value = np.full(2 * self.capacity, np.nan)
+        self.size = 0
+        self.reset_state()
+
+    def reset_state(self):
+        raise NotImplementedError
+
+    @property
+    def warm_up(self):
+        """Number of leading rows of a frame without a value (period - 1)."""
+        return self.period - 1
+
+    def compute(self, value):
+        """Returns (row, pending) for a new value without changing the state."""
+        raise NotImplementedError
+
+    def commit(self, value, pending):
+        raise NotImplementedError
+
+    # ------- Functions: History of committed values -------
+    def push_history(self, row, time, value):
+        if self.size == len(self.history):
+            self.history[: self.capacity] = self.history[-self.capacity :]
+            self.history_time[: self.capacity] = self.history_time[-self.capacity :]
+            self.history_value[: self.capacity] = self.history_value[-self.capacity :]
+            self.size = self.capacity
+        self.history[self.size] = row
+        self.history_time[self.size] = time
+        self.history_value[self.size] = value
+        self.size += 1
+
+    def get_history(self, length):
+        return self.history[self.size - length : self.size]
+
+    @staticmethod
+    def index_times(index) -> np.ndarray:
+        """int64 keys of an index (epoch seconds, or nanoseconds of a DatetimeIndex)."""
+        if isinstance(index, pd.DatetimeIndex):
+            return index.asi8
+        return index.to_numpy(dtype=np.int64)
+
+    def resume_position(self, index, times, values):
+        if self.last_committed is None:
+            return None
+        position = index.get_indexer([self.last_committed])[0]
+        if position == -1 or position + 1 >= len(index):
+            return None
+        start = position + 1
+        if len(index) > self.capacity or self.size < start:
+            return None
+        ### The rows before the new candles must be the committed ones (no gap filled since)
+        committed = slice(self.size - start, self.size)
+        if not np.array_equal(self.history_time[committed], times[:start]):
+            return None
+        if not np.array_equal(
+            self.history_value[committed], values[:start], equal_nan=True
+        ):
+            return None
+        return start
+
+    # -------------------------------
+    def update(self, price: pd.Series) -> pd.DataFrame:
+        index = price.index
+        values = price.to_numpy(dtype=float)
+        length = len(values)
+        if length == 0:
+            return pd.DataFrame(columns=list(self.COLUMNS), index=index, dtype=float)
+
+        times = self.index_times(index)
+        start = self.resume_position(index, times, values)
+        if start is None:
+            self.capacity = max(self.capacity, length)
+            self.reset()
+            start = 0
+
+        for position in range(start, length - 1):
+            value = values[position]
+            row, pending = self.compute(value)
+            self.commit(value, pending)
+            self.push_history(row, times[position], value)
+        if length > 1:
+            self.last_committed = index[length - 2]
+
+        row, _ = self.compute(values[-1])
+        output = np.empty((length, len(self.COLUMNS)))
+        output[:-1] = self.get_history(length - 1)
+        output[-1] = row
+        output[: self.warm_up] = np.nan
+        return pd.DataFrame(output, index=index, columns=list(self.COLUMNS))
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Wilder-smoothed RSI with the same arithmetic as `ta.momentum.rsi` (fillna=False).
+
+    The smoothing continues across calls, so the values equal `ta` over the whole history.
+    On a sliding window, `ta` restarts the smoothing at the first row of the window and
+    differs from the continued values by (1 - 1/period)**k after k rows (< 1e-9 after
+    about 300 rows for period 13).
+    """
+
+    COLUMNS = ("rsi",)
+
+    def __init__(self, period=13, capacity=1000):
+        self.period = period
+        self.alpha = 1 / period
+        super().__init__(capacity=capacity)
+
+    def reset_state(self):
+        self.prev_price = None
+        self.ema_up = None
+        self.ema_down = None
+        self.nobs = 0
+
+    def smooth(self, weighted, value):
+        ### Same steps as pandas ewm(adjust=False).mean()
+        if weighted is None:
+            return value
+        if weighted != value:
+            old_wt = 1.0 - self.alpha
+            weighted = (old_wt * weighted + self.alpha * value) / (old_wt + self.alpha)
+        return weighted
+
+    def compute(self, value):
+        if self.prev_price is None:
+            up, down = 0.0, 0.0
+        else:
+            diff = value - self.prev_price
+            up = diff if diff > 0 else 0.0
+            down = -diff if diff < 0 else 0.0
+
+        ema_up = self.smooth(self.ema_up, up)
+        ema_down = self.smooth(self.ema_down, down)
+        nobs = self.nobs + 1
+
+        if nobs < self.period:
+            rsi = np.nan
+        elif ema_down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + ema_up / ema_down))
+        return (rsi,), (ema_up, ema_down, nobs)
+
+    def commit(self, value, pending):
+        self.ema_up, self.ema_down, self.nobs = pending
+        self.prev_price = value
+
+
+class StreamingBollinger(StreamingIndicator):
+    """
+    Bollinger Bands over a rolling sum / sum-of-squares window, matching
+    `ta.volatility.BollingerBands` (population std, fillna=False).
+
+    Values are shifted by the first price seen to keep the sums well conditioned,
+    and the sums are rebuilt from the window every `period` candles so rounding
+    errors can not accumulate.
+    """
+
+    COLUMNS = ("bb_mavg", "bb_high", "bb_low")
+
+    def __init__(self, period=20, deviations=2, capacity=1000):
+        self.period = period
+        self.deviations = deviations
+        super().__init__(capacity=capacity)
+
+    def reset_state(self):
+        self.window = deque(maxlen=self.period)
+        self.shift = None
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.commits = 0
+
+    def compute(self, value):
+        shift = value if self.shift is None else self.shift
+        x = value - shift
+        total, total_sq = self.sum + x, self.sum_sq + x * x
+        count = len(self.window) + 1
+        if count > self.period:
+            oldest = self.window[0]
+            total, total_sq = total - oldest, total_sq - oldest * oldest
+            count = self.period
+
+        if count < self.period:
+            return (np.nan, np.nan, np.nan), (shift, total, total_sq)
+
+        mean = total / count
+        variance = max(total_sq / count - mean * mean, 0.0)
+        std = np.sqrt(variance)
+        mavg = shift + mean
+        row = (
+            mavg,
+            mavg + self.deviations * std,
+            mavg - self.deviations * std,
+        )
+        return row, (shift, total, total_sq)
+
+    def commit(self, value, pending):
+        self.shift, self.sum, self.sum_sq = pending
+        self.window.append(value - self.shift)
+        self.commits += 1
+        if self.commits % self.period == 0:
+            self.sum = sum(self.window)
+            self.sum_sq = sum(x * x for x in self.window)
+
+
+if __name__ == "__main__":
+    # Parity check of the streaming indicators against the full recompute of TradingStrategy
+    import os
+    import sys
+
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+    from TechnicalAnalysis.TechnicalClass import TradingStrategy
+
+    rng = np.random.default_rng(7)
+    num_candles, window = 1400, 400
+    close = 0.5 + np.cumsum(rng.normal(0, 0.001, num_candles))
+    index = pd.date_range("2024-01-01", periods=num_candles, freq="1min", tz="UTC")
+    frame = pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.0005, num_candles),
+            "High": close + 0.002,
+            "Low": close - 0.002,
+            "Close": close,
+        },
+        index=index,
+    )
+
+    def check(stream_rsi, stream_bollinger, data, rsi_rows):
+        reference = TradingStrategy()
+        reference.data = data.copy()
+        reference.add_prices_data()
+        expected_rsi = reference.rsi_indicator_data(mod_price=reference.MOD_PRICE)
+        expected_bb = reference.bollinger_indicator_data()
+
+        got_rsi = stream_rsi.update(reference.data["Typical Price"])
+        got_bb = stream_bollinger.update(reference.data["Close"])
+
+        pairs = [
+            (got_rsi["rsi"], expected_rsi, rsi_rows),
+            (got_bb["bb_high"], expected_bb.bollinger_hband(), slice(None)),
+            (got_bb["bb_low"], expected_bb.bollinger_lband(), slice(None)),
+            (got_bb["bb_mavg"], expected_bb.bollinger_mavg(), slice(None)),
+        ]
+        for got, expected, rows in pairs:
+            ### Same NaN rows as ta, and the same values
+            assert (got.isna() == expected.isna()).all()
+            assert np.allclose(
+                got.iloc[rows], expected.iloc[rows], rtol=1e-9, equal_nan=True
+            )
+
+    ### Growing history: every row equals the full recompute
+    stream_rsi = StreamingRSI(period=13)
+    stream_bollinger = StreamingBollinger(period=20, deviations=2, capacity=num_candles)
+    for end in range(2, num_candles + 1, 7):
+        check(stream_rsi, stream_bollinger, frame.iloc[:end], rsi_rows=slice(None))
+
+    ### Sliding window like GenerateOHLCV: Bollinger on every row, the RSI of ta restarts its
+    ### smoothing at the window start, so its values are compared once that has converged
+    stream_rsi = StreamingRSI(period=13)
+    stream_bollinger = StreamingBollinger(period=20, deviations=2)
+    for end in range(window, num_candles + 1):
+        data = frame.iloc[end - window : end]
+        check(stream_rsi, stream_bollinger, data, rsi_rows=slice(-100, None))
+
+    ### Gap fill: older candles are inserted in the window (GenerateOHLCV._fill_gaps, or a
+    ### history rewrite of the FeedDaemon), the streams must not resume on the shifted rows
+    stream_rsi = StreamingRSI(period=13)
+    stream_bollinger = StreamingBollinger(period=20, deviations=2, capacity=num_candles)
+    missing = frame.index[300:340]
+    check(stream_rsi, stream_bollinger, frame.drop(missing).iloc[:-200], rsi_rows=slice(None))
+    check(stream_rsi, stream_bollinger, frame.iloc[:-190], rsi_rows=slice(None))
+    ### Same times, changed candles (a rewrite of the values)
+    changed = frame.iloc[:-180].copy()
+    changed.iloc[500:510, changed.columns.get_loc("Close")] += 0.01
+    check(stream_rsi, stream_bollinger, changed, rsi_rows=slice(None))
+    print("Streaming indicators match ta outputs for", num_candles - window + 1, "updates")
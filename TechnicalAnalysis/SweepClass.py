@@ -0,0 +1,305 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import itertools
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from TechnicalAnalysis.TechnicalClass import TradingStrategy
+from TechnicalAnalysis.BacktestClass import Backtest
+from TF_Generator.TimeIndex import epoch_index, epoch_seconds, to_datetime_index
+
+### STRATEGY_PARAMS (tuple): Parameters of TradingStrategy (the signals are computed once per combination).
+STRATEGY_PARAMS: tuple = ("rsi_period", "bb_period", "bb_deviations", "rsi_low", "rsi_high")
+### RISK_PARAMS (tuple): Parameters of Backtest.run (cheap, evaluated on the same signals).
+RISK_PARAMS: tuple = ("allow_pip_sl", "add_to_stop_loss", "min_reward_to_risk")
+### DEFAULT_PARAMS (dict): Values of the parameters that are not swept.
+DEFAULT_PARAMS: dict = {
+    "rsi_period": 13,
+    "bb_period": 20,
+    "bb_deviations": 2,
+    "rsi_low": 30,
+    "rsi_high": 70,
+    "allow_pip_sl": 0.002,
+    "add_to_stop_loss": 0.001,
+    "min_reward_to_risk": 2,
+}
+### STATS_COLUMNS (tuple): Columns of the results table filled from Backtest.run stats.
+STATS_COLUMNS: tuple = ("num_trades", "win_rate", "total_return", "max_drawdown")
+### OHLCV_COLUMNS (tuple): Candle columns shared with the workers.
+OHLCV_COLUMNS: tuple = ("Open", "High", "Low", "Close", "Volume")
+
+### Candles of a worker process, attached once from shared memory
+_worker_data = None
+_worker_memory = None
+
+
+def _attach_shared_data(memory_name: str, num_candles: int, timezone: str):
+    """
+    Process pool initializer: maps the shared candle block without copying it.
+    """
+    global _worker_data, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    block = np.ndarray(
+        (len(OHLCV_COLUMNS) + 1, num_candles), dtype=np.float64, buffer=_worker_memory.buf
+    )
+    ### Epoch-second index, a DatetimeIndex again if the candles had one
+    index = epoch_index(block[0].view(np.int64))
+    if timezone:
+        index = to_datetime_index(index, timezone=timezone)
+    _worker_data = pd.DataFrame(
+        {column: block[i + 1] for i, column in enumerate(OHLCV_COLUMNS)}, index=index
+    )
+
+
+def _run_group(strategy_params: dict, risk_grid: list, signal_name: str, run_kwargs: dict):
+    """
+    Worker task: computes the signals of one strategy combination and runs all its risk settings.
+    """
+    backtest = Backtest(
+        data=_worker_data,
+        strategy=TradingStrategy(**strategy_params),
+        signal_name=signal_name,
+    )
+    rows = []
+    for risk_params in risk_grid:
+        stats = backtest.run(**risk_params, **run_kwargs)["stats"]
+        rows.append({**strategy_params, **risk_params, **stats})
+    return rows
+
+
+class ParameterSweep:
+    """
+    Grid and random-search sweep of the strategy and risk settings over a process pool.
+
+    The candles are copied once into a shared memory block that every worker maps,
+    the tasks only carry the parameters. A task is one strategy combination with all
+    its risk settings, so the signals are computed once per task. Finished rows are
+    checkpointed to an .npz file, and a new sweep with the same checkpoint skips them.
+
+    Methods:
+        - __init__(data: pd.DataFrame, checkpoint_path: str = None, signal_name: str = "signal_side", **run_kwargs): Initializes the sweep.
+        - grid(param_grid: dict) -> list: Every combination of the given values.
+        - random_search(param_space: dict, num_samples: int, seed: int = 0) -> list: Random combinations.
+        - run(combinations: list, max_workers: int = None, checkpoint_every: int = 8) -> pd.DataFrame: Runs the combinations.
+
+    Example:
+        sweep = ParameterSweep(data=ohlcv_df, checkpoint_path="sweep.npz")
+        results = sweep.run(sweep.grid({"rsi_period": [9, 13], "min_reward_to_risk": [1.5, 2, 3]}))
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        checkpoint_path: str = None,
+        signal_name: str = "signal_side",
+        **run_kwargs,
+    ):
+        """
+        Initializes a new instance of the ParameterSweep class.
+
+        Args:
+            data (pd.DataFrame): OHLCV DataFrame with a time index (epoch seconds or DatetimeIndex).
+            checkpoint_path (str, optional): .npz file of the results, loaded to resume a sweep.
+            signal_name (str, optional): Signal that opens a trade (see Backtest).
+            **run_kwargs: Fixed arguments of Backtest.run (fee, entry_timeout, max_hold).
+        """
+        self.data = data
+        self.checkpoint_path = checkpoint_path
+        self.signal_name = signal_name
+        self.run_kwargs = run_kwargs
+        self.param_names = STRATEGY_PARAMS + RISK_PARAMS
+        self.results = self._load_checkpoint()
+
+    # ------- Functions: Combinations -------
+    def grid(self, param_grid: dict) -> list:
+        names = list(param_grid)
+        return [
+            {**DEFAULT_PARAMS, **dict(zip(names, values))}
+            for values in itertools.product(*(param_grid[name] for name in names))
+        ]
+
+    def random_search(self, param_space: dict, num_samples: int, seed: int = 0) -> list:
+        """
+        Draws random combinations: a list is sampled from its values, a (low, high) tuple
+        uniformly (integers if both bounds are integers).
+        """
+        rng = np.random.default_rng(seed)
+        samples = {}
+        for name, space in param_space.items():
+            if isinstance(space, tuple):
+                low, high = space
+                if isinstance(low, int) and isinstance(high, int):
+                    samples[name] = rng.integers(low, high + 1, num_samples).tolist()
+                else:
+                    samples[name] = rng.uniform(low, high, num_samples).tolist()
+            else:
+                samples[name] = [space[i] for i in rng.integers(0, len(space), num_samples)]
+        return [
+            {**DEFAULT_PARAMS, **{name: samples[name][i] for name in samples}}
+            for i in range(num_samples)
+        ]
+
+    # ------- Functions: Checkpoint -------
+    def _key(self, params: dict) -> tuple:
+        return tuple(float(params[name]) for name in self.param_names)
+
+    def _load_checkpoint(self) -> pd.DataFrame:
+        columns = list(self.param_names + STATS_COLUMNS)
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return pd.DataFrame(columns=columns, dtype=float)
+        with np.load(self.checkpoint_path) as npz_file:
+            return pd.DataFrame({column: npz_file[column] for column in columns})
+
+    def _save_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+        temporary_path = f"{self.checkpoint_path}.tmp.npz"
+        np.savez(
+            temporary_path,
+            **{
+                column: self.results[column].to_numpy(dtype=np.float64)
+                for column in self.results.columns
+            },
+        )
+        os.replace(temporary_path, self.checkpoint_path)
+
+    # ------- Functions: Shared memory -------
+    def _index_timezone(self) -> str:
+        ### "" for an epoch-second index, the time zone of a DatetimeIndex ("UTC" if naive)
+        index = self.data.index
+        if not isinstance(index, pd.DatetimeIndex):
+            return ""
+        return str(index.tz) if index.tz is not None else "UTC"
+
+    def _share_data(self) -> shared_memory.SharedMemory:
+        num_candles = len(self.data)
+        memory = shared_memory.SharedMemory(
+            create=True, size=(len(OHLCV_COLUMNS) + 1) * num_candles * 8
+        )
+        block = np.ndarray(
+            (len(OHLCV_COLUMNS) + 1, num_candles), dtype=np.float64, buffer=memory.buf
+        )
+        block[0] = epoch_seconds(self.data.index).view(np.float64)
+        for i, column in enumerate(OHLCV_COLUMNS):
+            if column in self.data:
+                block[i + 1] = self.data[column].to_numpy(dtype=np.float64)
+            else:
+                block[i + 1] = 0.0
+        return memory
+
+    # -------------------------------
+    def run(
+        self, combinations: list, max_workers: int = None, checkpoint_every: int = 8
+    ) -> pd.DataFrame:
+        """
+        Runs the combinations that are not in the results table yet.
+
+        Args:
+            combinations (list): Parameter dicts (see grid and random_search).
+            max_workers (int, optional): Number of processes. Defaults to the number of CPUs.
+            checkpoint_every (int, optional): Number of finished tasks between two checkpoints.
+
+        Returns:
+            pd.DataFrame: The results table (one row per combination).
+        """
+        done = {self._key(row) for row in self.results.to_dict("records")}
+        groups = {}
+        for params in combinations:
+            if self._key(params) in done:
+                continue
+            strategy_params = {name: params[name] for name in STRATEGY_PARAMS}
+            risk_params = {name: params[name] for name in RISK_PARAMS}
+            group_key = tuple(strategy_params.values())
+            groups.setdefault(group_key, (strategy_params, []))[1].append(risk_params)
+        if not groups:
+            return self.results
+
+        memory = self._share_data()
+        timezone = self._index_timezone()
+        new_rows = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                initializer=_attach_shared_data,
+                initargs=(memory.name, len(self.data), timezone),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _run_group,
+                        strategy_params,
+                        risk_grid,
+                        self.signal_name,
+                        self.run_kwargs,
+                    )
+                    for strategy_params, risk_grid in groups.values()
+                ]
+                for num_done, future in enumerate(as_completed(futures), start=1):
+                    new_rows.extend(future.result())
+                    if num_done % checkpoint_every == 0 or num_done == len(futures):
+                        self.results = pd.concat(
+                            [self.results, pd.DataFrame(new_rows)], ignore_index=True
+                        )
+                        new_rows = []
+                        self._save_checkpoint()
+        finally:
+            if new_rows:
+                self.results = pd.concat(
+                    [self.results, pd.DataFrame(new_rows)], ignore_index=True
+                )
+                self._save_checkpoint()
+            memory.close()
+            memory.unlink()
+        return self.results
+
+
+if __name__ == "__main__":
+    # Example usage: sweep on 60 days of synthetic minute candles, timing with 1 and all CPUs
+    import tempfile
+    import time
+
+    rng = np.random.default_rng(11)
+    num_candles = 60 * 1440
+    close = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.0015, num_candles)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, num_candles)) * close
+    data = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": rng.uniform(1, 10, num_candles),
+        },
+        index=pd.date_range("2024-01-01", periods=num_candles, freq="1min", tz="UTC"),
+    )
+    param_grid = {
+        "rsi_period": [9, 13, 21],
+        "bb_period": [14, 20, 30],
+        "min_reward_to_risk": [1, 1.5, 2, 3],
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for max_workers in sorted({1, os.cpu_count()}):
+            checkpoint_path = os.path.join(directory, f"sweep_{max_workers}.npz")
+            sweep = ParameterSweep(
+                data=data, checkpoint_path=checkpoint_path, signal_name="signal_1st"
+            )
+            start = time.perf_counter()
+            results = sweep.run(sweep.grid(param_grid), max_workers=max_workers)
+            print(
+                f"{max_workers} workers: {len(results)} rows in {time.perf_counter() - start:.2f} s"
+            )
+
+        ### Resume: every combination is in the checkpoint, nothing is recomputed
+        start = time.perf_counter()
+        resumed = ParameterSweep(data=data, checkpoint_path=checkpoint_path)
+        results = resumed.run(resumed.grid(param_grid))
+        print(f"resume: {len(results)} rows in {time.perf_counter() - start:.3f} s")
+        print(results.sort_values("total_return", ascending=False).head())
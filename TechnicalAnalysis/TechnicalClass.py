@@ -1,11 +1,27 @@
 import pandas as pd
+import numpy as np
 import ta
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+from TechnicalAnalysis.StreamIndicatorsClass import StreamingRSI, StreamingBollinger
+from ManageMetrics.LatencyTracerClass import traced
+from TF_Generator.TimeIndex import format_time
 
 
 class TradingStrategy:
     MOD_PRICE = "Typical Price"
 
-    def __init__(self):
+    def __init__(
+        self, rsi_period=13, bb_period=20, bb_deviations=2, rsi_low=30, rsi_high=70
+    ):
+        self.rsi_low = rsi_low
+        self.rsi_high = rsi_high
+        self.stream_rsi = StreamingRSI(period=rsi_period)
+        self.stream_bollinger = StreamingBollinger(
+            period=bb_period, deviations=bb_deviations
+        )
         self.reset_signal()
 
     def reset_signal(self):
@@ -33,10 +49,26 @@ class TradingStrategy:
         self.data["Weighted Price"] = (data_high + data_low + 2 * data_close) / 4
 
     def add_indicators_data(self):
-        self.data["rsi"] = self.rsi_indicator_data(mod_price=self.MOD_PRICE)
-        self.data["bb_high"] = self.bollinger_indicator_data().bollinger_hband()
-        self.data["bb_low"] = self.bollinger_indicator_data().bollinger_lband()
-        self.data["bb_mavg"] = self.bollinger_indicator_data().bollinger_mavg()
+        ### Only the candles closed since the last call are computed
+        rsi_data = self.stream_rsi.update(price=self.data[self.MOD_PRICE])
+        bollinger_data = self.stream_bollinger.update(price=self.data["Close"])
+        self.data["rsi"] = rsi_data["rsi"]
+        self.data["bb_high"] = bollinger_data["bb_high"]
+        self.data["bb_low"] = bollinger_data["bb_low"]
+        self.data["bb_mavg"] = bollinger_data["bb_mavg"]
+
+    def add_indicators_data_full(self):
+        ### Whole-frame recompute (vectorized), for long histories read only once
+        bollinger_data = self.bollinger_indicator_data(
+            period=self.stream_bollinger.period,
+            deviations=self.stream_bollinger.deviations,
+        )
+        self.data["rsi"] = self.rsi_indicator_data(
+            mod_price=self.MOD_PRICE, period=self.stream_rsi.period
+        )
+        self.data["bb_high"] = bollinger_data.bollinger_hband()
+        self.data["bb_low"] = bollinger_data.bollinger_lband()
+        self.data["bb_mavg"] = bollinger_data.bollinger_mavg()
 
     def define_variables(self, idx):
         self.high_price = self.data.iloc[idx].High
@@ -50,7 +82,9 @@ class TradingStrategy:
         self.bb_mavg_price = self.get_bb_mavg_price(idx)
 
     def get_signal(self):
-        self.signal_rsi = self.get_signal_rsi(rsi_value=self.rsi_value)
+        self.signal_rsi = self.get_signal_rsi(
+            rsi_value=self.rsi_value, low=self.rsi_low, high=self.rsi_high
+        )
         self.signal_bollinger = self.get_signal_bollinger(
             open_price=self.open_price,
             close_price=self.close_price,
@@ -69,7 +103,97 @@ class TradingStrategy:
         self.signal_2st = self.get_signal_2st()
         self.signal_side = self.get_signal_side()
 
-    # ------- Functions: Tuning Indicators -------
+    def get_signals_batch(self, data, streaming=True) -> dict:
+        """
+        Computes the signals of every candle of `data` in one vectorized pass.
+        With streaming=False the indicators are recomputed over the whole frame
+        (faster for a long history, e.g. a backtest).
+
+        Returns:
+            dict: NumPy arrays (one value per row, same values as the scalar path) for
+                "signal_rsi", "signal_bollinger", "signal_candle", "signal_1st",
+                "signal_2st" and "signal_side".
+        """
+        self.data = data
+        self.add_prices_data()
+        if streaming:
+            self.add_indicators_data()
+        else:
+            self.add_indicators_data_full()
+
+        open_price = self.data["Open"].to_numpy(dtype=float)
+        close_price = self.data["Close"].to_numpy(dtype=float)
+        bb_low_price = self.data["bb_low"].to_numpy(dtype=float)
+        bb_high_price = self.data["bb_high"].to_numpy(dtype=float)
+
+        signal_rsi = self.get_signal_rsi_array(
+            rsi_values=self.data["rsi"].to_numpy(dtype=float),
+            low=self.rsi_low,
+            high=self.rsi_high,
+        )
+        signal_bollinger = self.get_signal_bollinger_array(
+            open_price=open_price,
+            close_price=close_price,
+            bb_low_price=bb_low_price,
+            bb_high_price=bb_high_price,
+        )
+        signal_candle = self.get_signal_candle_array(
+            open_price=open_price,
+            close_price=close_price,
+            bb_low_price=bb_low_price,
+            bb_high_price=bb_high_price,
+        )
+        signal_1st = self.get_mixed_signal_array(signal_rsi, signal_bollinger)
+        signal_2st = self.get_signal_2st_array(signal_candle)
+        signal_side = self.get_mixed_signal_array(signal_1st, signal_2st, upper=True)
+        return {
+            "signal_rsi": signal_rsi,
+            "signal_bollinger": signal_bollinger,
+            "signal_candle": signal_candle,
+            "signal_1st": signal_1st,
+            "signal_2st": signal_2st,
+            "signal_side": signal_side,
+        }
+
+    def catch_up_signals(self, start_idx, data) -> dict:
+        """
+        Replays `get_signals_dict` for the candles from `start_idx` to -1 from one batch
+        computation, instead of one call (and one indicator update) per candle.
+
+        Returns:
+            dict: The last signals_dict that was not None, or None.
+        """
+        signals = self.get_signals_batch(data=data)
+        high_price = self.data["High"].to_numpy(dtype=float)
+        low_price = self.data["Low"].to_numpy(dtype=float)
+        bb_high_price = self.data["bb_high"].to_numpy(dtype=float)
+        bb_low_price = self.data["bb_low"].to_numpy(dtype=float)
+
+        signals_dict = None
+        for idx in range(start_idx, 0):
+            self.idx = idx
+            self.signal_rsi = signals["signal_rsi"][idx]
+            self.signal_bollinger = signals["signal_bollinger"][idx]
+            self.signal_candle = signals["signal_candle"][idx]
+            self.signal_1st = signals["signal_1st"][idx]
+            self.signal_2st = signals["signal_2st"][idx]
+            self.signal_side = signals["signal_side"][idx]
+            self.high_price = high_price[idx]
+            self.low_price = low_price[idx]
+            self.bb_high_price = bb_high_price[idx]
+            self.bb_low_price = bb_low_price[idx]
+
+            self.get_data_signal(idx=idx)
+            self.confirm_signal_side()
+            if self.data_signal is not None:
+                signals_dict = {
+                    "data_signal": self.data_signal,
+                    "signal_side": self.signal_side,
+                }
+        print("signal_side :", self.signal_side, "(catch up from idx", start_idx, ")")
+        return signals_dict
+
+    # ------- Functions: Tuning Indicators (full recompute) -------
     def rsi_indicator_data(self, mod_price="Close", period=13):
         return ta.momentum.rsi(close=self.data[mod_price], window=period)
 
@@ -117,6 +241,49 @@ class TradingStrategy:
         else:
             return None
 
+    # ------- Functions: Get Signal Arrays (batch mode) -------
+    def _label_array(self, buy, sell, labels=("buy", "sell")):
+        ### Object array like the scalar path: "buy" has priority over "sell", else None
+        signal = np.full(len(buy), None, dtype=object)
+        signal[sell] = labels[1]
+        signal[buy] = labels[0]
+        return signal
+
+    def get_signal_rsi_array(self, rsi_values, low=30, high=70):
+        return self._label_array(buy=rsi_values < low, sell=rsi_values > high)
+
+    def get_signal_bollinger_array(
+        self, open_price, close_price, bb_low_price, bb_high_price
+    ):
+        return self._label_array(
+            buy=(open_price > bb_low_price) & (close_price < bb_low_price),
+            sell=(open_price < bb_high_price) & (close_price > bb_high_price),
+        )
+
+    def get_signal_candle_array(
+        self, open_price, close_price, bb_low_price, bb_high_price
+    ):
+        return self._label_array(
+            buy=(close_price > open_price) & (close_price > bb_low_price),
+            sell=(close_price < open_price) & (close_price < bb_high_price),
+        )
+
+    def get_mixed_signal_array(self, signal_a, signal_b, upper=False):
+        buy, sell = ("BUY", "SELL") if upper else ("buy", "sell")
+        return self._label_array(
+            buy=(signal_a == buy) & (signal_b == buy),
+            sell=(signal_a == sell) & (signal_b == sell),
+            labels=("BUY", "SELL"),
+        )
+
+    def get_signal_2st_array(self, signal_candle):
+        ### Same labels as get_signal_2st
+        return self._label_array(
+            buy=signal_candle == "buy",
+            sell=signal_candle == "sell",
+            labels=("BUY", "SELL"),
+        )
+
     # ------- Functions: Get Mixed Signals -------
     def get_signal_1st(self):
         return (
@@ -128,11 +295,12 @@ class TradingStrategy:
         )
 
     def get_signal_2st(self):
+        ### get_signal_candle returns "buy" / "sell" (lowercase like the other signals)
         return (
             "BUY"
-            if self.signal_candle == "Buy"
+            if self.signal_candle == "buy"
             else "SELL"
-            if self.signal_candle == "Sell"
+            if self.signal_candle == "sell"
             else None
         )
 
@@ -155,7 +323,9 @@ class TradingStrategy:
     def get_idx_signal_1st(self, idx):
         if self.idx_signal_1st is None and self.signal_1st is not None:
             self.idx_signal_1st = self.data.index[idx]
-            print("signal_1st:", self.signal_1st, "-> Date:", self.idx_signal_1st)
+            print(
+                "signal_1st:", self.signal_1st, "-> Date:", format_time(self.idx_signal_1st)
+            )
 
     def get_idx_signal_side(self, idx):
         if idx == -1 and self.idx_signal_side is None and self.signal_side is not None:
@@ -166,9 +336,10 @@ class TradingStrategy:
         self.get_idx_signal_1st(idx=idx)
         self.get_idx_signal_side(idx=idx)
         if self.idx_signal_side is not None:
-            self.data_signal = self.data[self.idx_signal_1st : self.idx_signal_side]
+            self.data_signal = self.data.loc[self.idx_signal_1st : self.idx_signal_side]
 
     # -------------------------------
+    @traced("strategy.signals")
     def get_signals_dict(self, idx, data) -> dict:
         self.setupTradingStrategy(idx=idx, data=data)
         print("signal_side :", self.signal_side)
@@ -183,6 +354,53 @@ class TradingStrategy:
 
 
 if __name__ == "__main__":
-    # Example usage of the TradingStrategy class
-
-    pass
+    # Parity check of the batch signals against the scalar path, and timing of a catch-up
+    import time
+
+    rng = np.random.default_rng(3)
+    num_candles = 400
+    close = 0.5 + np.cumsum(rng.normal(0, 0.002, num_candles))
+    open_ = close + rng.normal(0, 0.002, num_candles)
+    frame = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + 0.001,
+            "Low": np.minimum(open_, close) - 0.001,
+            "Close": close,
+        },
+        index=pd.date_range("2024-01-01", periods=num_candles, freq="1min", tz="UTC"),
+    )
+
+    names = ["signal_rsi", "signal_bollinger", "signal_candle"]
+    names += ["signal_1st", "signal_2st", "signal_side"]
+    batch = TradingStrategy().get_signals_batch(data=frame.copy())
+    scalar_strategy = TradingStrategy()
+    start = time.perf_counter()
+    for idx in range(-num_candles, 0):
+        scalar_strategy.setupTradingStrategy(idx=idx, data=frame.copy())
+        for name in names:
+            assert getattr(scalar_strategy, name) == batch[name][idx], (name, idx)
+    scalar_time = time.perf_counter() - start
+    ### Every signal takes values on this data, so the check can not pass on None only
+    for name in ["signal_rsi", "signal_bollinger", "signal_candle", "signal_2st"]:
+        assert {"BUY", "SELL"} <= {str(v).upper() for v in batch[name]}, name
+    assert set(batch["signal_1st"]) - {None}, "signal_1st"
+
+    ### signal_side needs signal_1st and signal_2st on the same side, which one candle does
+    ### not give (opposite candle directions): the mix is checked on every combination
+    labels = ["BUY", "SELL", None]
+    signal_1st = np.array([a for a in labels for b in labels], dtype=object)
+    signal_2st = np.array([b for a in labels for b in labels], dtype=object)
+    side_strategy = TradingStrategy()
+    signal_side = side_strategy.get_mixed_signal_array(signal_1st, signal_2st, upper=True)
+    for idx in range(len(signal_side)):
+        side_strategy.signal_1st, side_strategy.signal_2st = signal_1st[idx], signal_2st[idx]
+        assert side_strategy.get_signal_side() == signal_side[idx], idx
+    assert list(signal_side[[0, 4]]) == ["BUY", "SELL"]
+
+    start = time.perf_counter()
+    TradingStrategy().catch_up_signals(start_idx=-20, data=frame.copy())
+    batch_time = time.perf_counter() - start
+    print("Batch signals match the scalar path for", num_candles, "candles")
+    print(f"scalar: {scalar_time / num_candles * 20 * 1e3:.1f} ms / 20 candles")
+    print(f"batch : {batch_time * 1e3:.1f} ms / catch up of 20 candles")
@@ -1,6 +1,17 @@
 import requests
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import SessionPool, get_session_pool
 
 BASE_URL: str = "https://api.wallex.ir/"
+### RATE_KEY (tuple): (exchange, endpoint class) of the shared rate limiter.
+RATE_KEY: tuple = ("Wallex", "market")
 
 
 # ----- MarketInfo EndPoints -----
@@ -65,14 +76,17 @@ class MarketInfo:
         print(market_history)
     """
 
-    def __init__(self, base_url=BASE_URL):
+    def __init__(self, base_url=BASE_URL, session_pool: SessionPool = None):
         """
         Initializes a new instance of the MarketInfo class.
 
         Args:
             base_url (str, optional): The base URL of the Wallex API. Defaults to "https://api.wallex.ir/".
+            session_pool (SessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
         """
         self.BASE_URL = base_url
+        self.RATE_KEY = RATE_KEY
+        self.session_pool = session_pool or get_session_pool()
 
     def _make_request(self, endpoint, params=None):
         """
@@ -90,7 +104,9 @@ class MarketInfo:
             requests.exceptions.HTTPError: If an HTTP error (4xx or 5xx) occurs.
         """
         try:
-            response = requests.get(self.BASE_URL + endpoint, params=params)
+            response = self.session_pool.get(
+                self.BASE_URL + endpoint, params=params, rate_key=self.RATE_KEY
+            )
             # response.raise_for_status()  # Raises an exception for 4xx and 5xx status codes
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import (
+    AsyncSessionPool,
+    get_async_session_pool,
+    aiohttp,
+)
+from WallexApiClass.WallexMarketInfo import MarketInfo, BASE_URL, RATE_KEY
+
+
+class AsyncMarketInfo(MarketInfo):
+    """
+    The asyncio version of MarketInfo, every method of MarketInfo returns an awaitable.
+
+    Example:
+        api = AsyncMarketInfo()
+        markets, trades = await asyncio.gather(
+            api.get_markets(), api.get_latest_trades("USDTTMN")
+        )
+    """
+
+    def __init__(self, base_url=BASE_URL, session_pool: AsyncSessionPool = None):
+        """
+        Initializes a new instance of the AsyncMarketInfo class.
+
+        Args:
+            base_url (str, optional): The base URL of the Wallex API. Defaults to "https://api.wallex.ir/".
+            session_pool (AsyncSessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
+        """
+        self.BASE_URL = base_url
+        self.RATE_KEY = RATE_KEY
+        self.session_pool = session_pool or get_async_session_pool()
+
+    async def _make_request(self, endpoint, params=None):
+        """
+        Sends an HTTP GET request to the specified endpoint.
+
+        Args:
+            endpoint (str): The API endpoint to request.
+            params (dict, optional): Query parameters to include in the request. Defaults to None.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            aiohttp.ClientError: If a network-related or HTTP error occurs.
+        """
+        try:
+            return await self.session_pool.get_json(
+                self.BASE_URL + endpoint, params=params, rate_key=self.RATE_KEY
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise aiohttp.ClientError(f"(Request) error: {e}")
+
+
+if __name__ == "__main__":
+
+    async def main():
+        api = AsyncMarketInfo()
+        order_book, latest_trades = await asyncio.gather(
+            api.get_order_book_symbol("USDTTMN"), api.get_latest_trades("USDTTMN")
+        )
+        print("Order Book for Symbol Result:")
+        print(order_book)
+        print("Latest Trades Result:")
+        print(latest_trades)
+        await api.session_pool.close()
+
+    asyncio.run(main())
@@ -1,7 +1,18 @@
 import requests
+import sys
 import re
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import SessionPool, get_session_pool
 
 BASE_URL: str = "https://api.wallex.ir/"
+### RATE_KEY (tuple): (exchange, endpoint class) of the shared rate limiter.
+RATE_KEY: tuple = ("Wallex", "account")
 CONTENT_TYPE: str = "application/json"
 
 
@@ -77,17 +88,22 @@ class OrdersManage:
         print(last_trades_result)
     """
 
-    def __init__(self, api_key: str, base_url=BASE_URL):
+    def __init__(
+        self, api_key: str, base_url=BASE_URL, session_pool: SessionPool = None
+    ):
         """
         Initialize the API client with the provided API key.
 
         Args:
             api_key (str): Your Wallex API key.
             base_url (str, optional): The base URL of the Wallex API. Defaults to "https://api.wallex.ir/".
+            session_pool (SessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
         """
         self.api_key: str = api_key
         self.BASE_URL = base_url
+        self.RATE_KEY = RATE_KEY
         self.CONTENT_TYPE = CONTENT_TYPE
+        self.session_pool = session_pool or get_session_pool()
 
     def _make_request(
         self,
@@ -111,8 +127,13 @@ class OrdersManage:
             "x-api-key": self.api_key,
         }
         try:
-            response = requests.request(
-                method, url, headers=headers, params=params, json=json_payload
+            response = self.session_pool.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json_payload,
+                rate_key=self.RATE_KEY,
             )
             # response.raise_for_status()  ### Raise an error if the response status code is not in the 200s.
             return response.json()
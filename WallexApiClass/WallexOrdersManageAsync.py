@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import os
+
+file_path = os.path.abspath(__file__)
+folder_path = os.path.dirname(file_path)
+app_directory = os.path.abspath(os.path.join(folder_path, os.pardir))
+
+sys.path.append(app_directory)
+from ManageSession.SessionPoolClass import (
+    AsyncSessionPool,
+    get_async_session_pool,
+    aiohttp,
+)
+from WallexApiClass.WallexOrdersManage import (
+    OrdersManage,
+    BASE_URL,
+    CONTENT_TYPE,
+    RATE_KEY,
+)
+
+
+class AsyncOrdersManage(OrdersManage):
+    """
+    The asyncio version of OrdersManage, every method of OrdersManage returns an awaitable.
+
+    Example:
+        api = AsyncOrdersManage(api_key)
+        open_orders, last_trades = await asyncio.gather(
+            api.get_open_orders(symbol="USDTTMN"), api.get_last_trades(symbol="USDTTMN")
+        )
+    """
+
+    def __init__(
+        self, api_key: str, base_url=BASE_URL, session_pool: AsyncSessionPool = None
+    ):
+        """
+        Initialize the API client with the provided API key.
+
+        Args:
+            api_key (str): Your Wallex API key.
+            base_url (str, optional): The base URL of the Wallex API. Defaults to "https://api.wallex.ir/".
+            session_pool (AsyncSessionPool, optional): Pool of keep-alive connections. Defaults to the shared pool.
+        """
+        self.api_key: str = api_key
+        self.BASE_URL = base_url
+        self.CONTENT_TYPE = CONTENT_TYPE
+        self.RATE_KEY = RATE_KEY
+        self.session_pool = session_pool or get_async_session_pool()
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: dict = None,
+        json_payload: dict = None,
+    ) -> dict:
+        """
+        Make an HTTP request to the Wallex API.
+
+        :param endpoint(str): The API endpoint.
+        :param method(str): The HTTP method (GET or POST or DELETE).
+        :param params(dict): Query parameters (for GET requests).
+        :param json_payload(dict): JSON payload (for POST requests).
+        :return: (dict) JSON response or an error message.
+        """
+        url: str = self.BASE_URL + endpoint
+        headers: dict = {
+            "Content-Type": self.CONTENT_TYPE,
+            "x-api-key": self.api_key,
+        }
+        try:
+            return await self.session_pool.request_json(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                json=json_payload,
+                rate_key=self.RATE_KEY,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return {"error": f"(Request) error: {e}"}
+
+    async def set_order(self, *args, **kwargs) -> dict:
+        """
+        Place an order with the Wallex API (see OrdersManage.set_order).
+        """
+        result = super().set_order(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+
+if __name__ == "__main__":
+
+    async def main():
+        ### Replace with your actual API key
+        api = AsyncOrdersManage("Your-API-Key-Here")
+        open_orders, last_trades = await asyncio.gather(
+            api.get_open_orders(symbol="SHIBTMN"),
+            api.get_last_trades(symbol="SHIBTMN", side="sell"),
+        )
+        print("Open Orders Result:", open_orders)
+        print("Last Trades Result:", last_trades)
+        await api.session_pool.close()
+
+    asyncio.run(main())
@@ -1,10 +1,12 @@
-import time
-
 from TF_Generator.GenerateTimeFrame import GenerateOHLCV
+from ManageSharedFeed.FeedDaemonClass import FeedClient
 from ManageTimeIdx.TimeIdxClass import TimeAndIdxManage
+from ManageTimeIdx.CandleSchedulerClass import CandleScheduler
 from TechnicalAnalysis.TechnicalClass import TradingStrategy
 from TechnicalAnalysis.CalculatePricesClass import CalculatePrices
 from ManageOrder.SpotOrderManagerClass import SpotOrderManager
+from ManageMetrics.LatencyTracerClass import get_tracer
+from TF_Generator.TimeIndex import format_time
 
 # -------   Initialize Variables   -------
 import var
@@ -23,7 +25,8 @@ take_profit_price = None
 status_order = False
 
 # -------   Create Instance   -------
-time_and_idx_instance = TimeAndIdxManage()
+candle_scheduler = CandleScheduler(timeframe=var.tf, settle_delay=var.settle_delay)
+time_and_idx_instance = TimeAndIdxManage(period_seconds=candle_scheduler.period)
 trading_strategy_instance = TradingStrategy()
 calculate_prices_instance = CalculatePrices(
     allow_pip_sl=var.allow_pip_sl,
@@ -32,18 +35,40 @@ calculate_prices_instance = CalculatePrices(
 )
 order_manage_instance = SpotOrderManager(api_key=var.API_KEY)
 
-with GenerateOHLCV(
-    symbol=var.symbol, timeframe=var.tf, exchange="Wallex", num_candles=num_candles
-) as ohlcv_object:
+if var.latency_tracing:
+    latency_tracer = get_tracer()
+    latency_tracer.enable()
+    latency_tracer.start_dump(
+        path=var.latency_dump_path, interval=var.latency_dump_interval
+    )
+
+if var.feed_daemon:
+    ### Candles published by the feed daemon in shared memory, no requests from this process
+    ohlcv_source = FeedClient(symbol=var.symbol, timeframe=var.tf, exchange="Wallex")
+else:
+    ohlcv_source = GenerateOHLCV(
+        symbol=var.symbol, timeframe=var.tf, exchange="Wallex", num_candles=num_candles
+    )
+
+with ohlcv_source as ohlcv_object:
     while True:
         data = ohlcv_object.timeframe_release()
 
         print("\n***-------***")
 
         idx = time_and_idx_instance.get_idx(idx=idx, last_date=last_date)
-        last_date = data.index[idx]
-
-        signals_dict = trading_strategy_instance.get_signals_dict(idx=idx, data=data)
+        if idx != -1:
+            ### Catch up on the missed candles in one vectorized pass
+            signals_dict = trading_strategy_instance.catch_up_signals(
+                start_idx=idx, data=data
+            )
+            idx = -1
+        else:
+            signals_dict = trading_strategy_instance.get_signals_dict(
+                idx=idx, data=data
+            )
+        ### Open time of the candle in epoch seconds (the index), no datetime round trip
+        last_date = int(data.index[idx])
         print("signals_dict:", signals_dict)
         if signals_dict is not None:
             side = signals_dict["signal_side"]
@@ -58,7 +83,7 @@ with GenerateOHLCV(
             take_profit_price = take_profit_price["take_profit_price"]
 
         if idx == -1:
-            print("Final Signal(Live):", side, "-> Date:", last_date)
+            print("Final Signal(Live):", side, "-> Date:", format_time(last_date))
             order_params = {
                 "symbol": var.symbol,
                 "type_order": type_order,
@@ -71,20 +96,22 @@ with GenerateOHLCV(
                 status_order = order_manage_instance.order_manage(
                     order_params=order_params
                 )
+                candle_scheduler.mark("order_submitted")
             print("status_order :", status_order)
 
             if status_order == True:
                 trading_strategy_instance.reset_signal()
                 status_order = False
 
-            sleep_time = time_and_idx_instance.get_sleep_time()
-            print("sleep_time_sec:", sleep_time)
-            time.sleep(sleep_time)
-
-        if idx != -1:
-            print("Final Signal(History):", side, "-> Date:", last_date)
-            print("last_time_now:", int(time.time()))
-            print("Index and time : Maybe the data is lost!")
-            time.sleep(0.2)
+            ### Wake up at the next candle close of var.tf (monotonic clock, no drift)
+            event = candle_scheduler.wait_next()
+            print(
+                "candle_close:",
+                event["boundary"],
+                "jitter_ms:",
+                round(event["jitter"] * 1e3, 2),
+            )
+            if event["missed"]:
+                print("missed_candles:", len(event["missed"]))
 
         print("***-------***\n")
@@ -11,6 +11,11 @@ API_KEY = "X-API-Key"
 
 symbol: str = "SHIBTMN"
 tf = "1min"
+settle_delay: float = 2.0  # seconds waited after a candle close (exchange lag)
+feed_daemon: bool = False  # read the candles of ManageSharedFeed/FeedDaemonClass.py
+latency_tracing: bool = False  # per-stage latency histograms (ManageMetrics)
+latency_dump_path: str = os.path.join(app_directory, "log_files", "latency.prom")
+latency_dump_interval: float = 60.0  # seconds between two dumps of the histograms
 quantity: str = "1000000"
 tick_value: float = 0.0001
 add_stop_loss: float = 10 * tick_value  # for SHIB/TMN